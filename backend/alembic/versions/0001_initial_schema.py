@@ -0,0 +1,70 @@
+"""Initial schema: designs, validations, validation_results, hitl_interactions
+
+Matches the tables previously created by Base.metadata.create_all at
+startup. Databases created that way: `alembic stamp 0001` then
+`alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "designs",
+        sa.Column("id", sa.String(50), primary_key=True),
+        sa.Column("standard", sa.String(100), nullable=True),
+        sa.Column("voltage", sa.String(50), nullable=True),
+        sa.Column("conductor_material", sa.String(20), nullable=True),
+        sa.Column("conductor_class", sa.String(20), nullable=True),
+        sa.Column("csa", sa.Float(), nullable=True),
+        sa.Column("insulation_material", sa.String(50), nullable=True),
+        sa.Column("insulation_thickness", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "validations",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("user_input", sa.Text(), nullable=False),
+        sa.Column("route", sa.String(50), nullable=True),
+        sa.Column("design_id", sa.String(50), sa.ForeignKey("designs.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("confidence", sa.Float(), nullable=True),
+        sa.Column("reasoning", sa.Text(), nullable=True),
+        sa.Column("hitl_mode", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "validation_results",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("validation_id", sa.Uuid(), sa.ForeignKey("validations.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("field", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("expected", sa.String(200), nullable=True),
+        sa.Column("comment", sa.Text(), nullable=True),
+    )
+    op.create_table(
+        "hitl_interactions",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("validation_id", sa.Uuid(), sa.ForeignKey("validations.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("field", sa.String(50), nullable=False),
+        sa.Column("user_response", sa.String(200), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("hitl_interactions")
+    op.drop_table("validation_results")
+    op.drop_table("validations")
+    op.drop_table("designs")
@@ -0,0 +1,44 @@
+"""Indexes for the hot queries
+
+- designs: keyset pagination on (updated_at, id) and the listing filters
+- validations: latest verdicts per design, time-filtered exports
+- validation_results / hitl_interactions: child rows by validation
+
+IF NOT EXISTS lets databases created by create_all (which already had the
+designs indexes) upgrade cleanly. On a large PostgreSQL table, consider
+creating these CONCURRENTLY by hand before stamping.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_designs_updated_at_id", "designs", ["updated_at", "id"]),
+    ("ix_designs_materials_id", "designs", ["conductor_material", "insulation_material", "id"]),
+    ("ix_designs_standard_voltage_id", "designs", ["standard", "voltage", "id"]),
+    ("ix_designs_csa_id", "designs", ["csa", "id"]),
+    ("ix_validations_design_id_created_at", "validations", ["design_id", "created_at"]),
+    ("ix_validations_created_at", "validations", ["created_at"]),
+    ("ix_validation_results_validation_id", "validation_results", ["validation_id"]),
+    ("ix_validation_results_status_field", "validation_results", ["status", "field"]),
+    ("ix_hitl_interactions_validation_id", "hitl_interactions", ["validation_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,42 @@
+"""LLM usage per validation: tokens and estimated cost of each call
+
+The table is skipped if it exists, so databases created by create_all
+upgrade cleanly (like the indexes in 0002).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("llm_usage"):
+        op.create_table(
+            "llm_usage",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("validation_id", sa.Uuid(), sa.ForeignKey("validations.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("node", sa.String(50), nullable=False),
+            sa.Column("model", sa.String(100), nullable=False),
+            sa.Column("input_tokens", sa.Integer(), nullable=False),
+            sa.Column("output_tokens", sa.Integer(), nullable=False),
+            sa.Column("cost_usd", sa.Float(), nullable=False),
+            sa.Column("latency_seconds", sa.Float(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+    op.create_index("ix_llm_usage_validation_id", "llm_usage", ["validation_id"], if_not_exists=True)
+    op.create_index("ix_llm_usage_created_at", "llm_usage", ["created_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_usage_created_at", table_name="llm_usage")
+    op.drop_index("ix_llm_usage_validation_id", table_name="llm_usage")
+    op.drop_table("llm_usage")
@@ -0,0 +1,62 @@
+"""Validation analytics: supplier and standard columns, materialized aggregates
+
+- designs.supplier and validations.standard (analytics dimensions)
+- validation_aggregates: additive counters maintained by incremental refreshes
+- analytics_refreshes: one row per refresh with its watermark
+
+Columns and tables that already exist are skipped, so databases created by
+create_all upgrade cleanly (like 0002 and 0003).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(inspector, table: str, column: str) -> bool:
+    return any(existing["name"] == column for existing in inspector.get_columns(table))
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not _has_column(inspector, "designs", "supplier"):
+        op.add_column("designs", sa.Column("supplier", sa.String(100), nullable=True))
+    if not _has_column(inspector, "validations", "standard"):
+        op.add_column("validations", sa.Column("standard", sa.String(100), nullable=True))
+    if not inspector.has_table("validation_aggregates"):
+        op.create_table(
+            "validation_aggregates",
+            sa.Column("dimension", sa.String(30), primary_key=True),
+            sa.Column("key", sa.String(200), primary_key=True),
+            sa.Column("field", sa.String(50), primary_key=True),
+            sa.Column("status", sa.String(10), primary_key=True),
+            sa.Column("count", sa.Integer(), nullable=False),
+        )
+    if not inspector.has_table("analytics_refreshes"):
+        op.create_table(
+            "analytics_refreshes",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+            sa.Column("watermark_created_at", sa.DateTime(), nullable=False),
+            sa.Column("watermark_validation_id", sa.Uuid(), nullable=False),
+            sa.Column("validations", sa.Integer(), nullable=False),
+            sa.Column("results", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_refreshes")
+    op.drop_table("validation_aggregates")
+    with op.batch_alter_table("validations") as batch:
+        batch.drop_column("standard")
+    with op.batch_alter_table("designs") as batch:
+        batch.drop_column("supplier")
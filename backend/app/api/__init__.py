@@ -1,4 +1,4 @@
 """API package."""
-from app.api.routes import validation_router, designs_router
+from app.api.routes import validation_router, designs_router, admin_router
 
-__all__ = ["validation_router", "designs_router"]
+__all__ = ["validation_router", "designs_router", "admin_router"]
@@ -1,9 +1,94 @@
 """API dependencies."""
-from app.database import get_db
+from contextlib import asynccontextmanager
+from fastapi import Header, HTTPException, Query, Request
+from app.config import settings
+from app.database import SessionLocal, get_db, get_async_db
+from app.services.deadline import Deadline
+from app.services.export import arrow_available
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Generator
+from typing import AsyncGenerator, AsyncIterator, Callable, Generator, Optional
+import asyncio
+import hmac
+
+DISCONNECT_POLL_SECONDS = 0.5
 
 
 def get_database() -> Generator[Session, None, None]:
     """Get database session dependency."""
     yield from get_db()
+
+
+def get_session_factory() -> Callable[[], Session]:
+    """Session factory for long-lived handlers that open a short session per unit of work."""
+    return SessionLocal
+
+
+async def get_async_database() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session dependency."""
+    async for db in get_async_db():
+        yield db
+
+
+def get_request_lane(
+    x_priority: str = Header("interactive", pattern="^(interactive|batch|background)$")
+) -> str:
+    """Admission lane from the X-Priority header (UI traffic is interactive by default)."""
+    return x_priority
+
+
+def get_include_usage(x_include_usage: bool = Header(False)) -> bool:
+    """Whether the caller asked for the per-request LLM usage in the response body."""
+    return x_include_usage
+
+
+def get_profile_request(x_profile: bool = Header(False)) -> bool:
+    """Whether the caller asked for this request to be profiled (honoured only while profiling is enabled)."""
+    return x_profile
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Admin endpoints: disabled (404) without ADMIN_TOKEN, else X-Admin-Token must match it."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token or "", settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def get_request_deadline(
+    x_request_timeout: Optional[float] = Header(None, gt=0)
+) -> Deadline:
+    """Time budget from the X-Request-Timeout header (seconds), capped by configuration."""
+    seconds = x_request_timeout or settings.REQUEST_DEADLINE_SECONDS
+    return Deadline(min(seconds, settings.REQUEST_DEADLINE_MAX_SECONDS))
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(request: Request, deadline: Deadline) -> AsyncIterator[None]:
+    """Cancel the request's deadline (and so its remaining graph work) if the client goes away."""
+    async def watch() -> None:
+        while not await request.is_disconnected():
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+        if deadline.cancel():
+            print(f"\n CLIENT DISCONNECTED - cancelling {request.url.path}")
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield
+    finally:
+        watcher.cancel()
+
+
+def get_export_format(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet|arrow)$")
+) -> str:
+    """Export format query parameter; columnar formats need pyarrow installed."""
+    if format in ("parquet", "arrow") and not arrow_available():
+        raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow")
+    return format
+
+
+def export_filename(name: str, fmt: str) -> dict:
+    """Content-Disposition header for an export download."""
+    extension = {"arrow": "arrows"}.get(fmt, fmt)
+    return {"Content-Disposition": f'attachment; filename="{name}.{extension}"'}
@@ -1,5 +1,6 @@
 """API routes package."""
 from app.api.routes.validation import router as validation_router
 from app.api.routes.designs import router as designs_router
+from app.api.routes.admin import router as admin_router
 
-__all__ = ["validation_router", "designs_router"]
+__all__ = ["validation_router", "designs_router", "admin_router"]
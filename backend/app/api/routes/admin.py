@@ -0,0 +1,67 @@
+"""
+Admin API routes.
+Runtime controls for operators: the on-demand sampling profiler, cache
+stats and analytics refreshes.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from app.api.deps import get_database, require_admin
+from app.schemas import AnalyticsRefreshResult, CacheStats, ProfilingStatus, ProfilingUpdate
+from app.services.analytics import rebuild_aggregates, refresh_aggregates
+from app.services.cache import cache_stats
+from app.services.profiling import profiler
+from typing import List
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiling", response_model=ProfilingStatus)
+def get_profiling():
+    """Profiler settings and summaries of the captured profiles."""
+    return profiler.status()
+
+
+@router.put("/profiling", response_model=ProfilingStatus)
+def update_profiling(update: ProfilingUpdate):
+    """Turn profiling on or off and change the sample rate or interval (this worker only)."""
+    profiler.configure(
+        enabled=update.enabled,
+        sample_rate=update.sample_rate,
+        interval=update.interval_ms / 1000 if update.interval_ms is not None else None
+    )
+    return profiler.status()
+
+
+@router.delete("/profiling/profiles", status_code=204)
+def clear_profiles():
+    """Drop the captured profiles."""
+    profiler.clear()
+
+
+@router.get("/profiling/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str):
+    """
+    Collapsed stacks ("frame;frame;frame count" per line): feed them to
+    flamegraph.pl or open them in speedscope.
+    """
+    collapsed = profiler.collapsed(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(collapsed, headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed"'})
+
+
+@router.get("/cache", response_model=List[CacheStats])
+def get_cache_stats():
+    """Hits, misses, writes and backend errors per cache namespace (this worker)."""
+    return cache_stats()
+
+
+@router.post("/analytics/refresh", response_model=AnalyticsRefreshResult)
+def refresh_analytics(rebuild: bool = False, db: Session = Depends(get_database)):
+    """
+    Fold new validation results into the analytics aggregates now
+    (rebuild=true recomputes them from all stored results).
+    """
+    summary = rebuild_aggregates(db) if rebuild else refresh_aggregates(db)
+    return AnalyticsRefreshResult(refreshed=summary is not None, **(summary or {}))
@@ -2,53 +2,181 @@
 Designs API routes.
 CRUD operations for cable designs.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_database
-from app.schemas import DesignCreate, DesignUpdate, DesignResponse
+from app.api.deps import get_database, get_async_database, get_export_format, export_filename
+from app.config import settings
+from app.database import SessionLocal
+from app.schemas import DesignCreate, DesignUpdate, DesignResponse, DesignFilters, DesignImportReport
 from app.models import Design
-from typing import List
+from app.services import result_cache, revalidation_worker
+from app.services.design_import import detect_format, import_designs, iter_csv_rows, iter_ndjson_rows
+from app.services.export import EXPORT_FORMATS, designs_query, stream_export
+from app.services.design_listing import InvalidCursorError, alist_designs_page
+from app.services.process_pool import validate_designs
+from typing import List, Optional
+import csv
+import io
+import json
+import shutil
+import tempfile
 
 router = APIRouter(prefix="/api/designs", tags=["designs"])
 
 
+def design_changed(design_id: str, revalidate: bool = True) -> None:
+    """Drop stale verdicts for a design and queue a background re-validation."""
+    result_cache.invalidate_design(design_id)
+    if revalidate:
+        revalidation_worker.enqueue(design_id)
+
+
 @router.post("/", response_model=DesignResponse, status_code=201)
 async def create_design(
     design: DesignCreate,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Create a new cable design."""
-    # Check if design ID already exists
-    existing = db.query(Design).filter(Design.id == design.id).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Design ID already exists")
-    
     db_design = Design(**design.model_dump())
     db.add(db_design)
-    db.commit()
-    db.refresh(db_design)
+    try:
+        # The primary key rejects duplicates; no separate existence check
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Design ID already exists")
+    await db.refresh(db_design)
+    design_changed(db_design.id)
     
     return db_design
 
 
+@router.post("/import", response_model=DesignImportReport)
+async def import_designs_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    revalidate: bool = False,
+    db: Session = Depends(get_database)
+):
+    """
+    Bulk import designs from a CSV (with header) or NDJSON upload.
+    Existing IDs are updated; invalid rows are reported per line.
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    lines = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+
+    def on_batch(design_ids: List[str]) -> None:
+        result_cache.invalidate_designs(design_ids)
+        if revalidate:
+            revalidation_worker.enqueue_many(design_ids)
+
+    try:
+        report = await run_in_threadpool(import_designs, db, lines, fmt, on_batch=on_batch)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
+    finally:
+        lines.detach()
+    print(f"\n IMPORTED {report.imported}/{report.total_rows} designs ({report.rows_per_second} rows/s)")
+    return report
+
+
+@router.post("/validate-bulk")
+def validate_designs_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$")
+):
+    """
+    Deterministic IEC verdicts for every design in a CSV or NDJSON upload,
+    without importing it or calling the LLM. Streams NDJSON, one line per
+    design: {"line", "design_id", "status", "missing_attributes",
+    "attributes", "validation"}. Rows that cannot be read get
+    {"line", "error"}. The work runs on the bulk process pool (BULK_WORKERS).
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    upload = tempfile.TemporaryFile()  # the upload is closed before the response is streamed
+    shutil.copyfileobj(file.file, upload)
+    upload.seek(0)
+    lines = io.TextIOWrapper(upload, encoding="utf-8", newline="")
+    errors: List[bytes] = []
+
+    def rows():
+        for line_no, row in (iter_csv_rows(lines) if fmt == "csv" else iter_ndjson_rows(lines)):
+            if isinstance(row, dict):
+                yield {**row, "line": line_no}
+            else:
+                error = f"Invalid JSON: {row}" if isinstance(row, Exception) else "Row is not an object"
+                errors.append(json.dumps({"line": line_no, "error": error}).encode() + b"\n")
+
+    def body():
+        try:
+            for chunk in validate_designs(rows()):
+                if errors:
+                    yield b"".join(errors)
+                    errors.clear()
+                yield chunk
+            yield b"".join(errors)
+        except (UnicodeDecodeError, csv.Error) as e:
+            yield json.dumps({"error": f"Unreadable upload: {e}"}).encode() + b"\n"
+        finally:
+            lines.close()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/export")
+def export_designs(
+    filters: DesignFilters = Depends(),
+    fmt: str = Depends(get_export_format)
+):
+    """Stream the (filtered) designs as NDJSON, CSV, Parquet or an Arrow stream."""
+    return StreamingResponse(
+        stream_export(SessionLocal, designs_query(filters), fmt, settings.EXPORT_CHUNK_SIZE),
+        media_type=EXPORT_FORMATS[fmt],
+        headers=export_filename("designs", fmt)
+    )
+
+
 @router.get("/", response_model=List[DesignResponse])
 async def list_designs(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_database)
+    request: Request,
+    response: Response,
+    filters: DesignFilters = Depends(),
+    sort: str = Query("id", pattern="^(id|updated_at)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    db: AsyncSession = Depends(get_async_database)
 ):
-    """List all cable designs."""
-    designs = db.query(Design).offset(skip).limit(limit).all()
+    """
+    List cable designs with keyset pagination.
+
+    The next page's cursor is returned in the X-Next-Cursor header (and a
+    Link rel="next" header); it is absent on the last page.
+    """
+    try:
+        designs, next_cursor = await alist_designs_page(db, filters, sort, limit, cursor, skip)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        next_url = request.url.remove_query_params(["skip", "cursor"]).include_query_params(cursor=next_cursor)
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
     return designs
 
 
 @router.get("/{design_id}", response_model=DesignResponse)
 async def get_design(
     design_id: str,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Get a specific cable design by ID."""
-    design = db.query(Design).filter(Design.id == design_id).first()
+    design = await db.get(Design, design_id)
     
     if not design:
         raise HTTPException(status_code=404, detail="Design not found")
@@ -60,10 +188,10 @@ async def get_design(
 async def update_design(
     design_id: str,
     design_update: DesignUpdate,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Update a cable design."""
-    design = db.query(Design).filter(Design.id == design_id).first()
+    design = await db.get(Design, design_id)
     
     if not design:
         raise HTTPException(status_code=404, detail="Design not found")
@@ -73,8 +201,9 @@ async def update_design(
     for field, value in update_data.items():
         setattr(design, field, value)
     
-    db.commit()
-    db.refresh(design)
+    await db.commit()
+    await db.refresh(design)
+    design_changed(design.id)
     
     return design
 
@@ -82,15 +211,16 @@ async def update_design(
 @router.delete("/{design_id}", status_code=204)
 async def delete_design(
     design_id: str,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Delete a cable design."""
-    design = db.query(Design).filter(Design.id == design_id).first()
+    design = await db.get(Design, design_id)
     
     if not design:
         raise HTTPException(status_code=404, detail="Design not found")
     
-    db.delete(design)
-    db.commit()
+    await db.delete(design)
+    await db.commit()
+    design_changed(design_id, revalidate=False)
     
     return None
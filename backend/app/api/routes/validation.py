@@ -2,19 +2,114 @@
 Validation API routes.
 Main endpoint for running cable design validation.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from app.api.deps import get_database
-from app.schemas import ValidationRequest, HITLResponseRequest, ValidationResponse, ValidationResultItem, HITLInteractionItem
-from app.services import ValidationService
+from app.api.deps import (
+    cancel_on_disconnect, get_database, get_export_format, get_include_usage, get_profile_request,
+    get_request_deadline, get_request_lane, get_session_factory, export_filename
+)
+from app.config import settings
+from app.database import SessionLocal
+from app.schemas import (
+    ValidationRequest, HITLResponseRequest, ValidationResponse, ValidationResultItem, HITLInteractionItem,
+    NarrativeResponse, UsageReport, HITLSessionResponse, AnalyticsReport
+)
+from app.services import (
+    ValidationService, LLMUnavailableError, AdmissionRejected, Deadline, RequestDeadlineExceeded,
+    hitl_sessions, HITLSessionNotFound, HITLSessionConflict
+)
+from app.services.analytics import analytics_report
+from app.services.hitl_channel import HITLChannel, HITLChannelError
+from app.services.export import EXPORT_FORMATS, validation_results_query, stream_export
+from app.services.narrative import narratives
+from app.services.usage import summarize_usage, usage_header, usage_report
+from datetime import datetime
+from typing import Callable, Optional
+import asyncio
+import json
+import math
 
 router = APIRouter(prefix="/api/validations", tags=["validations"])
 
 
+def llm_unavailable_exception(error: LLMUnavailableError) -> HTTPException:
+    """Map an unhealthy LLM provider to 503 with a Retry-After hint."""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
+def admission_rejected_exception(error: AdmissionRejected) -> HTTPException:
+    """Shed request: 429 (queue full) or 503 (queued too long) with Retry-After."""
+    return HTTPException(
+        status_code=error.status_code,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
+def request_usage(result: dict, response: Response, include_usage: bool) -> Optional[dict]:
+    """Set X-LLM-Usage and return the usage summary if the caller asked for it."""
+    if settings.LLM_USAGE_HEADER:
+        response.headers["X-LLM-Usage"] = usage_header(result.get("llm_usage"))
+    return summarize_usage(result.get("llm_usage")) if include_usage else None
+
+
+def validation_response(
+    result: dict,
+    usage: Optional[dict] = None,
+    hitl_required: Optional[bool] = None
+) -> ValidationResponse:
+    """Response for a workflow result; HITL is required while its session stays open unless told otherwise."""
+    hitl_interactions = []
+    for interaction in result.get("conversation_history", []):
+        parts = interaction.split(" | ")
+        if len(parts) == 2:
+            hitl_interactions.append(
+                HITLInteractionItem(
+                    field=parts[0].replace("Q: ", "").strip(),
+                    user_response=parts[1].replace("A: ", "").strip(),
+                    timestamp=None
+                )
+            )
+
+    return ValidationResponse(
+        user_input=result["user_input"],
+        route=result.get("route"),
+        design_id=result.get("design_id"),
+        attributes=result.get("attributes", {}),
+        missing_attributes=result.get("missing_attributes", []),
+        validation=[ValidationResultItem(**item) for item in result.get("validation") or []],
+        reasoning=result.get("reasoning"),
+        confidence=result.get("confidence"),
+        hitl_mode=result.get("hitl_mode", False),
+        hitl_required=bool(result.get("session_id")) if hitl_required is None else hitl_required,
+        hitl_interactions=hitl_interactions,
+        suggestions=result.get("attribute_suggestions") or {},
+        inferred=result.get("inferred_attributes") or {},
+        partial=bool(result.get("partial")),
+        skipped=result.get("skipped_steps") or [],
+        validation_id=result.get("validation_id"),
+        narrative_status="pending" if result.get("narrative_pending") else None,
+        usage=usage,
+        session_id=result.get("session_id"),
+        session_version=result.get("session_version")
+    )
+
+
 @router.post("/validate", response_model=ValidationResponse)
 async def validate_design(
     request: ValidationRequest,
-    db: Session = Depends(get_database)
+    http_request: Request,
+    http_response: Response,
+    db: Session = Depends(get_database),
+    lane: str = Depends(get_request_lane),
+    deadline: Deadline = Depends(get_request_deadline),
+    include_usage: bool = Depends(get_include_usage),
+    profile: bool = Depends(get_profile_request)
 ):
     """
     Validate a cable design.
@@ -23,20 +118,33 @@ async def validate_design(
     
     Args:
         request: Validation request with user_input and hitl_mode
+        http_request: Raw request (watched for client disconnects)
+        http_response: Outgoing response (X-LLM-Usage header)
         db: Database session
+        lane: Admission priority from the X-Priority header
+        deadline: Time budget from the X-Request-Timeout header
+        include_usage: Return LLM usage in the body (X-Include-Usage header)
+        profile: Profile this request (X-Profile header, when profiling is enabled)
     
     Returns:
         Validation results with PASS/WARN/FAIL status for each field
+        (partial when the deadline is hit)
     """
     try:
         # Create validation service
         service = ValidationService(db)
         
         # Run validation (exact notebook logic)
-        result = service.run_validation(
-            user_input=request.user_input,
-            hitl_mode=request.hitl_mode
-        )
+        async with cancel_on_disconnect(http_request, deadline):
+            result = await service.arun_validation(
+                user_input=request.user_input,
+                hitl_mode=request.hitl_mode,
+                lane=lane,
+                deadline=deadline,
+                deferred_narrative=request.deferred_narrative,
+                profile=profile
+            )
+        usage = request_usage(result, http_response, include_usage)
         
         # Handle IGNORE route - return user-friendly message
         if result.get("route") == "IGNORE":
@@ -51,50 +159,27 @@ async def validate_design(
                 confidence=0.0,
                 hitl_mode=result.get("hitl_mode", False),
                 hitl_required=False,
-                hitl_interactions=[]
+                hitl_interactions=[],
+                usage=usage
             )
         
-        # Convert to response schema (handle None validation)
-        validation_data = result.get("validation") or []
-        validation_results = [
-            ValidationResultItem(**item)
-            for item in validation_data
-        ]
-        
-        hitl_interactions = []
-        for interaction in result.get("conversation_history", []):
-            parts = interaction.split(" | ")
-            if len(parts) == 2:
-                field = parts[0].replace("Q: ", "").strip()
-                response = parts[1].replace("A: ", "").strip()
-                hitl_interactions.append(
-                    HITLInteractionItem(
-                        field=field,
-                        user_response=response,
-                        timestamp=None
-                    )
-                )
-        
         # Determine if HITL is required
         hitl_required = (
             request.hitl_mode and 
             len(result.get("missing_attributes", [])) > 0 and
             not result.get("conversation_history", [])
         )
-        
-        return ValidationResponse(
-            user_input=result["user_input"],
-            route=result.get("route"),
-            design_id=result.get("design_id"),
-            attributes=result.get("attributes", {}),
-            missing_attributes=result.get("missing_attributes", []),
-            validation=validation_results,
-            reasoning=result.get("reasoning"),
-            confidence=result.get("confidence"),
-            hitl_mode=result.get("hitl_mode", False),
-            hitl_required=hitl_required,
-            hitl_interactions=hitl_interactions
-        )
+        return validation_response(result, usage, hitl_required=hitl_required)
+    
+    except LLMUnavailableError as e:
+        print(f"\n LLM UNAVAILABLE: {e}")
+        raise llm_unavailable_exception(e)
+    
+    except AdmissionRejected as e:
+        raise admission_rejected_exception(e)
+    
+    except RequestDeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     
     except Exception as e:
         import traceback
@@ -106,17 +191,31 @@ async def validate_design(
 @router.post("/validate-with-responses", response_model=ValidationResponse)
 async def validate_with_hitl_responses(
     request: HITLResponseRequest,
-    db: Session = Depends(get_database)
+    http_request: Request,
+    http_response: Response,
+    db: Session = Depends(get_database),
+    lane: str = Depends(get_request_lane),
+    deadline: Deadline = Depends(get_request_deadline),
+    include_usage: bool = Depends(get_include_usage),
+    profile: bool = Depends(get_profile_request)
 ):
     """
     Re-run validation with HITL responses.
     
     This endpoint accepts user responses for missing attributes and
-    re-runs the validation workflow with those values pre-loaded.
+    re-runs the validation workflow with those values pre-loaded. With a
+    session_id it resumes the saved HITL session instead (on any worker);
+    answers that leave fields missing keep the session open.
     
     Args:
         request: HITL response request with user_input and responses
+        http_request: Raw request (watched for client disconnects)
+        http_response: Outgoing response (X-LLM-Usage header)
         db: Database session
+        lane: Admission priority from the X-Priority header
+        deadline: Time budget from the X-Request-Timeout header
+        include_usage: Return LLM usage in the body (X-Include-Usage header)
+        profile: Profile this request (X-Profile header, when profiling is enabled)
     
     Returns:
         Updated validation results with user-provided values
@@ -127,6 +226,7 @@ async def validate_with_hitl_responses(
         print("VALIDATE-WITH-RESPONSES ENDPOINT")
         print("="*80)
         print(f"User input: {request.user_input}")
+        print(f"Session: {request.session_id} (version {request.session_version})")
         print(f"Responses received: {request.responses}")
         print(f"Number of responses: {len(request.responses)}")
         print("="*80)
@@ -135,47 +235,196 @@ async def validate_with_hitl_responses(
         service = ValidationService(db)
         
         # Run validation with HITL responses
-        result = service.run_validation_with_responses(
-            user_input=request.user_input,
-            hitl_responses=request.responses
-        )
-        
-        # Convert to response schema
-        validation_results = [
-            ValidationResultItem(**item)
-            for item in result.get("validation", [])
-        ]
-        
-        hitl_interactions = []
-        for interaction in result.get("conversation_history", []):
-            parts = interaction.split(" | ")
-            if len(parts) == 2:
-                field = parts[0].replace("Q: ", "").strip()
-                response = parts[1].replace("A: ", "").strip()
-                hitl_interactions.append(
-                    HITLInteractionItem(
-                        field=field,
-                        user_response=response,
-                        timestamp=None
-                    )
-                )
+        async with cancel_on_disconnect(http_request, deadline):
+            result = await service.arun_validation_with_responses(
+                user_input=request.user_input,
+                hitl_responses=request.responses,
+                accept_suggestions=request.accept_suggestions,
+                lane=lane,
+                deadline=deadline,
+                profile=profile,
+                session_id=request.session_id,
+                session_version=request.session_version
+            )
+        usage = request_usage(result, http_response, include_usage)
         
-        return ValidationResponse(
-            user_input=result["user_input"],
-            route=result.get("route"),
-            design_id=result.get("design_id"),
-            attributes=result.get("attributes", {}),
-            missing_attributes=result.get("missing_attributes", []),
-            validation=validation_results,
-            reasoning=result.get("reasoning"),
-            confidence=result.get("confidence"),
-            hitl_mode=result.get("hitl_mode", False),
-            hitl_required=False,  # HITL is complete
-            hitl_interactions=hitl_interactions
-        )
+        return validation_response(result, usage)
+    
+    except LLMUnavailableError as e:
+        print(f"\n LLM UNAVAILABLE: {e}")
+        raise llm_unavailable_exception(e)
+    
+    except AdmissionRejected as e:
+        raise admission_rejected_exception(e)
+    
+    except RequestDeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    
+    except HITLSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    except HITLSessionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         print(f"\n HITL SUBMISSION ERROR:\n{error_details}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sessions/{session_id}", response_model=HITLSessionResponse)
+def get_hitl_session(session_id: str):
+    """Saved HITL session: the missing attributes to ask for and the current verdicts."""
+    try:
+        session = hitl_sessions.get(session_id)
+    except HITLSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    state = session["state"]
+    return HITLSessionResponse(
+        session_id=session["id"],
+        version=session["version"],
+        user_input=session["user_input"],
+        attributes=state.get("attributes") or {},
+        missing_attributes=state.get("missing_attributes") or [],
+        validation=state.get("validation") or [],
+        suggestions=state.get("attribute_suggestions") or {},
+        created_at=session["created_at"],
+        updated_at=session["updated_at"]
+    )
+
+
+@router.websocket("/ws")
+async def hitl_channel(
+    websocket: WebSocket,
+    session_factory: Callable[[], Session] = Depends(get_session_factory)
+):
+    """
+    Interactive HITL over a WebSocket. The client sends
+    {"type": "start", "user_input": ...} (or "session_id" to continue a saved
+    session), then {"type": "answer", "field": ..., "value": ...} per missing
+    attribute, in any order. The server replies "questions", then "parsed"
+    after each answer and "result" (a ValidationResponse) after the last one;
+    bad messages get an "error" event. Answers are read while earlier ones
+    are still being parsed, so parsing overlaps with the user typing.
+    No database connection is held while waiting for the client.
+    """
+    await websocket.accept()
+    channel = HITLChannel(session_factory)
+    messages: asyncio.Queue = asyncio.Queue()
+
+    async def receive():
+        try:
+            while True:
+                text = await websocket.receive_text()
+                try:
+                    await messages.put(json.loads(text))
+                except ValueError:
+                    await messages.put({"type": "invalid"})
+        except WebSocketDisconnect:
+            await messages.put(None)
+
+    receiver = asyncio.create_task(receive())
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(messages.get(), settings.HITL_CHANNEL_IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                await websocket.close(code=1000, reason="idle")
+                return
+            if message is None:
+                return  # client went away; the session keeps the answers so far
+            try:
+                event = await asyncio.to_thread(channel.handle, message if isinstance(message, dict) else {})
+            except (HITLChannelError, HITLSessionNotFound, HITLSessionConflict, LLMUnavailableError,
+                    AdmissionRejected, RequestDeadlineExceeded) as e:
+                event = {"type": "error", "detail": str(e)}
+            except Exception as e:
+                import traceback
+                print(f"\n HITL CHANNEL ERROR:\n{traceback.format_exc()}")
+                event = {"type": "error", "detail": str(e)}
+            if event["type"] == "result":
+                event = {"type": "result", "result": validation_response(event["state"]).model_dump(mode="json")}
+            await websocket.send_json(event)
+            if event["type"] == "result":
+                await websocket.close()
+                return
+    finally:
+        receiver.cancel()
+
+
+def _narrative(validation_id: str, db: Session) -> dict:
+    narrative = narratives.get(validation_id) or ValidationService(db).stored_narrative(validation_id)
+    if narrative is None:
+        raise HTTPException(status_code=404, detail=f"No narrative for validation {validation_id}")
+    return narrative
+
+
+@router.get("/{validation_id}/narrative", response_model=NarrativeResponse)
+def get_narrative(validation_id: str, db: Session = Depends(get_database)):
+    """
+    Reasoning and per-field comments of a two-phase validation
+    (202 while they are still being generated).
+    """
+    narrative = _narrative(validation_id, db)
+    if narrative["status"] == "pending":
+        return JSONResponse(status_code=202, content=NarrativeResponse(**narrative).model_dump())
+    return narrative
+
+
+@router.get("/{validation_id}/narrative/stream")
+def stream_narrative(validation_id: str, db: Session = Depends(get_database)):
+    """
+    Server-sent events: the current status at once, then the narrative as
+    soon as it is ready (or the last status after NARRATIVE_STREAM_TIMEOUT).
+    A plain def, so the stored-narrative query runs in the threadpool; the
+    event generator itself runs on the loop.
+    """
+    first = _narrative(validation_id, db)
+
+    def event(name: str, payload: dict) -> str:
+        return f"event: {name}\ndata: {json.dumps(NarrativeResponse(**payload).model_dump())}\n\n"
+
+    async def events():
+        if first["status"] != "pending":
+            yield event("narrative", first)
+            return
+        yield event("status", first)
+        final = await narratives.wait(validation_id, settings.NARRATIVE_STREAM_TIMEOUT) or first
+        yield event("narrative" if final["status"] != "pending" else "status", final)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/usage", response_model=UsageReport)
+def get_usage_report(since: Optional[datetime] = None, db: Session = Depends(get_database)):
+    """LLM calls, tokens and estimated cost of stored validations by node, route and model."""
+    return usage_report(db, since)
+
+
+@router.get("/analytics", response_model=AnalyticsReport)
+def get_analytics(top: Optional[int] = Query(None, ge=1, le=100), db: Session = Depends(get_database)):
+    """
+    Pass/warn/fail rates by field, standard and supplier, the confidence
+    distribution and the most frequent failing field combinations. Read from
+    the materialized aggregates (see refreshed_at), never the raw results.
+    """
+    return analytics_report(db, top)
+
+
+@router.get("/export")
+def export_validation_results(
+    design_id: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    fmt: str = Depends(get_export_format)
+):
+    """
+    Stream persisted field verdicts (one row per validation result, with the
+    parent validation's metadata) as NDJSON, CSV, Parquet or an Arrow stream.
+    """
+    return StreamingResponse(
+        stream_export(SessionLocal, validation_results_query(design_id, status, since), fmt, settings.EXPORT_CHUNK_SIZE),
+        media_type=EXPORT_FORMATS[fmt],
+        headers=export_filename("validation_results", fmt)
+    )
@@ -3,7 +3,7 @@ Configuration management for the application.
 Loads environment variables and provides application settings.
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -11,6 +11,12 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection (0 behind pgbouncer)
+    DB_QUERY_CACHE_SIZE: int = 500  # SQLAlchemy compiled statement cache
     
     # LLM Configuration
     LLM_PROVIDER: str = "google"
@@ -23,6 +29,116 @@ class Settings(BaseSettings):
     LLM_MODEL: str = "gemini-2.5-flash"
     LLM_TEMPERATURE: float = 0.1
     
+    # LLM Resilience
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_RATE_LIMIT_PER_SECOND: float = 5.0
+    LLM_RATE_LIMIT_BURST: int = 10
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BACKOFF_BASE: float = 0.5
+    LLM_RETRY_BACKOFF_MAX: float = 8.0
+    LLM_CALL_TIMEOUT: float = 30.0
+    LLM_QUEUE_TIMEOUT: float = 10.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RECOVERY_SECONDS: float = 30.0
+    LLM_CACHE_SIZE: int = 512
+    
+    # LLM Hedging (duplicate slow calls after a latency percentile)
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_PROVIDER: str = ""
+    LLM_LATENCY_WINDOW: int = 200
+    
+    # LLM usage accounting: USD per million [input, output] tokens by model name
+    LLM_PRICING: Dict[str, List[float]] = {}
+    LLM_USAGE_HEADER: bool = True  # X-LLM-Usage response header with calls/tokens/cost
+    
+    # Result cache and background re-validation
+    RESULT_CACHE_SIZE: int = 1024
+    RESULT_CACHE_TTL_SECONDS: float = 3600.0
+    REVALIDATION_ENABLED: bool = True
+    REVALIDATION_DEBOUNCE_SECONDS: float = 2.0
+    REVALIDATION_MAX_DELAY_SECONDS: float = 30.0
+    
+    # Cache backend shared by the result, LLM-response and design caches:
+    # memory (per worker), sqlite (per host) or resp (Redis protocol, shared).
+    # memory is refused with more than one worker: design invalidation would
+    # only reach the worker that handled the change.
+    CACHE_BACKEND: str = "memory"
+    WEB_CONCURRENCY: int = 1  # worker processes; uvicorn and gunicorn read the same variable
+    CACHE_TTLS: Dict[str, float] = {}  # seconds by namespace (results, llm, designs)
+    CACHE_MEMORY_MAX_ENTRIES: int = 1024  # per namespace, unless it has its own size setting
+    CACHE_SQLITE_PATH: str = "cache.sqlite3"
+    CACHE_SQLITE_MAX_ENTRIES: int = 100000
+    CACHE_SQLITE_MMAP_BYTES: int = 268435456
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "cable:"
+    CACHE_TIMEOUT: float = 1.0
+
+    # Validation analytics: materialized aggregates refreshed incrementally (0 = no schedule)
+    ANALYTICS_REFRESH_SECONDS: float = 300.0
+    ANALYTICS_BATCH_SIZE: int = 5000
+    ANALYTICS_SETTLE_SECONDS: float = 10.0  # newer validations wait for the next refresh
+    ANALYTICS_TOP_COMBINATIONS: int = 10
+
+    # HITL sessions (in-progress validations waiting for answers, in the cache backend)
+    HITL_SESSION_TTL_SECONDS: float = 1800.0
+    HITL_CHANNEL_IDLE_SECONDS: float = 300.0  # WebSocket HITL: close after this long without a message
+    
+    # Bulk import/export
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 1000
+    IMPORT_USE_COPY: bool = False
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Process pool for CPU-bound bulk validation (0 = one worker per CPU, 1 = in-process)
+    BULK_WORKERS: int = 0
+    BULK_CHUNK_SIZE: int = 10000
+    BULK_START_METHOD: str = "spawn"  # spawn, forkserver or fork
+    
+    # Missing-attribute suggestions (nearest validated designs)
+    SUGGESTIONS_ENABLED: bool = True
+    SUGGESTION_NEIGHBORS: int = 15
+    SUGGESTION_MIN_SUPPORT: int = 3
+    SUGGESTION_INDEX_MAX_ENTRIES: int = 50000
+    
+    # Canonical units/spellings for attributes (also keys verdict reuse across inputs)
+    NORMALIZATION_ENABLED: bool = True
+    
+    # Deterministic inference of missing attributes from IEC tables
+    INFERENCE_ENABLED: bool = True
+    
+    # Admission control: concurrent graph executions and bounded wait queue per worker
+    ADMISSION_MAX_INFLIGHT: int = 8
+    ADMISSION_MAX_QUEUE: int = 32
+    ADMISSION_QUEUE_TIMEOUT: float = 10.0
+
+    # Per-request time budget (X-Request-Timeout header, capped at the max)
+    REQUEST_DEADLINE_SECONDS: float = 60.0
+    REQUEST_DEADLINE_MAX_SECONDS: float = 300.0
+    DEADLINE_NARRATIVE_MIN_SECONDS: float = 10.0  # below this, validate without the narrative
+
+    # Two-phase responses: deterministic verdicts now, LLM narrative in the background
+    NARRATIVE_WORKERS: int = 2
+    NARRATIVE_STORE_SIZE: int = 1024
+    NARRATIVE_STREAM_TIMEOUT: float = 60.0
+
+    # On-demand sampling profiler around validations (X-Profile header or sample rate)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_PROFILES: int = 50
+    PROFILING_MAX_CONCURRENT: int = 2
+
+    # Admin endpoints (/api/admin); disabled while empty, else requests need a matching X-Admin-Token
+    ADMIN_TOKEN: str = ""
+    
+    # Startup warmup (gates /ready)
+    WARMUP_ENABLED: bool = True
+    WARMUP_LLM_PROBE: bool = True
+    WARMUP_DB_CONNECTIONS: int = 10
+    WARMUP_RETRY_SECONDS: float = 5.0
+    
     # API Configuration
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
@@ -1,21 +1,73 @@
 """
 Database configuration and session management.
+A synchronous engine serves the LangGraph workflow, bulk import/export and
+background workers; an async engine (asyncpg / aiosqlite) serves the
+request-path CRUD routes without blocking the event loop.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from typing import Any, AsyncGenerator, Dict
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL (postgresql://, postgresql+psycopg2://, sqlite://) to its async driver."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.drivername in ASYNC_DRIVERS.values():
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """Pool sizing for server databases; SQLite keeps SQLAlchemy's defaults."""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    return options
+
+
+def create_async_database_engine(url: str, **kwargs):
+    async_url = async_database_url(url)
+    options = {**pool_options(url), **kwargs}
+    if make_url(async_url).drivername == "postgresql+asyncpg":
+        options.setdefault("connect_args", {})["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    return create_async_engine(async_url, **options)
+
 
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.LOG_LEVEL == "DEBUG"
+    echo=settings.LOG_LEVEL == "DEBUG",
+    **pool_options(settings.DATABASE_URL)
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory for the CRUD routes
+async_engine = create_async_database_engine(
+    settings.DATABASE_URL,
+    echo=settings.LOG_LEVEL == "DEBUG"
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -30,3 +82,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of get_db."""
+    async with AsyncSessionLocal() as db:
+        yield db
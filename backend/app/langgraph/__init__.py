@@ -1,5 +1,5 @@
 """LangGraph workflow package."""
-from app.langgraph.workflow import create_validation_graph
+from app.langgraph.workflow import create_validation_graph, get_validation_graph, create_resume_graph, get_resume_graph, create_interactive_graph
 from app.langgraph.state import CableValidationState
 
-__all__ = ["create_validation_graph", "CableValidationState"]
+__all__ = ["create_validation_graph", "get_validation_graph", "create_resume_graph", "get_resume_graph", "create_interactive_graph", "CableValidationState"]
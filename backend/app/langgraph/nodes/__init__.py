@@ -2,17 +2,22 @@
 from app.langgraph.nodes.supervisor import supervisor_agent
 from app.langgraph.nodes.fetch_design import fetch_design_node
 from app.langgraph.nodes.extract_text import extract_from_text_node
+from app.langgraph.nodes.normalize import normalize_attributes_node
 from app.langgraph.nodes.check_missing import check_missing_attributes
+from app.langgraph.nodes.infer_missing import infer_missing_attributes
 from app.langgraph.nodes.validation import validation_agent
-from app.langgraph.nodes.hitl import hitl_prompt_node, ask_missing_attribute, parse_single_attribute_with_llm
+from app.langgraph.nodes.hitl import hitl_prompt_node, ask_missing_attribute, await_missing_attribute, parse_single_attribute_with_llm
 
 __all__ = [
     "supervisor_agent",
     "fetch_design_node",
     "extract_from_text_node",
+    "normalize_attributes_node",
     "check_missing_attributes",
+    "infer_missing_attributes",
     "validation_agent",
     "hitl_prompt_node",
     "ask_missing_attribute",
+    "await_missing_attribute",
     "parse_single_attribute_with_llm"
 ]
@@ -1,7 +1,9 @@
 """
 Check Missing Attributes Node
 """
+from app.config import settings
 from app.langgraph.state import CableValidationState
+from app.services.design_index import design_index
 from app.utils.constants import REQUIRED_ATTRIBUTES
 
 
@@ -13,6 +15,12 @@ def check_missing_attributes(state: CableValidationState) -> CableValidationStat
 
     state["missing_attributes"] = missing
 
+    if missing and settings.SUGGESTIONS_ENABLED:
+        suggestions = design_index.suggest(attributes, missing)
+        state["attribute_suggestions"] = suggestions
+        if suggestions:
+            print(f"\n SUGGESTIONS: {suggestions}")
+
     if missing:
         print(f"\n MISSING ATTRIBUTES: {missing}")
         if state.get("hitl_mode", False):
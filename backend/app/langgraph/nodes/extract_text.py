@@ -1,17 +1,30 @@
 """
-Extract From Text Node - EXACT COPY from Jupyter notebook.
-DO NOT MODIFY - This is the exact implementation from the notebook.
+Extract From Text Node.
+Extracts attributes from free text with the notebook's LLM prompt. In
+two-phase mode a specification the parser understands skips the LLM.
 """
 from app.langgraph.state import CableValidationState
+from app.services.deadline import deadline_from
 from app.services.llm_service import llm
+from app.services.usage import record_usage
+from app.utils.normalization import parse_specification
+from langchain_core.runnables import RunnableConfig
+from typing import Optional
 import json
 import re
 
 
-def extract_from_text_node(state: CableValidationState) -> CableValidationState:
+def extract_from_text_node(state: CableValidationState, config: Optional[RunnableConfig] = None) -> CableValidationState:
     """Extract cable specifications from text"""
     user_input = state["user_input"]
 
+    if state.get("deferred_narrative"):
+        parsed = parse_specification(user_input)
+        if parsed is not None:
+            print(f"\nEXTRACTED ATTRIBUTES (deterministic): {parsed}")
+            state["attributes"] = parsed
+            return state
+
     prompt = f"""Extract cable specifications from text. Return ONLY values explicitly stated.
 
 Input: "{user_input}"
@@ -38,7 +51,8 @@ Examples:
 
 Extract now (JSON only):"""
 
-    response = llm.invoke(prompt)
+    response = llm.invoke(prompt, node="extract_from_text", deadline=deadline_from(config))
+    record_usage(state, "extract_from_text", response)
 
     try:
         content = response.content.strip()
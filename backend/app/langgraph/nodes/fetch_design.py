@@ -1,18 +1,35 @@
 """
-Fetch Design Node - EXACT COPY from Jupyter notebook.
-DO NOT MODIFY - Adapted to use database instead of mock dictionary.
+Fetch Design Node.
+Reads the design from the database through the shared design cache (entries
+are valid while the design's generation is unchanged); the notebook's mock
+dictionary is used only when no session is given. Pre-loaded HITL answers
+are merged into the fetched attributes.
 """
 from app.langgraph.state import CableValidationState
+from app.services.cache import design_cache
+from app.services.deadline import RequestDeadlineExceeded, deadline_from, record_skipped
 from app.services.llm_service import llm
+from app.services.result_cache import result_cache
+from app.services.usage import record_usage
 from sqlalchemy.orm import Session
+from langchain_core.runnables import RunnableConfig
 from app.models import Design
+from typing import Optional
 import re
 import json
 
 
-def fetch_design_node(state: CableValidationState, db: Session = None) -> CableValidationState:
+def fetch_design_node(
+    state: CableValidationState,
+    config: Optional[RunnableConfig] = None,
+    db: Session = None
+) -> CableValidationState:
     """Fetch design from database (adapted from notebook's fetch_design_node)"""
     user_input = state["user_input"]
+    deadline = deadline_from(config)
+    if db is None and config:
+        # ValidationService passes its session through the graph config
+        db = config.get("configurable", {}).get("db")
 
     pattern = r'DESIGN-\d+'
     match = re.search(pattern, user_input, re.IGNORECASE)
@@ -22,7 +39,13 @@ def fetch_design_node(state: CableValidationState, db: Session = None) -> CableV
     else:
         prompt = f"""Extract design ID from: "{user_input}"
 Return JSON: {{"design_id": "DESIGN-XXX"}} or {{"design_id": null}}"""
-        response = llm.invoke(prompt)
+        response = llm.invoke(
+            prompt,
+            node="fetch_design",
+            fallback=lambda: json.dumps({"design_id": None}),
+            deadline=deadline
+        )
+        record_usage(state, "fetch_design", response)
         try:
             content = re.sub(r'```json\s*|\s*```', '', response.content.strip())
             match = re.search(r'\{[^}]+\}', content)
@@ -37,9 +60,16 @@ Return JSON: {{"design_id": "DESIGN-XXX"}} or {{"design_id": null}}"""
         
         # Fetch from database if db session provided
         if db:
-            design = db.query(Design).filter(Design.id == design_id).first()
-            if design:
-                attributes = design.to_dict()
+            # Shared design cache first; a design change bumps its generation
+            generation = result_cache.generation(design_id)
+            cached = design_cache.get(design_id)
+            attributes = cached["attributes"] if cached and cached["generation"] == generation else None
+            if attributes is None:
+                design = db.query(Design).filter(Design.id == design_id).first()
+                if design:
+                    attributes = design.to_dict()
+                    design_cache.set(design_id, {"generation": generation, "attributes": attributes})
+            if attributes is not None:
                 print(f"\n FETCHED DESIGN: {design_id}")
                 state["design_id"] = design_id
                 state["attributes"] = attributes
@@ -66,7 +96,11 @@ Return JSON: {{"design_id": "DESIGN-XXX"}} or {{"design_id": null}}"""
             attributes = state.get("attributes", {})
             for attr, user_response in hitl_responses.items():
                 print(f"   Merging: {attr} = {user_response}")
-                value = parse_single_attribute_with_llm(llm, attr, user_response)
+                try:
+                    value = parse_single_attribute_with_llm(llm, attr, user_response, deadline=deadline, state=state)
+                except RequestDeadlineExceeded:
+                    record_skipped(state, "hitl_responses")
+                    break
                 if value is not None:
                     attributes[attr] = value
                     print(f"   ✓ Set {attr} = {value}")
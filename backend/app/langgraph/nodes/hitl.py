@@ -2,9 +2,16 @@
 HITL (Human-in-the-Loop) Nodes - EXACT LOGIC from Jupyter notebook.
 Adapted for web-based interaction (returns data for frontend to handle).
 """
+from app.config import settings
 from app.langgraph.state import CableValidationState
+from app.services.deadline import Deadline, RequestDeadlineExceeded, deadline_from, record_skipped
+from app.services.design_index import SUGGESTIONS
 from app.services.llm_service import llm
-from typing import Any
+from app.services.usage import record_usage
+from app.utils.normalization import normalize_value
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import interrupt
+from typing import Any, Dict, Optional
 import json
 import re
 
@@ -54,7 +61,12 @@ def hitl_prompt_node(state: CableValidationState) -> CableValidationState:
         return state
 
 
-def ask_missing_attribute(state: CableValidationState, user_response: str = None, attr: str = None) -> CableValidationState:
+def ask_missing_attribute(
+    state: CableValidationState,
+    user_response: str = None,
+    attr: str = None,
+    config: Optional[RunnableConfig] = None
+) -> CableValidationState:
     """
     Prompt user for a single missing attribute
     NOTE: For web-based HITL, user_response and attr are provided via API
@@ -96,8 +108,18 @@ def ask_missing_attribute(state: CableValidationState, user_response: str = None
                 # Add to conversation history
                 conversation_history.append(f"Q: {attr_name} | A: {user_resp}")
                 
-                # Parse the response
-                value = parse_single_attribute_with_llm(llm, attr_name, user_resp)
+                # Parse the response (a confirmed suggestion needs no LLM call)
+                value = confirmed_suggestion(state.get("attribute_suggestions"), attr_name, user_resp)
+                if value is None:
+                    try:
+                        value = parse_single_attribute_with_llm(
+                            llm, attr_name, user_resp, deadline=deadline_from(config), state=state
+                        )
+                    except RequestDeadlineExceeded:
+                        # Out of time: leave the remaining answers unapplied
+                        conversation_history.pop()
+                        record_skipped(state, "hitl_responses")
+                        break
                 
                 if value is not None:
                     attributes[attr_name] = value
@@ -169,7 +191,13 @@ def ask_missing_attribute(state: CableValidationState, user_response: str = None
 
     # Parse the user response
     attributes = state.get("attributes", {})
-    value = parse_single_attribute_with_llm(llm, attr, user_response)
+    try:
+        value = parse_single_attribute_with_llm(
+            llm, attr, user_response, deadline=deadline_from(config), state=state
+        )
+    except RequestDeadlineExceeded:
+        record_skipped(state, "hitl_responses")
+        return state
 
     if value is not None:
         attributes[attr] = value
@@ -198,12 +226,43 @@ def ask_missing_attribute(state: CableValidationState, user_response: str = None
     return state
 
 
+def await_missing_attribute(
+    state: CableValidationState,
+    config: Optional[RunnableConfig] = None
+) -> CableValidationState:
+    """
+    Interactive HITL (WebSocket channel): pause the run with a LangGraph
+    interrupt until the next answer arrives, then parse it like
+    ask_missing_attribute. Answers may come for any missing field, in any order.
+    """
+    answer = interrupt({"missing_attributes": state.get("missing_attributes", [])})
+    return ask_missing_attribute(state, user_response=answer["value"], attr=answer["field"], config=config)
+
+
+def confirmed_suggestion(
+    suggestions: Optional[Dict[str, Dict[str, Any]]],
+    attribute_name: str,
+    user_response: str
+) -> Any:
+    """The suggested value when the user's answer simply repeats it, else None."""
+    suggestion = (suggestions or {}).get(attribute_name)
+    if suggestion is None:
+        return None
+    normalized = " ".join(str(user_response).split()).casefold()
+    if normalized == " ".join(str(suggestion["value"]).split()).casefold():
+        SUGGESTIONS.inc(outcome="confirmed")
+        return suggestion["value"]
+    return None
+
+
 def parse_single_attribute_with_llm(
     llm,
     attribute_name: str,
-    user_response: str
+    user_response: str,
+    deadline: Optional[Deadline] = None,
+    state: Optional[CableValidationState] = None
 ) -> Any:
-    """Extract single attribute value from user input"""
+    """Extract single attribute value from user input (usage is recorded in `state` if given)"""
     prompt = f"""Extract ONLY the value for "{attribute_name}" from this user input.
 
 User input: "{user_response}"
@@ -223,7 +282,9 @@ Input: "IEC 60502-1" → {{"value": "IEC 60502-1"}}
 Input: "10" → {{"value": 10}}
 Input: "Class 2" → {{"value": "Class 2"}}"""
 
-    response = llm.invoke(prompt)
+    response = llm.invoke(prompt, node="parse_attribute", deadline=deadline)
+    if state is not None:
+        record_usage(state, "parse_attribute", response)
 
     try:
         content = response.content.strip()
@@ -231,7 +292,8 @@ Input: "Class 2" → {{"value": "Class 2"}}"""
         match = re.search(r'\{[^}]+\}', content)
         if match:
             parsed = json.loads(match.group())
-            return parsed.get("value")
+            value = parsed.get("value")
+            return normalize_value(attribute_name, value) if settings.NORMALIZATION_ENABLED else value
     except Exception:
         pass
 
@@ -0,0 +1,45 @@
+"""
+Infer Missing Attributes Node
+Fills fields the IEC tables determine from the known attributes, so HITL
+only asks for what truly cannot be derived.
+"""
+from app.config import settings
+from app.langgraph.state import CableValidationState
+from app.utils.iec_tables import infer_attributes
+from app.utils.metrics import registry
+
+INFERRED = registry.counter(
+    "attributes_inferred_total", "Missing attributes filled from IEC tables", ["field"]
+)
+
+
+def infer_missing_attributes(state: CableValidationState) -> CableValidationState:
+    """Fill derivable missing fields, then apply accepted suggestions to the rest"""
+    attributes = state.get("attributes", {})
+    missing = list(state.get("missing_attributes", []))
+    responses = dict(state.get("hitl_responses") or {})
+
+    if missing and settings.INFERENCE_ENABLED:
+        # An explicit user answer always wins over a table value
+        inferred = infer_attributes(attributes, [attr for attr in missing if attr not in responses])
+        for field, item in inferred.items():
+            attributes[field] = item["value"]
+            missing.remove(field)
+            INFERRED.inc(field=field)
+        if inferred:
+            state["attributes"] = attributes
+            state["missing_attributes"] = missing
+            state["inferred_attributes"] = {**(state.get("inferred_attributes") or {}), **inferred}
+            suggestions = state.get("attribute_suggestions") or {}
+            state["attribute_suggestions"] = {f: s for f, s in suggestions.items() if f in missing}
+            print(f"\n INFERRED ATTRIBUTES: {inferred}")
+            print(f"   → Still missing: {missing}")
+
+    suggestions = state.get("attribute_suggestions") or {}
+    if state.get("accept_suggestions") and suggestions:
+        # One-click confirm: suggestions answer the fields the user left open
+        for field, suggestion in suggestions.items():
+            responses.setdefault(field, str(suggestion["value"]))
+        state["hitl_responses"] = responses
+
+    return state
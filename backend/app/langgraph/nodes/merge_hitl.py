@@ -29,7 +29,7 @@ def merge_hitl_responses(state: CableValidationState) -> CableValidationState:
         print(f"\n   Processing: {attr} = {user_response}")
         
         # Parse the response using LLM
-        value = parse_single_attribute_with_llm(llm, attr, user_response)
+        value = parse_single_attribute_with_llm(llm, attr, user_response, state=state)
         
         if value is not None:
             attributes[attr] = value
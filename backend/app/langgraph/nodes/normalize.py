@@ -0,0 +1,21 @@
+"""
+Normalize Attributes Node
+Maps fetched or extracted attributes to their canonical units and spellings
+before anything inspects them.
+"""
+from app.config import settings
+from app.langgraph.state import CableValidationState
+from app.utils.normalization import normalize_attributes
+
+
+def normalize_attributes_node(state: CableValidationState) -> CableValidationState:
+    """Canonicalize attribute values ("copper" -> "Cu", "10 mm²" -> 10.0, ...)"""
+    if not settings.NORMALIZATION_ENABLED:
+        return state
+    attributes = state.get("attributes") or {}
+    normalized = normalize_attributes(attributes)
+    changed = {field: (attributes[field], value) for field, value in normalized.items() if attributes[field] != value}
+    if changed:
+        print(f"\n NORMALIZED ATTRIBUTES: {changed}")
+    state["attributes"] = normalized
+    return state
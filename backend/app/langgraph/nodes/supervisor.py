@@ -1,19 +1,55 @@
 """
-Supervisor Agent Node - EXACT COPY from Jupyter notebook.
-DO NOT MODIFY - This is the exact implementation from the notebook.
+Supervisor Agent Node.
+Routes the input with the notebook's LLM prompt, falling back to keyword
+routing when the answer is unusable. In two-phase mode a design ID or a
+well-formed specification is routed deterministically, without the LLM.
 """
 from app.langgraph.state import CableValidationState
+from app.services.deadline import deadline_from
 from app.services.llm_service import llm
+from app.services.usage import record_usage
+from app.utils.normalization import parse_specification
+from langchain_core.runnables import RunnableConfig
+from typing import Optional
 import json
 import re
 
+DESIGN_ID_PATTERN = re.compile(r'DESIGN-\d+', re.IGNORECASE)
 
-def supervisor_agent(state: CableValidationState) -> CableValidationState:
+
+def keyword_route(user_input: str) -> str:
+    """Deterministic routing used when the LLM answer is unusable or unavailable"""
+    input_lower = user_input.lower()
+    if "design-" in input_lower:
+        return "FETCH_DESIGN"
+    elif any(kw in input_lower for kw in ["iec", "kv", "copper", "cu", "cable", "insulation"]):
+        return "EXTRACT_FROM_TEXT"
+    return "IGNORE"
+
+
+def deterministic_route(user_input: str) -> Optional[str]:
+    """Route for unambiguous inputs (design ID or well-formed specification), else None"""
+    if DESIGN_ID_PATTERN.search(user_input):
+        return "FETCH_DESIGN"
+    if parse_specification(user_input) is not None:
+        return "EXTRACT_FROM_TEXT"
+    return None
+
+
+def supervisor_agent(state: CableValidationState, config: Optional[RunnableConfig] = None) -> CableValidationState:
     """
     FIXED: Enhanced prompt with clear examples and pattern matching logic
     """
     user_input = state["user_input"]
 
+    if state.get("deferred_narrative"):
+        # Two-phase mode answers well-formed inputs without waiting for the LLM
+        route = deterministic_route(user_input)
+        if route is not None:
+            print(f"\n SUPERVISOR DECISION (deterministic): {route}")
+            state["route"] = route
+            return state
+
     prompt = f"""You are a routing supervisor for a cable design validation system.
 
 Classify this input into ONE route:
@@ -32,7 +68,13 @@ Input: "{user_input}"
 Respond ONLY with JSON (no markdown):
 {{"route":"FETCH_DESIGN"}} or {{"route":"EXTRACT_FROM_TEXT"}} or {{"route":"IGNORE"}}"""
 
-    response = llm.invoke(prompt)
+    response = llm.invoke(
+        prompt,
+        node="supervisor",
+        fallback=lambda: json.dumps({"route": keyword_route(user_input)}),
+        deadline=deadline_from(config)
+    )
+    record_usage(state, "supervisor", response)
 
     try:
         content = response.content.strip()
@@ -44,13 +86,7 @@ Respond ONLY with JSON (no markdown):
         else:
             route = "IGNORE"
     except:
-        input_lower = user_input.lower()
-        if "design-" in input_lower:
-            route = "FETCH_DESIGN"
-        elif any(kw in input_lower for kw in ["iec", "kv", "copper", "cu", "cable", "insulation"]):
-            route = "EXTRACT_FROM_TEXT"
-        else:
-            route = "IGNORE"
+        route = keyword_route(user_input)
 
     print(f"\n SUPERVISOR DECISION: {route}")
     state["route"] = route
@@ -1,27 +1,157 @@
 """
-Validation Agent Node - EXACT COPY from Jupyter notebook.
-DO NOT MODIFY - This is the exact implementation with the complete validation prompt.
+Validation Agent Node.
+Validates the attributes with the notebook's prompt, re-validating only the
+fields whose inputs changed and reusing verdicts of the same normalized
+design. Two-phase mode returns the deterministic IEC-table verdicts at once
+and narrate_verdicts explains them later; a request deadline turns the
+fields not yet validated into WARN instead of waiting.
 """
+from app.config import settings
 from app.langgraph.state import CableValidationState
+from app.services.deadline import RequestDeadlineExceeded, deadline_from, record_skipped
 from app.services.llm_service import llm
+from app.services.usage import record_usage
+from app.services.result_cache import attributes_cache_key, result_cache
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from app.utils.iec_rules import THICKNESS_FAIL_BELOW, THICKNESS_WARN_ABOVE, evaluate_attributes
+from langchain_core.runnables import RunnableConfig
+from typing import Any, Dict, List, Optional
 import json
 import re
 
 
-def validation_agent(state: CableValidationState) -> CableValidationState:
+# Inputs each field's verdict depends on besides its own value.
+# A field is re-validated only when its value or one of these changes.
+FIELD_DEPENDENCIES = {
+    "standard": ["voltage"],
+    "voltage": ["standard"],
+    "conductor_material": [],
+    "conductor_class": [],
+    "csa": [],
+    "insulation_material": ["standard"],
+    "insulation_thickness": ["csa", "insulation_material", "voltage"],
+}
+
+
+def fields_to_revalidate(previous: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Fields whose own value or declared dependencies changed since the last validation"""
+    changed = {field for field in REQUIRED_ATTRIBUTES if previous.get(field) != current.get(field)}
+    return [
+        field for field in REQUIRED_ATTRIBUTES
+        if field in changed or changed.intersection(FIELD_DEPENDENCIES.get(field, []))
+    ]
+
+
+def merge_verdicts(previous: List[Dict[str, Any]], fresh: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Overlay fresh verdicts on the previous ones, keeping the canonical field order"""
+    by_field = {item.get("field"): item for item in previous}
+    by_field.update({item.get("field"): item for item in fresh})
+    ordered = [by_field.pop(field) for field in REQUIRED_ATTRIBUTES if field in by_field]
+    return ordered + list(by_field.values())
+
+
+def score_confidence(validation: List[Dict[str, Any]], missing: List[str]) -> float:
+    """Deduction-based confidence used when verdicts are merged from several runs"""
+    warn_count = sum(1 for v in validation if v.get("status") == "WARN")
+    fail_count = sum(1 for v in validation if v.get("status") == "FAIL")
+    confidence = 1.0 - (warn_count * 0.10) - (len(missing) * 0.15) - (fail_count * 0.05)
+    if "standard" in missing:
+        confidence -= 0.25
+    if warn_count or fail_count or missing:
+        confidence = max(0.3, confidence)
+    return round(min(1.0, confidence), 2)
+
+
+def out_of_time(
+    state: CableValidationState,
+    previous: List[Dict[str, Any]],
+    target_fields: List[str],
+    missing: List[str]
+) -> CableValidationState:
+    """Partial result once the deadline is hit: unvalidated fields get a WARN placeholder"""
+    placeholders = [
+        {"field": field, "status": "WARN", "expected": None,
+         "comment": "Not validated: the request deadline was reached before this field was checked"}
+        for field in target_fields
+    ]
+    validation = merge_verdicts(previous, placeholders)
+    record_skipped(state, "validation")
+    state["validation"] = validation
+    state["reasoning"] = state.get("reasoning") or "Validation incomplete: the request deadline was reached"
+    state["confidence"] = score_confidence(validation, missing)
+    state["initial_validation_done"] = True
+    return state
+
+
+def validation_agent(state: CableValidationState, config: Optional[RunnableConfig] = None) -> CableValidationState:
     """
     FIXED VALIDATION AGENT - Implements correct WARN logic and confidence calibration
     """
     attributes = state["attributes"]
+    deadline = deadline_from(config)
     missing = state.get("missing_attributes", [])
     is_initial = not state.get("initial_validation_done", False)
     
+    # Incremental re-validation: only fields whose inputs changed go to the LLM
+    previous_validation = state.get("validation") or []
+    previous_attributes: Optional[Dict[str, Any]] = state.get("validated_attributes")
+    if not previous_validation and settings.NORMALIZATION_ENABLED:
+        # Another input describing the same normalized design was validated already
+        known = result_cache.get(attributes_cache_key(attributes))
+        if known and known.get("validation"):
+            print("\n SAME NORMALIZED DESIGN VALIDATED BEFORE - reusing its verdicts")
+            state["validation"] = previous_validation = known["validation"]
+            state["reasoning"] = known.get("reasoning")
+            previous_attributes = known.get("validated_attributes")
+    target_fields = list(REQUIRED_ATTRIBUTES)
+    if previous_validation and previous_attributes is not None:
+        target_fields = fields_to_revalidate(previous_attributes, attributes)
+        if not target_fields:
+            print("\n NO VALIDATION INPUTS CHANGED - reusing previous verdicts")
+            state["confidence"] = score_confidence(previous_validation, missing)
+            state["validated_attributes"] = dict(attributes)
+            state["initial_validation_done"] = True
+            return state
+    if state.get("deferred_narrative"):
+        # Two-phase mode: table-based verdicts now, the LLM narrative is generated later
+        validation = evaluate_attributes(attributes)
+        print(f"\n DETERMINISTIC VERDICTS: {[(v['field'], v['status']) for v in validation]}")
+        state["validation"] = validation
+        state["reasoning"] = None
+        state["confidence"] = score_confidence(validation, missing)
+        state["initial_validation_done"] = True
+        state["validated_attributes"] = dict(attributes)
+        state["narrative_pending"] = True
+        return state
+    if deadline is not None and deadline.expired():
+        return out_of_time(state, previous_validation, target_fields, missing)
+    is_partial = len(target_fields) < len(REQUIRED_ATTRIBUTES)
+    scope = (
+        f"**FIELDS TO RE-VALIDATE:** {target_fields} (return \"validation\" entries ONLY for these fields; "
+        "all other fields were validated before and are unchanged)\n"
+        if is_partial else ""
+    )
+    inferred = state.get("inferred_attributes") or {}
+    if inferred:
+        scope += (
+            f"**INFERRED FIELDS:** {sorted(inferred)} (not stated in the input; filled from IEC tables - "
+            "say so in their comment)\n"
+        )
+    if deadline is not None and not deadline.allows(settings.DEADLINE_NARRATIVE_MIN_SECONDS):
+        # Short on time: verdicts only, no narrative
+        scope += (
+            "**TIME BUDGET:** short - keep every comment under 15 words and return \"reasoning\" "
+            "as an empty string\n"
+        )
+        record_skipped(state, "narrative", partial=False)
+    
     # Debug logging to verify state
     print(f"\n VALIDATION AGENT DEBUG:")
     print(f"   Attributes received: {list(attributes.keys())}")
     print(f"   Attribute values: {attributes}")
     print(f"   Missing attributes: {missing}")
     print(f"   Is initial validation: {is_initial}")
+    print(f"   Fields to validate: {target_fields}")
 
     prompt = f"""You are an expert cable design validation engineer.
 
@@ -30,7 +160,7 @@ def validation_agent(state: CableValidationState) -> CableValidationState:
 
 **MISSING FIELDS:** {missing if missing else "None"}
 **VALIDATION TYPE:** {"Initial validation with WARN for missing fields" if is_initial else "Re-validation after HITL interaction"}
-
+{scope}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 CRITICAL INSTRUCTIONS - READ CAREFULLY
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -39,7 +169,7 @@ CRITICAL INSTRUCTIONS - READ CAREFULLY
 
 **PASS** - Use when:
 ✓ Value matches IEC nominal exactly
-✓ Value exceeds nominal (e.g., 1.1mm when 1.0mm required)
+✓ Value is 100-110% of nominal (e.g., 1.1mm when 1.0mm required)
 ✓ All requirements fully satisfied
 ✓ No ambiguity or missing context
 
@@ -48,7 +178,7 @@ CRITICAL INSTRUCTIONS - READ CAREFULLY
   Example: 0.9mm when nominal is 1.0mm → WARN (90% of nominal)
   Example: 0.85mm when nominal is 1.0mm → WARN (85% of nominal)
 ⚠ Field is null/missing (cannot validate without data)
-⚠ Value is 101-110% of nominal (acceptable but non-standard)
+⚠ Value is above 110% of nominal (over-designed, acceptable but atypical)
 ⚠ Standard is missing (validation basis unclear)
 ⚠ Context insufficient for definitive judgment
 
@@ -65,7 +195,8 @@ CRITICAL INSTRUCTIONS - READ CAREFULLY
 - Manufacturing tolerances typically allow ±10% variation
 - 85-99% of nominal = borderline but potentially acceptable (WARN)
 - <85% of nominal = unacceptable safety risk (FAIL)
-- >110% of nominal = over-designed, acceptable but atypical (WARN or PASS)
+- 100-110% of nominal = meets the standard (PASS)
+- >110% of nominal = over-designed, acceptable but atypical (WARN)
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -190,7 +321,7 @@ Confidence impact: -0.15
 
 **6. MANDATORY REQUIREMENTS**
 
-✓ Validate ALL 7 fields (even if null)
+{"✓ Validate ONLY the fields listed under FIELDS TO RE-VALIDATE" if is_partial else "✓ Validate ALL 7 fields (even if null)"}
 ✓ Apply tolerance logic: 85-99% nominal = WARN
 ✓ Missing field = WARN (not interactive prompt)
 ✓ Calculate confidence using deduction rules
@@ -201,7 +332,11 @@ Confidence impact: -0.15
 **NOW VALIDATE THE DESIGN ABOVE**
 Return ONLY valid JSON (no markdown, no preamble):"""
 
-    response = llm.invoke(prompt)
+    try:
+        response = llm.invoke(prompt, node="validate", deadline=deadline)
+    except RequestDeadlineExceeded:
+        return out_of_time(state, previous_validation, target_fields, missing)
+    record_usage(state, "validate", response)
 
     try:
         content = response.content.strip()
@@ -216,6 +351,13 @@ Return ONLY valid JSON (no markdown, no preamble):"""
             reasoning = result.get("reasoning", "")
             confidence = result.get("confidence", 0.0)
 
+            if is_partial:
+                fresh = [v for v in validation if v.get("field") in target_fields]
+                validation = merge_verdicts(previous_validation, fresh)
+                reasoning = reasoning or state.get("reasoning", "")
+                confidence = score_confidence(validation, missing)
+                print(f"\n MERGED {len(fresh)} re-validated fields with {len(validation) - len(fresh)} previous verdicts")
+
             # Post-process: Ensure confidence aligns with status
             warn_count = sum(1 for v in validation if v.get("status") == "WARN")
             fail_count = sum(1 for v in validation if v.get("status") == "FAIL")
@@ -231,6 +373,7 @@ Return ONLY valid JSON (no markdown, no preamble):"""
             state["reasoning"] = reasoning
             state["confidence"] = confidence
             state["initial_validation_done"] = True  # Mark initial validation as done
+            state["validated_attributes"] = dict(attributes)  # Snapshot for incremental re-validation
 
             print(f"\n VALIDATION COMPLETE")
             print(f"   Confidence: {confidence:.2f}")
@@ -245,3 +388,56 @@ Return ONLY valid JSON (no markdown, no preamble):"""
         state["confidence"] = 0.0
 
     return state
+
+
+def narrate_verdicts(state: CableValidationState, config: Optional[RunnableConfig] = None) -> Optional[Dict[str, Any]]:
+    """
+    Two-phase mode, second phase: the LLM explains the settled deterministic
+    verdicts (iec_rules) without judging the design again. Returns
+    {"reasoning", "comments": {field: comment}} or None when the answer is unusable.
+    """
+    verdicts = [
+        {"field": item["field"], "status": item["status"], "expected": item.get("expected"),
+         "rule": item.get("comment")}
+        for item in state.get("validation") or []
+    ]
+    prompt = f"""You are an expert cable design validation engineer.
+Write the explanation for validation verdicts that are ALREADY SETTLED.
+
+**DESIGN:**
+{json.dumps(state["attributes"], indent=2)}
+
+**EXPLAIN THESE VERDICTS:**
+{json.dumps(verdicts, indent=2)}
+
+**RULES THE VERDICTS FOLLOW:**
+- Insulation thickness below {THICKNESS_FAIL_BELOW:.0%} of the IEC 60502-1 nominal = FAIL (safety risk)
+- {THICKNESS_FAIL_BELOW:.0%} up to 100% of nominal = WARN (borderline)
+- 100-{THICKNESS_WARN_ABOVE:.0%} of nominal = PASS
+- Above {THICKNESS_WARN_ABOVE:.0%} of nominal = WARN (over-designed)
+- Missing field = WARN; value not in the IEC tables = FAIL
+
+**INSTRUCTIONS:**
+- Do NOT change any status; explain why each field has the status given
+- Cite IEC 60228 / IEC 60502-1 tables where applicable
+- One comment per field listed above
+
+Return ONLY valid JSON (no markdown, no preamble):
+{{"comments": {{"<field>": "<explanation>"}}, "reasoning": "Overall assessment consistent with the statuses above"}}"""
+
+    response = llm.invoke(prompt, node="narrative", deadline=deadline_from(config))
+    record_usage(state, "narrative", response)
+    try:
+        content = re.sub(r'```json\s*|\s*```', '', response.content.strip())
+        result = json.loads(content[content.find('{'):content.rfind('}') + 1])
+        fields = {item["field"] for item in verdicts}
+        comments = {
+            field: str(comment) for field, comment in (result.get("comments") or {}).items()
+            if field in fields and comment
+        }
+    except (ValueError, AttributeError) as e:
+        print(f"\n NARRATIVE FAILED: {e}")
+        return None
+    if not comments:
+        return None
+    return {"reasoning": str(result.get("reasoning") or ""), "comments": comments}
@@ -1,6 +1,7 @@
 """
-Routing Functions - EXACT COPY from Jupyter notebook.
-DO NOT MODIFY - These are the exact routing functions from the notebook.
+Routing functions of the validation graphs.
+Based on the notebook's routing; a partial state (request deadline hit) ends
+the run or goes straight to revalidate instead of asking further questions.
 """
 from app.langgraph.state import CableValidationState
 
@@ -13,6 +14,8 @@ def route_after_supervisor(state: CableValidationState) -> str:
 
 def route_after_validation(state: CableValidationState) -> str:
     """Route after validation - decide if HITL needed"""
+    if state.get("partial"):
+        return "end"  # out of time: return what we have
     missing = state.get("missing_attributes", [])
     hitl_mode = state.get("hitl_mode", False)
     initial_done = state.get("initial_validation_done", False)
@@ -47,5 +50,7 @@ def route_after_hitl_prompt(state: CableValidationState) -> str:
 
 def route_after_ask(state: CableValidationState) -> str:
     """Route after asking for attribute"""
+    if state.get("partial"):
+        return "revalidate"  # out of time: no more questions
     missing = state.get("missing_attributes", [])
     return "ask_missing" if missing else "revalidate"
@@ -1,6 +1,7 @@
 """
 State definition for LangGraph workflow.
-EXACT COPY from Jupyter notebook - DO NOT MODIFY.
+The notebook's fields plus those for incremental re-validation, suggestions
+and inference, request deadlines, two-phase narratives, usage and sessions.
 """
 from typing import TypedDict, Optional, List, Dict, Any
 
@@ -25,3 +26,15 @@ class CableValidationState(TypedDict, total=False):
     skip_hitl_collection: bool  # Flag to skip HITL collection (web-based)
     hitl_responses_processed: bool  # Flag to mark HITL responses as processed
     hitl_required: bool  # Flag indicating HITL interaction is needed
+    validated_attributes: Dict[str, Any]  # Attribute snapshot behind the current verdicts
+    attribute_suggestions: Dict[str, Dict[str, Any]]  # Likely values for missing fields (nearest designs)
+    accept_suggestions: bool  # Use suggestions as answers for fields the user did not answer
+    inferred_attributes: Dict[str, Dict[str, Any]]  # Fields filled from IEC tables (value, source)
+    partial: bool  # Request deadline hit: some verdicts/answers were not computed
+    skipped_steps: List[str]  # Work skipped for lack of time (e.g. "narrative")
+    deferred_narrative: bool  # Two-phase mode: deterministic verdicts now, LLM narrative later
+    narrative_pending: bool  # Verdicts are deterministic; the narrative is being generated
+    validation_id: str  # Pre-assigned Validation ID (two-phase mode) or the persisted one
+    llm_usage: List[Dict[str, Any]]  # One entry per LLM call: node, model, tokens, cost, latency
+    session_id: str  # HITL session to answer missing attributes in (shared session store)
+    session_version: int  # Session version the answers must be based on
@@ -1,14 +1,21 @@
 """
-LangGraph Workflow Construction - EXACT COPY from Jupyter notebook.
+LangGraph Workflow Construction.
+The notebook's graph plus normalization and IEC-table inference before the
+first validation, a resume graph for HITL follow-ups from a saved session,
+and an interactive graph that pauses between WebSocket answers. The compiled
+graphs are built once and shared.
 """
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from app.langgraph.state import CableValidationState
 from app.langgraph.nodes.supervisor import supervisor_agent
 from app.langgraph.nodes.fetch_design import fetch_design_node
 from app.langgraph.nodes.extract_text import extract_from_text_node
+from app.langgraph.nodes.normalize import normalize_attributes_node
 from app.langgraph.nodes.check_missing import check_missing_attributes
+from app.langgraph.nodes.infer_missing import infer_missing_attributes
 from app.langgraph.nodes.validation import validation_agent
-from app.langgraph.nodes.hitl import hitl_prompt_node, ask_missing_attribute
+from app.langgraph.nodes.hitl import hitl_prompt_node, ask_missing_attribute, await_missing_attribute
 from app.langgraph.routing import (
     route_after_supervisor,
     route_after_validation,
@@ -25,7 +32,9 @@ def create_validation_graph():
     workflow.add_node("supervisor", supervisor_agent)
     workflow.add_node("fetch_design", fetch_design_node)
     workflow.add_node("extract_from_text", extract_from_text_node)
+    workflow.add_node("normalize", normalize_attributes_node)
     workflow.add_node("check_missing", check_missing_attributes)
+    workflow.add_node("infer_missing", infer_missing_attributes)
     workflow.add_node("validate", validation_agent)
     workflow.add_node("hitl_prompt", hitl_prompt_node)
     workflow.add_node("ask_missing", ask_missing_attribute)
@@ -39,11 +48,15 @@ def create_validation_graph():
         {"end": END, "fetch_design": "fetch_design", "extract_from_text": "extract_from_text"})
 
     # Data collection routes
-    workflow.add_edge("fetch_design", "check_missing")
-    workflow.add_edge("extract_from_text", "check_missing")
+    workflow.add_edge("fetch_design", "normalize")
+    workflow.add_edge("extract_from_text", "normalize")
+    workflow.add_edge("normalize", "check_missing")
+
+    # Derive what the IEC tables determine before anything is asked
+    workflow.add_edge("check_missing", "infer_missing")
 
     # Initial validation (always happens)
-    workflow.add_edge("check_missing", "validate")
+    workflow.add_edge("infer_missing", "validate")
 
     # After validation, check if HITL needed
     workflow.add_conditional_edges("validate", route_after_validation,
@@ -60,3 +73,46 @@ def create_validation_graph():
     workflow.add_edge("revalidate", END)
 
     return workflow.compile()
+
+
+def create_resume_graph():
+    """
+    HITL follow-up from a saved session: the attributes were already
+    collected and validated, so the run starts at ask_missing with the answers.
+    """
+    workflow = StateGraph(CableValidationState)
+    workflow.add_node("ask_missing", ask_missing_attribute)
+    workflow.add_node("revalidate", validation_agent)
+    workflow.set_entry_point("ask_missing")
+    workflow.add_conditional_edges("ask_missing", route_after_ask,
+        {"ask_missing": "ask_missing", "revalidate": "revalidate"})
+    workflow.add_edge("revalidate", END)
+    return workflow.compile()
+
+
+def create_interactive_graph(checkpointer=None):
+    """
+    HITL over a WebSocket: like the resume graph, but ask_missing pauses
+    (interrupt) until the next answer arrives. Between answers the run is
+    kept by `checkpointer`; the last answer goes straight on to revalidate.
+    """
+    workflow = StateGraph(CableValidationState)
+    workflow.add_node("ask_missing", await_missing_attribute)
+    workflow.add_node("revalidate", validation_agent)
+    workflow.set_entry_point("ask_missing")
+    workflow.add_conditional_edges("ask_missing", route_after_ask,
+        {"ask_missing": "ask_missing", "revalidate": "revalidate"})
+    workflow.add_edge("revalidate", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+@lru_cache(maxsize=1)
+def get_validation_graph():
+    """Compiled graph shared by every request (built once, e.g. during warmup)."""
+    return create_validation_graph()
+
+
+@lru_cache(maxsize=1)
+def get_resume_graph():
+    """Compiled resume graph shared by every HITL follow-up."""
+    return create_resume_graph()
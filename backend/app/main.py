@@ -2,19 +2,47 @@
 FastAPI Application Entry Point.
 AI-Driven Cable Design Validation System.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.config import settings
-from app.api import validation_router, designs_router
-from app.database import engine, Base
+from app.api import validation_router, designs_router, admin_router
+from app.database import async_engine
+from app.services import analytics_refresher, process_pool, revalidation_worker
+from app.services.cache import cache_backend, check_backend_sharing
+from app.services.warmup import warmup
+from app.utils.metrics import registry
+import asyncio
 import logging
 
 # Configure logging
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up, then start background workers; stop them on shutdown."""
+    check_backend_sharing(cache_backend, settings.WEB_CONCURRENCY)
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        # Runs alongside the server so /health and /ready answer meanwhile
+        warmup_task = asyncio.create_task(warmup.run(app))
+    else:
+        warmup.mark_ready()
+    if settings.REVALIDATION_ENABLED:
+        revalidation_worker.start()
+    if settings.ANALYTICS_REFRESH_SECONDS > 0:
+        analytics_refresher.start()
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    revalidation_worker.stop()
+    analytics_refresher.stop()
+    process_pool.shutdown()
+    await async_engine.dispose()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -22,7 +50,8 @@ app = FastAPI(
     description="LangGraph-powered cable design validation with IEC standards compliance checking",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -37,6 +66,7 @@ app.add_middleware(
 # Include routers
 app.include_router(validation_router)
 app.include_router(designs_router)
+app.include_router(admin_router)
 
 
 @app.get("/")
@@ -51,10 +81,22 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness: the process is up (it may still be warming up)."""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 once warmup has completed, 503 before."""
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus-format metrics for this worker."""
+    return registry.render()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
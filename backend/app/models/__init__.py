@@ -1,4 +1,6 @@
 """Database models package."""
 from app.models.design import Design
+from app.models.validation import Validation, ValidationResult, HITLInteraction, LLMUsage
+from app.models.analytics import ValidationAggregate, AnalyticsRefresh
 
-__all__ = ["Design"]
+__all__ = ["Design", "Validation", "ValidationResult", "HITLInteraction", "LLMUsage", "ValidationAggregate", "AnalyticsRefresh"]
@@ -0,0 +1,40 @@
+"""
+Materialized validation analytics: additive counters maintained
+incrementally from validation results (see services/analytics.py).
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Uuid
+from datetime import datetime
+from app.database import Base
+
+
+class ValidationAggregate(Base):
+    """
+    One counter of the analytics aggregates, e.g. results by
+    (dimension="standard", key="IEC 60502-1", field="csa", status="FAIL").
+    Empty strings stand for "not applicable" so the key stays a primary key.
+    """
+    
+    __tablename__ = "validation_aggregates"
+    
+    dimension = Column(String(30), primary_key=True)
+    key = Column(String(200), primary_key=True)
+    field = Column(String(50), primary_key=True)
+    status = Column(String(10), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsRefresh(Base):
+    """
+    One incremental refresh; the latest row's watermark is where the next
+    one continues. IDs are assigned in sequence so concurrent refreshes by
+    several workers collide and only one of them commits.
+    """
+    
+    __tablename__ = "analytics_refreshes"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+    watermark_created_at = Column(DateTime, nullable=False)
+    watermark_validation_id = Column(Uuid(as_uuid=True), nullable=False)
+    validations = Column(Integer, nullable=False, default=0)
+    results = Column(Integer, nullable=False, default=0)
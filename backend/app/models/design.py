@@ -1,7 +1,7 @@
 """
 Design model representing cable design specifications.
 """
-from sqlalchemy import Column, String, Float, DateTime
+from sqlalchemy import Column, String, Float, DateTime, Index
 from datetime import datetime
 from app.database import Base
 
@@ -10,6 +10,14 @@ class Design(Base):
     """Cable design model matching the DESIGN_DATABASE from notebook."""
     
     __tablename__ = "designs"
+    __table_args__ = (
+        # Keyset pagination on (updated_at, id); id order uses the primary key
+        Index("ix_designs_updated_at_id", "updated_at", "id"),
+        # Listing filters: material equality in id order, standard + voltage, CSA range
+        Index("ix_designs_materials_id", "conductor_material", "insulation_material", "id"),
+        Index("ix_designs_standard_voltage_id", "standard", "voltage", "id"),
+        Index("ix_designs_csa_id", "csa", "id"),
+    )
     
     id = Column(String(50), primary_key=True)  # e.g., "DESIGN-001"
     standard = Column(String(100), nullable=True)
@@ -19,6 +27,7 @@ class Design(Base):
     csa = Column(Float, nullable=True)
     insulation_material = Column(String(50), nullable=True)
     insulation_thickness = Column(Float, nullable=True)
+    supplier = Column(String(100), nullable=True)  # reporting only; not a validated attribute
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -1,9 +1,8 @@
 """
 Validation models for storing validation results and HITL interactions.
 """
-from sqlalchemy import Column, String, Float, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, Boolean, Integer, Text, DateTime, ForeignKey, Index, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 from uuid import uuid4
 from app.database import Base
@@ -13,11 +12,17 @@ class Validation(Base):
     """Main validation record."""
     
     __tablename__ = "validations"
+    __table_args__ = (
+        # Latest verdicts for a design; exports filtered by time
+        Index("ix_validations_design_id_created_at", "design_id", "created_at"),
+        Index("ix_validations_created_at", "created_at"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
     user_input = Column(Text, nullable=False)
     route = Column(String(50), nullable=True)
-    design_id = Column(String(50), ForeignKey("designs.id"), nullable=True)
+    design_id = Column(String(50), ForeignKey("designs.id", ondelete="SET NULL"), nullable=True)
+    standard = Column(String(100), nullable=True)  # validated standard, kept for analytics
     confidence = Column(Float, nullable=True)
     reasoning = Column(Text, nullable=True)
     hitl_mode = Column(Boolean, default=False)
@@ -26,15 +31,20 @@ class Validation(Base):
     # Relationships
     results = relationship("ValidationResult", back_populates="validation", cascade="all, delete-orphan")
     hitl_interactions = relationship("HITLInteraction", back_populates="validation", cascade="all, delete-orphan")
+    llm_usage = relationship("LLMUsage", back_populates="validation", cascade="all, delete-orphan")
 
 
 class ValidationResult(Base):
     """Individual field validation result."""
     
     __tablename__ = "validation_results"
+    __table_args__ = (
+        Index("ix_validation_results_validation_id", "validation_id"),
+        Index("ix_validation_results_status_field", "status", "field"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    validation_id = Column(UUID(as_uuid=True), ForeignKey("validations.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    validation_id = Column(Uuid(as_uuid=True), ForeignKey("validations.id", ondelete="CASCADE"), nullable=False)
     field = Column(String(50), nullable=False)
     status = Column(String(10), nullable=False)  # PASS, WARN, FAIL
     expected = Column(String(200), nullable=True)
@@ -48,12 +58,38 @@ class HITLInteraction(Base):
     """Human-in-the-loop interaction log."""
     
     __tablename__ = "hitl_interactions"
+    __table_args__ = (
+        Index("ix_hitl_interactions_validation_id", "validation_id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    validation_id = Column(UUID(as_uuid=True), ForeignKey("validations.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    validation_id = Column(Uuid(as_uuid=True), ForeignKey("validations.id", ondelete="CASCADE"), nullable=False)
     field = Column(String(50), nullable=False)
     user_response = Column(String(200), nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     # Relationship
     validation = relationship("Validation", back_populates="hitl_interactions")
+
+
+class LLMUsage(Base):
+    """Tokens and estimated cost of one LLM call made for a validation."""
+    
+    __tablename__ = "llm_usage"
+    __table_args__ = (
+        Index("ix_llm_usage_validation_id", "validation_id"),
+        Index("ix_llm_usage_created_at", "created_at"),
+    )
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    validation_id = Column(Uuid(as_uuid=True), ForeignKey("validations.id", ondelete="CASCADE"), nullable=False)
+    node = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+    latency_seconds = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationship
+    validation = relationship("Validation", back_populates="llm_usage")
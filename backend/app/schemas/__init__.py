@@ -1,20 +1,64 @@
 """Schemas package."""
-from app.schemas.design import DesignCreate, DesignUpdate, DesignResponse
+from app.schemas.design import (
+    DesignCreate,
+    DesignUpdate,
+    DesignResponse,
+    DesignFilters,
+    DesignImportError,
+    DesignImportReport
+)
+from app.schemas.admin import (
+    ProfilingUpdate,
+    ProfileFrame,
+    ProfileSummary,
+    ProfilingStatus,
+    CacheStats,
+    AnalyticsRefreshResult
+)
 from app.schemas.validation import (
     ValidationRequest,
     HITLResponseRequest,
     ValidationResponse,
     ValidationResultItem,
-    HITLInteractionItem
+    HITLInteractionItem,
+    AttributeSuggestion,
+    InferredAttribute,
+    NarrativeResponse,
+    UsageTotals,
+    UsageReport,
+    HITLSessionResponse,
+    StatusBreakdown,
+    ConfidenceBin,
+    FailingCombination,
+    AnalyticsReport
 )
 
 __all__ = [
     "DesignCreate",
     "DesignUpdate",
     "DesignResponse",
+    "DesignFilters",
+    "DesignImportError",
+    "DesignImportReport",
     "ValidationRequest",
     "HITLResponseRequest",
     "ValidationResponse",
     "ValidationResultItem",
-    "HITLInteractionItem"
+    "HITLInteractionItem",
+    "AttributeSuggestion",
+    "InferredAttribute",
+    "NarrativeResponse",
+    "UsageTotals",
+    "UsageReport",
+    "HITLSessionResponse",
+    "StatusBreakdown",
+    "ConfidenceBin",
+    "FailingCombination",
+    "AnalyticsReport",
+    "ProfilingUpdate",
+    "ProfileFrame",
+    "ProfileSummary",
+    "ProfilingStatus",
+    "CacheStats",
+    "AnalyticsRefreshResult"
 ]
@@ -0,0 +1,55 @@
+"""Admin schemas: profiling controls, captured profiles, cache stats and analytics refreshes."""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+
+class ProfilingUpdate(BaseModel):
+    """Profiler settings to change (omitted fields keep their value)."""
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0, description="Share of requests profiled without X-Profile")
+    interval_ms: Optional[float] = Field(None, ge=1.0, description="Sampling interval in milliseconds")
+
+
+class ProfileFrame(BaseModel):
+    """Innermost frame and the number of samples it was running in."""
+    frame: str
+    samples: int
+
+
+class ProfileSummary(BaseModel):
+    """A captured profile (fetch its collapsed stacks by ID)."""
+    id: str
+    label: str
+    started_at: datetime
+    duration_seconds: float
+    interval_seconds: float
+    samples: int
+    top_frames: List[ProfileFrame] = []
+
+
+class ProfilingStatus(BaseModel):
+    """Profiler settings and the profiles kept in this worker, newest first."""
+    enabled: bool
+    sample_rate: float
+    interval_ms: float
+    profiles: List[ProfileSummary] = []
+
+
+class CacheStats(BaseModel):
+    """Usage of one cache namespace in this worker."""
+    namespace: str
+    backend: str = Field(..., description="memory, sqlite or resp")
+    ttl_seconds: Optional[float] = None
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    errors: int = 0
+    hit_ratio: Optional[float] = None
+
+
+class AnalyticsRefreshResult(BaseModel):
+    """Rows folded into the analytics aggregates by one refresh."""
+    refreshed: bool = Field(..., description="False if another worker refreshed at the same time")
+    validations: int = 0
+    results: int = 0
@@ -1,23 +1,24 @@
 """Design schemas for API requests and responses."""
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from app.schemas.common import TimestampMixin
 
 
 class DesignBase(BaseModel):
-    """Base design schema."""
-    standard: Optional[str] = None
-    voltage: Optional[str] = None
-    conductor_material: Optional[str] = None
-    conductor_class: Optional[str] = None
+    """Base design schema (string lengths match the designs table columns)."""
+    standard: Optional[str] = Field(default=None, max_length=100)
+    voltage: Optional[str] = Field(default=None, max_length=50)
+    conductor_material: Optional[str] = Field(default=None, max_length=20)
+    conductor_class: Optional[str] = Field(default=None, max_length=20)
     csa: Optional[float] = None
-    insulation_material: Optional[str] = None
+    insulation_material: Optional[str] = Field(default=None, max_length=50)
     insulation_thickness: Optional[float] = None
+    supplier: Optional[str] = Field(default=None, max_length=100)
 
 
 class DesignCreate(DesignBase):
     """Schema for creating a design."""
-    id: str = Field(..., description="Design ID (e.g., DESIGN-001)")
+    id: str = Field(..., max_length=50, description="Design ID (e.g., DESIGN-001)")
 
 
 class DesignUpdate(DesignBase):
@@ -31,3 +32,31 @@ class DesignResponse(DesignBase, TimestampMixin):
 
     class Config:
         from_attributes = True
+
+
+class DesignFilters(BaseModel):
+    """Server-side filters for listing and exporting designs."""
+    csa_min: Optional[float] = Field(default=None, ge=0, description="Minimum CSA (mm²), inclusive")
+    csa_max: Optional[float] = Field(default=None, ge=0, description="Maximum CSA (mm²), inclusive")
+    conductor_material: Optional[str] = None
+    insulation_material: Optional[str] = None
+    standard: Optional[str] = None
+    voltage: Optional[str] = None
+
+
+class DesignImportError(BaseModel):
+    """Validation error for a single imported row."""
+    line: int = Field(..., description="Line number in the uploaded file")
+    error: str
+
+
+class DesignImportReport(BaseModel):
+    """Summary of a bulk design import."""
+    format: str
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[DesignImportError] = []
+    errors_truncated: bool = Field(default=False, description="More errors occurred than are listed")
+    elapsed_seconds: float
+    rows_per_second: float
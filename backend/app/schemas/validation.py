@@ -1,5 +1,5 @@
 """Validation schemas for API requests and responses."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -8,12 +8,43 @@ class ValidationRequest(BaseModel):
     """Request schema for validation."""
     user_input: str = Field(..., description="Cable design specification or design ID")
     hitl_mode: bool = Field(default=False, description="Enable Human-in-the-Loop mode")
+    deferred_narrative: bool = Field(
+        default=False,
+        description="Return deterministic verdicts at once; fetch the LLM narrative later by validation_id"
+    )
 
 
 class HITLResponseRequest(BaseModel):
     """Request schema for submitting HITL responses."""
-    user_input: str = Field(..., description="Original user input")
-    responses: Dict[str, str] = Field(..., description="User responses for missing attributes")
+    user_input: Optional[str] = Field(None, description="Original user input (not needed with session_id)")
+    responses: Dict[str, str] = Field(default={}, description="User responses for missing attributes")
+    accept_suggestions: bool = Field(
+        default=False,
+        description="Accept the suggested values for missing attributes not answered in responses"
+    )
+    session_id: Optional[str] = Field(None, description="HITL session to resume (from the validate response)")
+    session_version: Optional[int] = Field(
+        None, description="Session version the responses answer; 409 if the session moved on"
+    )
+
+    @model_validator(mode="after")
+    def check_input_or_session(self):
+        if self.user_input is None and self.session_id is None:
+            raise ValueError("user_input or session_id is required")
+        return self
+
+
+class AttributeSuggestion(BaseModel):
+    """Likely value for a missing attribute, from similar validated designs."""
+    value: Any
+    support: int = Field(..., description="Number of similar validated designs with this value")
+    confidence: float = Field(..., description="Share of the neighbours' weight behind this value (0.0-1.0)")
+
+
+class InferredAttribute(BaseModel):
+    """Missing attribute filled deterministically from IEC tables."""
+    value: Any
+    source: str = Field(..., description="Table or rule the value was derived from")
 
 
 class ValidationResultItem(BaseModel):
@@ -24,6 +55,82 @@ class ValidationResultItem(BaseModel):
     comment: Optional[str] = None
 
 
+class NarrativeResponse(BaseModel):
+    """LLM narrative of a two-phase validation."""
+    validation_id: str
+    status: str = Field(..., description="pending, ready or failed")
+    reasoning: Optional[str] = None
+    comments: Dict[str, Optional[str]] = Field(default={}, description="Per-field comments")
+    error: Optional[str] = None
+
+
+class UsageTotals(BaseModel):
+    """Summed LLM calls, tokens and estimated cost."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+class UsageReport(BaseModel):
+    """Persisted LLM usage, overall and grouped by node, route and model."""
+    since: Optional[datetime] = None
+    totals: UsageTotals
+    by_node: Dict[str, UsageTotals] = {}
+    by_route: Dict[str, UsageTotals] = {}
+    by_model: Dict[str, UsageTotals] = {}
+
+
+class StatusBreakdown(BaseModel):
+    """Field verdict counts and rates."""
+    total: int = 0
+    passed: int = 0
+    warned: int = 0
+    failed: int = 0
+    pass_rate: float = 0.0
+    warn_rate: float = 0.0
+    fail_rate: float = 0.0
+
+
+class ConfidenceBin(BaseModel):
+    """Validations with a confidence in [lower, upper)."""
+    lower: float
+    upper: float
+    count: int
+
+
+class FailingCombination(BaseModel):
+    """Set of fields that failed together in one validation."""
+    fields: List[str]
+    count: int
+
+
+class AnalyticsReport(BaseModel):
+    """Validation analytics as of the last aggregate refresh."""
+    refreshed_at: Optional[datetime] = None
+    validations: int = 0
+    overall: StatusBreakdown
+    by_field: Dict[str, StatusBreakdown] = {}
+    by_standard: Dict[str, StatusBreakdown] = {}
+    by_supplier: Dict[str, StatusBreakdown] = {}
+    confidence: List[ConfidenceBin] = []
+    top_failing_combinations: List[FailingCombination] = []
+
+
+class HITLSessionResponse(BaseModel):
+    """Saved state of a HITL validation waiting for answers."""
+    session_id: str
+    version: int
+    user_input: str
+    attributes: Dict[str, Any] = {}
+    missing_attributes: List[str] = []
+    validation: List[ValidationResultItem] = []
+    suggestions: Dict[str, AttributeSuggestion] = {}
+    created_at: datetime
+    updated_at: datetime
+
+
 class HITLInteractionItem(BaseModel):
     """HITL interaction record."""
     field: str
@@ -46,6 +153,25 @@ class ValidationResponse(BaseModel):
     hitl_mode: bool = Field(default=False, description="Whether HITL mode was enabled")
     hitl_required: bool = Field(default=False, description="Whether HITL interaction is needed")
     hitl_interactions: List[HITLInteractionItem] = Field(default=[], description="HITL interaction history")
+    suggestions: Dict[str, AttributeSuggestion] = Field(
+        default={}, description="Suggested values for missing attributes (confirm via accept_suggestions)"
+    )
+    inferred: Dict[str, InferredAttribute] = Field(
+        default={}, description="Attributes that were missing and filled from IEC tables"
+    )
+    partial: bool = Field(
+        default=False, description="The request deadline was hit; some fields were not validated"
+    )
+    skipped: List[str] = Field(default=[], description="Work skipped for lack of time (e.g. narrative)")
+    validation_id: Optional[str] = Field(None, description="ID of the stored validation")
+    narrative_status: Optional[str] = Field(
+        None, description="'pending' while the reasoning and comments are generated (deferred_narrative)"
+    )
+    usage: Optional[Dict[str, Any]] = Field(
+        None, description="LLM calls, tokens and cost of this request by node and model (X-Include-Usage: true)"
+    )
+    session_id: Optional[str] = Field(None, description="HITL session to send the answers to (hitl_required)")
+    session_version: Optional[int] = Field(None, description="Current version of the HITL session")
     
     class Config:
         json_schema_extra = {
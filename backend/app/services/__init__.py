@@ -1,5 +1,15 @@
 """Services package."""
 from app.services.llm_service import llm, get_llm
+from app.services.llm_client import ResilientLLM, LLMUnavailableError
+from app.services.admission import admission, AdmissionRejected
+from app.services.deadline import Deadline, RequestDeadlineExceeded
 from app.services.validation_service import ValidationService
+from app.services.result_cache import result_cache
+from app.services.narrative import narratives
+from app.services.profiling import profiler
+from app.services.revalidation import revalidation_worker
+from app.services.analytics import analytics_refresher
+from app.services.process_pool import process_pool, validate_designs
+from app.services.hitl_sessions import hitl_sessions, HITLSessionNotFound, HITLSessionConflict
 
-__all__ = ["llm", "get_llm", "ValidationService"]
+__all__ = ["hitl_sessions", "HITLSessionNotFound", "HITLSessionConflict", "llm", "get_llm", "ResilientLLM", "LLMUnavailableError", "admission", "AdmissionRejected", "Deadline", "RequestDeadlineExceeded", "ValidationService", "result_cache", "narratives", "profiler", "revalidation_worker", "analytics_refresher", "process_pool", "validate_designs"]
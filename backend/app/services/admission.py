@@ -0,0 +1,177 @@
+"""
+Admission control for graph executions.
+Each worker runs at most `max_inflight` validation graphs at a time; further
+executions wait in a bounded queue with three priority lanes (interactive
+ahead of batch ahead of background re-validation). When the queue is full,
+or a request has waited too long, it is rejected at once with a Retry-After
+hint instead of piling up in the server. Lower lanes may only fill part of
+the queue, so interactive requests keep headroom during a brownout.
+"""
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional
+from app.config import settings
+from app.utils.metrics import registry
+import asyncio
+import concurrent.futures
+import math
+import threading
+import time
+
+
+LANES = ("interactive", "batch", "background")  # highest priority first
+
+# Share of the queue each lane may fill
+LANE_QUEUE_SHARE = {"interactive": 1.0, "batch": 0.5, "background": 0.25}
+
+INFLIGHT = registry.gauge(
+    "admission_inflight", "Graph executions currently running"
+)
+QUEUE_DEPTH = registry.gauge(
+    "admission_queue_depth", "Graph executions waiting for a slot", ["lane"]
+)
+ADMITTED = registry.counter(
+    "admission_admitted_total", "Graph executions admitted", ["lane"]
+)
+SHED = registry.counter(
+    "admission_shed_total", "Graph executions rejected by admission control", ["lane", "reason"]
+)
+WAIT = registry.histogram(
+    "admission_wait_seconds", "Time spent queued before admission", ["lane"]
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when an execution is shed; maps to 429 (queue full) or 503 (timed out)."""
+
+    def __init__(self, message: str, status_code: int, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Slot limiter with a bounded, prioritized wait queue (thread- and asyncio-safe)."""
+
+    def __init__(self, max_inflight: int = 8, max_queue: int = 32, queue_timeout: float = 10.0):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._inflight = 0
+        self._queues: Dict[str, Deque[Future]] = {lane: deque() for lane in LANES}
+        self._lock = threading.Lock()
+        self._hold_seconds = 5.0  # moving average of slot hold time (Retry-After estimate)
+
+    def _queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _retry_after(self) -> int:
+        """Seconds until the current backlog has likely drained."""
+        rounds = (self._queued() + 1) / max(1, self.max_inflight)
+        return max(1, math.ceil(rounds * self._hold_seconds))
+
+    def _shed(self, lane: str, reason: str, status_code: int) -> AdmissionRejected:
+        SHED.inc(lane=lane, reason=reason)
+        print(f"\n ADMISSION SHED ({reason}): lane={lane} inflight={self._inflight} queued={self._queued()}")
+        return AdmissionRejected(
+            f"Server is busy ({reason}); retry later", status_code, self._retry_after()
+        )
+
+    def _enter(self, lane: str) -> Future:
+        """Take a slot (resolved future) or a place in the lane's queue."""
+        if lane not in self._queues:
+            raise ValueError(f"Unknown admission lane: {lane}")
+        waiter: Future = Future()
+        with self._lock:
+            if self._inflight < self.max_inflight and not self._queued():
+                self._inflight += 1
+                INFLIGHT.set(self._inflight)
+                waiter.set_result(True)
+                return waiter
+            if self._queued() >= math.floor(self.max_queue * LANE_QUEUE_SHARE[lane]):
+                raise self._shed(lane, "queue_full", 429)
+            self._queues[lane].append(waiter)
+            QUEUE_DEPTH.set(len(self._queues[lane]), lane=lane)
+        return waiter
+
+    def _abandon(self, lane: str, waiter: Future) -> None:
+        """Leave the queue after a timeout or cancellation (or return a slot granted meanwhile)."""
+        with self._lock:
+            if waiter in self._queues[lane]:
+                self._queues[lane].remove(waiter)
+                QUEUE_DEPTH.set(len(self._queues[lane]), lane=lane)
+                return
+        self._release(0.0)
+
+    def _release(self, held: float) -> None:
+        """Hand the slot to the highest-priority waiter, or free it."""
+        with self._lock:
+            if held:
+                self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held
+            for lane in LANES:
+                queue = self._queues[lane]
+                while queue:
+                    waiter = queue.popleft()
+                    QUEUE_DEPTH.set(len(queue), lane=lane)
+                    if waiter.set_running_or_notify_cancel():
+                        waiter.set_result(True)
+                        return
+            self._inflight -= 1
+            INFLIGHT.set(self._inflight)
+
+    def _timeout(self, timeout: Optional[float]) -> float:
+        return self.queue_timeout if timeout is None else max(0.0, min(self.queue_timeout, timeout))
+
+    def _admitted(self, lane: str, queued_at: float) -> float:
+        waited = time.monotonic() - queued_at
+        ADMITTED.inc(lane=lane)
+        WAIT.observe(waited, lane=lane)
+        return time.monotonic()
+
+    @contextmanager
+    def slot(self, lane: str = "interactive", timeout: Optional[float] = None) -> Iterator[None]:
+        """Hold an execution slot, blocking the thread while queued (at most `timeout`)."""
+        queued_at = time.monotonic()
+        waiter = self._enter(lane)
+        try:
+            waiter.result(timeout=self._timeout(timeout))
+        except concurrent.futures.TimeoutError:
+            self._abandon(lane, waiter)
+            raise self._shed(lane, "queue_timeout", 503)
+        started = self._admitted(lane, queued_at)
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    @asynccontextmanager
+    async def aslot(self, lane: str = "interactive", timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Async variant of slot: waits on the event loop without a thread."""
+        queued_at = time.monotonic()
+        waiter = self._enter(lane)
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(waiter)), self._timeout(timeout))
+        except asyncio.TimeoutError:
+            self._abandon(lane, waiter)
+            raise self._shed(lane, "queue_timeout", 503)
+        except asyncio.CancelledError:  # client went away while queued
+            self._abandon(lane, waiter)
+            raise
+        started = self._admitted(lane, queued_at)
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    def status(self) -> Dict[str, int]:
+        with self._lock:
+            return {"inflight": self._inflight, **{lane: len(queue) for lane, queue in self._queues.items()}}
+
+
+# Global admission controller for this worker
+admission = AdmissionController(
+    max_inflight=settings.ADMISSION_MAX_INFLIGHT,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT
+)
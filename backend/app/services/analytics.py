@@ -0,0 +1,312 @@
+"""
+Validation analytics from materialized aggregates.
+A scheduled refresh streams the validation results stored since the last
+refresh (keyset on created_at, id) in fixed-size batches, turns each batch
+into NumPy columns and counts it column-wise: results by status per field,
+standard and supplier, validations by confidence bin, and the sets of fields
+that fail together. The counts are added to validation_aggregates in the
+same transaction that records the new watermark, so reports read a few
+hundred counter rows and never scan validation_results.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import AnalyticsRefresh, Design, Validation, ValidationAggregate, ValidationResult
+from app.utils.metrics import registry
+import numpy as np
+import threading
+import time
+
+
+ANALYTICS_REFRESHES = registry.counter(
+    "analytics_refreshes_total", "Analytics refreshes by outcome", ["outcome"]
+)
+ANALYTICS_ROWS = registry.counter(
+    "analytics_rows_aggregated_total", "Validation result rows folded into the analytics aggregates"
+)
+
+STATUSES = ("PASS", "WARN", "FAIL")
+CONFIDENCE_BINS = 10  # 0.0-0.1 ... 0.9-1.0
+UNKNOWN = ""  # missing standard/supplier, and the "not applicable" parts of a key
+
+# Selected in (created_at, id) order, so the rows of one validation are contiguous
+RESULT_COLUMNS = [
+    Validation.id, Validation.created_at, Validation.standard, Design.supplier,
+    Validation.confidence, ValidationResult.field, ValidationResult.status
+]
+
+
+def results_query(watermark: Optional[Tuple[datetime, UUID]], cutoff: datetime):
+    stmt = (
+        select(*RESULT_COLUMNS)
+        .join(ValidationResult, ValidationResult.validation_id == Validation.id)
+        .outerjoin(Design, Design.id == Validation.design_id)
+        .where(Validation.created_at < cutoff)
+        .order_by(Validation.created_at, Validation.id)
+    )
+    if watermark is not None:
+        stmt = stmt.where(tuple_(Validation.created_at, Validation.id) > tuple_(*watermark))
+    return stmt
+
+
+def to_columns(rows: Sequence[Sequence[Any]]) -> Dict[str, np.ndarray]:
+    """One batch of result rows as NumPy columns (strings as unicode arrays, missing as "")."""
+    ids, created, standards, suppliers, confidences, fields, statuses = zip(*rows)
+    return {
+        "validation": np.array([str(value) for value in ids]),
+        "created_at": np.array(created, dtype="datetime64[us]"),
+        "standard": np.array([value or UNKNOWN for value in standards]),
+        "supplier": np.array([value or UNKNOWN for value in suppliers]),
+        "confidence": np.array([np.nan if value is None else value for value in confidences], dtype=float),
+        "field": np.array(fields),
+        "status": np.char.upper(np.array(statuses)),
+    }
+
+
+def column_batches(db: Session, stmt, batch_size: int) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Columnar batches of about `batch_size` rows, streamed with a server-side
+    cursor. A validation is never split: the rows of the last validation of
+    a partition are carried over to the next batch.
+    """
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    carry: List[Any] = []
+    try:
+        for partition in result.partitions(batch_size):
+            rows = carry + list(partition)
+            cut = len(rows)
+            while cut and rows[cut - 1][0] == rows[-1][0]:
+                cut -= 1
+            if cut == 0:
+                carry = rows
+                continue
+            carry = rows[cut:]
+            yield to_columns(rows[:cut])
+    finally:
+        result.close()
+    if carry:
+        yield to_columns(carry)
+
+
+def group_counts(*columns: np.ndarray) -> Dict[Tuple, int]:
+    """Occurrences of each distinct row across equally long columns, counted column-wise."""
+    if not len(columns[0]):
+        return {}
+    uniques, codes = zip(*(np.unique(column, return_inverse=True) for column in columns))
+    shape = tuple(len(values) for values in uniques)
+    present, counts = np.unique(np.ravel_multi_index(codes, shape), return_counts=True)
+    positions = np.unravel_index(present, shape)
+    return {
+        tuple(str(values[index]) for values, index in zip(uniques, key)): int(count)
+        for *key, count in zip(*positions, counts)
+    }
+
+
+def failing_combinations(validation: np.ndarray, field: np.ndarray, status: np.ndarray) -> Dict[str, int]:
+    """How often each set of fields fails together in one validation ("csa+insulation_thickness")."""
+    failed = status == "FAIL"
+    if not failed.any():
+        return {}
+    validation, field = validation[failed], field[failed]
+    order = np.lexsort((field, validation))
+    validation, field = validation[order], field[order]
+    starts = np.flatnonzero(np.r_[True, validation[1:] != validation[:-1]])
+    combinations = np.array(["+".join(group) for group in np.split(field, starts[1:])])
+    values, counts = np.unique(combinations, return_counts=True)
+    return dict(zip(values.tolist(), counts.tolist()))
+
+
+def aggregate(columns: Dict[str, np.ndarray]) -> Counter:
+    """Aggregate counters of one batch (complete validations only)."""
+    counts: Counter = Counter()
+    status, field = columns["status"], columns["field"]
+    for (value, status_value), n in group_counts(field, status).items():
+        counts[("field", value, UNKNOWN, status_value)] += n
+    for dimension in ("standard", "supplier"):
+        for (value, field_value, status_value), n in group_counts(columns[dimension], field, status).items():
+            counts[(dimension, value, field_value, status_value)] += n
+
+    _, first = np.unique(columns["validation"], return_index=True)
+    counts[("validations", UNKNOWN, UNKNOWN, UNKNOWN)] += len(first)
+    confidence = columns["confidence"][first]
+    confidence = confidence[np.isfinite(confidence)]
+    bins = np.clip(np.floor(confidence * CONFIDENCE_BINS + 1e-9).astype(int), 0, CONFIDENCE_BINS - 1)
+    for index, n in enumerate(np.bincount(bins, minlength=CONFIDENCE_BINS)):
+        if n:
+            counts[("confidence", f"{index / CONFIDENCE_BINS:.1f}", UNKNOWN, UNKNOWN)] += int(n)
+
+    for combination, n in failing_combinations(columns["validation"], field, status).items():
+        counts[("failing_combination", combination, UNKNOWN, UNKNOWN)] += n
+    return counts
+
+
+def latest_refresh(db: Session) -> Optional[AnalyticsRefresh]:
+    return db.query(AnalyticsRefresh).order_by(AnalyticsRefresh.id.desc()).first()
+
+
+def refresh_aggregates(
+    db: Session,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    settle_seconds: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Fold the results stored since the last refresh into the aggregates.
+    Validations younger than `settle_seconds` wait for the next refresh, so
+    rows committed late with an earlier created_at are not skipped. Returns
+    what was added, or None if another worker committed a refresh first.
+    """
+    now = now or datetime.utcnow()
+    settle = settings.ANALYTICS_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+    previous = latest_refresh(db)
+    watermark = (previous.watermark_created_at, previous.watermark_validation_id) if previous else None
+    started = time.perf_counter()
+
+    counts: Counter = Counter()
+    rows, last = 0, None
+    stmt = results_query(watermark, now - timedelta(seconds=settle))
+    for columns in column_batches(db, stmt, batch_size or settings.ANALYTICS_BATCH_SIZE):
+        counts.update(aggregate(columns))
+        rows += len(columns["status"])
+        last = (columns["created_at"][-1].item(), UUID(columns["validation"][-1]))
+    summary = {"validations": counts[("validations", UNKNOWN, UNKNOWN, UNKNOWN)], "results": rows}
+    if last is None:
+        ANALYTICS_REFRESHES.inc(outcome="empty")
+        return summary
+
+    existing = {
+        (row.dimension, row.key, row.field, row.status): row
+        for row in db.query(ValidationAggregate)
+    }
+    for key, n in counts.items():
+        row = existing.get(key)
+        if row is None:
+            dimension, value, field, status = key
+            db.add(ValidationAggregate(dimension=dimension, key=value[:200], field=field, status=status, count=n))
+        else:
+            row.count += n
+    db.add(AnalyticsRefresh(
+        id=(previous.id if previous else 0) + 1,
+        refreshed_at=now,
+        watermark_created_at=last[0],
+        watermark_validation_id=last[1],
+        **summary
+    ))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # another worker refreshed from the same watermark
+        ANALYTICS_REFRESHES.inc(outcome="conflict")
+        return None
+    ANALYTICS_REFRESHES.inc(outcome="success")
+    ANALYTICS_ROWS.inc(rows)
+    print(f"\n ANALYTICS REFRESHED: {summary['validations']} validations, {rows} results "
+          f"in {time.perf_counter() - started:.2f}s")
+    return summary
+
+
+def rebuild_aggregates(db: Session, **options: Any) -> Optional[Dict[str, Any]]:
+    """Drop the aggregates and refresh from the first stored validation."""
+    db.query(ValidationAggregate).delete()
+    db.query(AnalyticsRefresh).delete()
+    db.commit()
+    return refresh_aggregates(db, **options)
+
+
+def _breakdown(counts: Dict[str, int]) -> Dict[str, Any]:
+    total = sum(counts.values())
+    breakdown: Dict[str, Any] = {"total": total}
+    for status, name in zip(STATUSES, ("passed", "warned", "failed")):
+        breakdown[name] = counts.get(status, 0)
+        breakdown[f"{status.lower()}_rate"] = round(counts.get(status, 0) / total, 4) if total else 0.0
+    return breakdown
+
+
+def analytics_report(db: Session, top: Optional[int] = None) -> Dict[str, Any]:
+    """Rates, confidence distribution and top failing combinations from the aggregates only."""
+    by: Dict[str, Dict[str, Dict[str, int]]] = {"field": {}, "standard": {}, "supplier": {}}
+    overall: Dict[str, int] = {}
+    confidence: Dict[str, int] = {}
+    combinations: List[Tuple[str, int]] = []
+    validations = 0
+    for row in db.query(ValidationAggregate):
+        if row.dimension in by:
+            statuses = by[row.dimension].setdefault(row.key or "unknown", {})
+            statuses[row.status] = statuses.get(row.status, 0) + row.count
+            if row.dimension == "field":
+                overall[row.status] = overall.get(row.status, 0) + row.count
+        elif row.dimension == "confidence":
+            confidence[row.key] = row.count
+        elif row.dimension == "failing_combination":
+            combinations.append((row.key, row.count))
+        elif row.dimension == "validations":
+            validations = row.count
+    combinations.sort(key=lambda item: (-item[1], item[0]))
+    latest = latest_refresh(db)
+    return {
+        "refreshed_at": latest.refreshed_at if latest else None,
+        "validations": validations,
+        "overall": _breakdown(overall),
+        "by_field": {key: _breakdown(counts) for key, counts in sorted(by["field"].items())},
+        "by_standard": {key: _breakdown(counts) for key, counts in sorted(by["standard"].items())},
+        "by_supplier": {key: _breakdown(counts) for key, counts in sorted(by["supplier"].items())},
+        "confidence": [
+            {"lower": index / CONFIDENCE_BINS, "upper": (index + 1) / CONFIDENCE_BINS,
+             "count": confidence.get(f"{index / CONFIDENCE_BINS:.1f}", 0)}
+            for index in range(CONFIDENCE_BINS)
+        ],
+        "top_failing_combinations": [
+            {"fields": key.split("+"), "count": count}
+            for key, count in combinations[:top or settings.ANALYTICS_TOP_COMBINATIONS]
+        ]
+    }
+
+
+class AnalyticsRefresher:
+    """Daemon thread refreshing the aggregates every `interval` seconds."""
+
+    def __init__(self, session_factory: Callable[[], Session], interval: float = 300.0):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-refresher", daemon=True)
+        self._thread.start()
+        print("\n ANALYTICS REFRESHER STARTED")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh(self) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            return refresh_aggregates(db)
+        except Exception as e:
+            db.rollback()
+            ANALYTICS_REFRESHES.inc(outcome="error")
+            print(f"\n ANALYTICS REFRESH ERROR: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+
+# Global refresher (started by the application lifespan when ANALYTICS_REFRESH_SECONDS > 0)
+analytics_refresher = AnalyticsRefresher(SessionLocal, interval=settings.ANALYTICS_REFRESH_SECONDS)
@@ -0,0 +1,557 @@
+"""
+Shared cache backends.
+The result, LLM-response and design caches store their entries through one
+CacheBackend, picked by CACHE_BACKEND:
+
+- memory: in-process LRU (per-namespace size limits), one copy per worker
+- sqlite: a WAL-mode SQLite file with mmap reads, shared by the workers of
+  one host
+- resp:   any server speaking the Redis protocol, shared across hosts
+
+Values are serialized with msgpack (ormsgpack), so every backend returns a
+private copy. A Cache is one namespace of a backend with its own TTL
+(CACHE_TTLS) and hit/miss/error counters. Backend failures are logged and
+counted, and treated as misses: a cache outage never fails a request.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from app.config import settings
+from app.utils.metrics import registry
+import hashlib
+import ormsgpack
+import queue
+import socket
+import sqlite3
+import threading
+import time
+
+
+CACHE_OPERATIONS = registry.counter(
+    "cache_operations_total", "Cache operations by namespace and outcome", ["namespace", "backend", "outcome"]
+)
+
+PACK_OPTIONS = ormsgpack.OPT_NON_STR_KEYS | ormsgpack.OPT_SERIALIZE_NUMPY
+
+
+class CacheBackendError(Exception):
+    """The cache backend answered with an error or could not be reached."""
+
+
+class CacheBackend:
+    """Byte store with per-entry expiry and atomic counters; keys are "namespace:..." strings."""
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Set `key` only if it is absent (or expired); True if this call stored it."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        """Atomically add one to an integer entry (created at 0) and return it."""
+        raise NotImplementedError
+
+    def clear(self, prefix: str) -> None:
+        """Drop every key starting with `prefix`."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """
+    In-process LRU with lazy expiry. Each namespace is bounded separately
+    (`limits`, else `max_entries`); a limit of None means unbounded.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024, limits: Optional[Dict[str, Optional[int]]] = None):
+        self.max_entries = max_entries
+        self.limits = dict(limits or {})
+        self._namespaces: Dict[str, "OrderedDict[str, Tuple[Optional[float], bytes]]"] = {}
+        self._lock = threading.Lock()
+
+    def _entries(self, key: str) -> "OrderedDict[str, Tuple[Optional[float], bytes]]":
+        namespace = key.split(":", 1)[0]
+        entries = self._namespaces.get(namespace)
+        if entries is None:
+            entries = self._namespaces[namespace] = OrderedDict()
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entries = self._entries(key)
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and time.monotonic() > entry[0]:
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        limit = self.limits.get(key.split(":", 1)[0], self.max_entries)
+        entries = self._entries(key)
+        entries[key] = (time.monotonic() + ttl if ttl else None, value)
+        entries.move_to_end(key)
+        while limit is not None and len(entries) > max(0, limit):
+            entries.popitem(last=False)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            entry = self._entries(key).get(key)
+            if entry is not None and (entry[0] is None or time.monotonic() <= entry[0]):
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries(key).pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            entries = self._entries(key)
+            entry = entries.get(key)
+            value = int(entry[1]) + 1 if entry is not None else 1
+            entries[key] = (None, str(value).encode())
+            return value
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for entries in self._namespaces.values():
+                for key in [key for key in entries if key.startswith(prefix)]:
+                    del entries[key]
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Entries in one SQLite file (WAL journal, memory-mapped reads) so the
+    workers of a host share them. Expiry uses wall-clock time; past
+    `max_entries` the oldest entries with a TTL are trimmed (entries without
+    one, like counters, are kept).
+    """
+
+    name = "sqlite"
+    TRIM_EVERY = 256
+
+    def __init__(self, path: str, max_entries: int = 100_000, mmap_bytes: int = 256 * 1024 * 1024,
+                 timeout: float = 5.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.mmap_bytes = mmap_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and time.time() > row[1]:
+            self.delete(key)
+            return None
+        return bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl if ttl else None)
+        )
+        self._writes += 1
+        if self._writes % self.TRIM_EVERY == 0:
+            self._trim(connection)
+
+    def _trim(self, connection: sqlite3.Connection) -> None:
+        connection.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        excess = connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM cache_entries WHERE rowid IN "
+                "(SELECT rowid FROM cache_entries WHERE expires_at IS NOT NULL ORDER BY rowid LIMIT ?)", (excess,)
+            )
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            connection.execute(
+                "DELETE FROM cache_entries WHERE key = ? AND expires_at IS NOT NULL AND expires_at < ?", (key, now)
+            )
+            added = connection.execute(
+                "INSERT OR IGNORE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl if ttl else None)
+            ).rowcount == 1
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return added
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def incr(self, key: str) -> int:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT value FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            value = int(bytes(row[0])) + 1 if row is not None else 1
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, NULL)",
+                (key, str(value).encode())
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return value
+
+    def clear(self, prefix: str) -> None:
+        self._connection().execute(
+            "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class RESPBackend(CacheBackend):
+    """
+    Minimal Redis-protocol (RESP2) client over a small socket pool: GET,
+    SET with PX/NX, DEL, INCR and SCAN. Works with Redis, Valkey, KeyDB or
+    any compatible server; keys get `prefix` so several apps can share one.
+    Run the server with a volatile-* eviction policy so keys without a TTL
+    (counters) are never evicted.
+    """
+
+    name = "resp"
+
+    def __init__(self, url: str, prefix: str = "cable:", pool_size: int = 8, timeout: float = 1.0):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "resp"):
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[Tuple[socket.socket, Any]]" = queue.LifoQueue(maxsize=pool_size)
+
+    # -- protocol ---------------------------------------------------------
+
+    @staticmethod
+    def _encode(*args: Any) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    @classmethod
+    def _read(cls, stream: Any) -> Any:
+        line = stream.readline()
+        if not line:
+            raise ConnectionError("cache server closed the connection")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise CacheBackendError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            data = stream.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            size = int(payload)
+            return None if size < 0 else [cls._read(stream) for _ in range(size)]
+        raise CacheBackendError(f"unexpected reply: {line[:40]!r}")
+
+    def _connect(self) -> Tuple[socket.socket, Any]:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        stream = sock.makefile("rb")
+        if self.password:
+            sock.sendall(self._encode("AUTH", self.password))
+            self._read(stream)
+        if self.db:
+            sock.sendall(self._encode("SELECT", self.db))
+            self._read(stream)
+        return sock, stream
+
+    def command(self, *args: Any) -> Any:
+        """Send one command on a pooled connection and return the decoded reply."""
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        sock, stream = connection
+        try:
+            sock.sendall(self._encode(*args))
+            reply = self._read(stream)
+        except CacheBackendError:
+            self._release(connection)  # the server answered; the connection is fine
+            raise
+        except BaseException:
+            sock.close()
+            raise
+        self._release(connection)
+        return reply
+
+    def _release(self, connection: Tuple[socket.socket, Any]) -> None:
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection[0].close()
+
+    # -- backend ----------------------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.command("GET", self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl:
+            self.command("SET", self.prefix + key, value, "PX", max(1, int(ttl * 1000)))
+        else:
+            self.command("SET", self.prefix + key, value)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        if ttl:
+            reply = self.command("SET", self.prefix + key, value, "PX", max(1, int(ttl * 1000)), "NX")
+        else:
+            reply = self.command("SET", self.prefix + key, value, "NX")
+        return reply is not None
+
+    def delete(self, key: str) -> None:
+        self.command("DEL", self.prefix + key)
+
+    def incr(self, key: str) -> int:
+        return int(self.command("INCR", self.prefix + key))
+
+    def clear(self, prefix: str) -> None:
+        cursor = "0"
+        while True:
+            cursor, keys = self.command("SCAN", cursor, "MATCH", f"{self.prefix}{prefix}*", "COUNT", 500)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+            if keys:
+                self.command("DEL", *keys)
+            if cursor == "0":
+                return
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait()[0].close()
+            except queue.Empty:
+                return
+
+
+def _default(value: Any) -> Any:
+    """msgpack fallback for numpy scalars and other objects with .item()."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Cannot cache {type(value).__name__}")
+
+
+class Cache:
+    """One namespace of a backend: msgpack values, a default TTL and usage stats."""
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: Optional[float] = None):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, key: Hashable) -> str:
+        packed = ormsgpack.packb(key, default=_default, option=PACK_OPTIONS)
+        return f"{self.namespace}:{hashlib.blake2b(packed, digest_size=16).hexdigest()}"
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] = self._counts.get(outcome, 0) + 1
+        CACHE_OPERATIONS.inc(namespace=self.namespace, backend=self.backend.name, outcome=outcome)
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        self._count("error")
+        print(f"\n CACHE {operation.upper()} FAILED ({self.backend.name}/{self.namespace}): "
+              f"{type(error).__name__}: {error}")
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Private copy of the cached value, or `default` on a miss."""
+        try:
+            data = self.backend.get(self._key(key))
+            value = ormsgpack.unpackb(data, option=ormsgpack.OPT_NON_STR_KEYS) if data is not None else None
+        except Exception as e:
+            self._failed("get", e)
+            return default
+        if data is None:
+            self._count("miss")
+            return default
+        self._count("hit")
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        try:
+            data = ormsgpack.packb(value, default=_default, option=PACK_OPTIONS)
+            self.backend.set(self._key(key), data, ttl if ttl is not None else self.ttl)
+        except Exception as e:
+            self._failed("set", e)
+            return False
+        self._count("set")
+        return True
+
+    def add(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store `value` only if `key` is absent; False if it exists (or the backend failed)."""
+        try:
+            data = ormsgpack.packb(value, default=_default, option=PACK_OPTIONS)
+            added = self.backend.add(self._key(key), data, ttl if ttl is not None else self.ttl)
+        except Exception as e:
+            self._failed("add", e)
+            return False
+        if added:
+            self._count("set")
+        return added
+
+    def delete(self, key: Hashable) -> None:
+        try:
+            self.backend.delete(self._key(key))
+        except Exception as e:
+            self._failed("delete", e)
+
+    def counter(self, key: Hashable) -> int:
+        """Current value of an incr() counter (0 if never incremented or unreachable)."""
+        try:
+            data = self.backend.get(self._key(key))
+            return int(data) if data is not None else 0
+        except Exception as e:
+            self._failed("counter", e)
+            return 0
+
+    def incr(self, key: Hashable) -> Optional[int]:
+        try:
+            return self.backend.incr(self._key(key))
+        except Exception as e:
+            self._failed("incr", e)
+            return None
+
+    def clear(self) -> None:
+        try:
+            self.backend.clear(f"{self.namespace}:")
+        except Exception as e:
+            self._failed("clear", e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts.get("hit", 0) + counts.get("miss", 0)
+        return {
+            "namespace": self.namespace,
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl,
+            "hits": counts.get("hit", 0),
+            "misses": counts.get("miss", 0),
+            "sets": counts.get("set", 0),
+            "errors": counts.get("error", 0),
+            "hit_ratio": round(counts.get("hit", 0) / lookups, 4) if lookups else None
+        }
+
+
+def create_backend(kind: Optional[str] = None) -> CacheBackend:
+    """Cache backend from CACHE_BACKEND (memory, sqlite or resp)."""
+    kind = (kind or settings.CACHE_BACKEND).lower()
+    if kind == "memory":
+        return MemoryBackend(
+            max_entries=settings.CACHE_MEMORY_MAX_ENTRIES,
+            limits={"results": settings.RESULT_CACHE_SIZE, "llm": settings.LLM_CACHE_SIZE, "generations": None}
+        )
+    if kind == "sqlite":
+        return SQLiteBackend(
+            settings.CACHE_SQLITE_PATH,
+            max_entries=settings.CACHE_SQLITE_MAX_ENTRIES,
+            mmap_bytes=settings.CACHE_SQLITE_MMAP_BYTES
+        )
+    if kind == "resp":
+        return RESPBackend(settings.CACHE_URL, prefix=settings.CACHE_KEY_PREFIX, timeout=settings.CACHE_TIMEOUT)
+    raise ValueError(f"Unsupported cache backend: {kind}")
+
+
+def check_backend_sharing(backend: CacheBackend, workers: int) -> None:
+    """Refuse a per-process backend when several workers serve the API."""
+    if isinstance(backend, MemoryBackend) and workers > 1:
+        raise RuntimeError(
+            f"CACHE_BACKEND=memory with {workers} workers: a design change would only "
+            "invalidate the cache of the worker that handled it. Use sqlite or resp."
+        )
+
+
+DEFAULT_TTLS = {
+    "results": settings.RESULT_CACHE_TTL_SECONDS,
+    "llm": 86400.0,
+    "designs": 300.0,
+    "sessions": settings.HITL_SESSION_TTL_SECONDS
+}
+
+# Shared backend for this worker and the namespaces created on it
+cache_backend = create_backend()
+_namespaces: Dict[str, Cache] = {}
+
+
+def namespace_cache(namespace: str) -> Cache:
+    """The Cache for `namespace` on the shared backend, with its configured TTL."""
+    cache = _namespaces.get(namespace)
+    if cache is None:
+        ttl = settings.CACHE_TTLS.get(namespace, DEFAULT_TTLS.get(namespace))
+        cache = _namespaces[namespace] = Cache(cache_backend, namespace, ttl=ttl or None)
+    return cache
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Stats of every namespace in use."""
+    return [cache.stats() for cache in _namespaces.values()]
+
+
+# Designs read by fetch_design_node, valid while their result-cache generation is unchanged
+design_cache = namespace_cache("designs")
@@ -0,0 +1,79 @@
+"""
+Per-request deadlines.
+A Deadline is created when a request arrives (X-Request-Timeout header or
+REQUEST_DEADLINE_SECONDS), passed to the graph in the RunnableConfig and
+checked by the nodes and the LLM client, which skip optional work when the
+budget runs short. Cancelling it (client disconnected) makes every later
+check fail, so the remaining LLM calls are not made.
+"""
+from typing import Any, Callable, Optional
+import math
+import threading
+import time
+
+
+class RequestDeadlineExceeded(Exception):
+    """The request ran out of time budget (or its client went away)."""
+
+    def __init__(self, message: str, cancelled: bool = False):
+        super().__init__(message)
+        self.cancelled = cancelled
+
+
+class Deadline:
+    """Absolute monotonic deadline that can also be cancelled."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self._cancelled = threading.Event()
+        # Set by the owner of shared work: cancel() is ignored while it returns True
+        self.keep_alive: Optional[Callable[[], bool]] = None
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def timeout(self) -> Optional[float]:
+        """Remaining seconds as a wait timeout (None when unlimited)."""
+        return None if self.expires_at is None else self.remaining()
+
+    def cancel(self) -> bool:
+        """Stop the remaining work, unless other callers still wait for it."""
+        if self.keep_alive is not None and self.keep_alive():
+            return False
+        self._cancelled.set()
+        return True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def expired(self) -> bool:
+        return self.cancelled or self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """Whether work expected to take `seconds` still fits in the budget."""
+        return not self.cancelled and self.remaining() > seconds
+
+    def check(self, what: str) -> None:
+        if self.cancelled:
+            raise RequestDeadlineExceeded(f"{what}: request cancelled", cancelled=True)
+        if self.remaining() <= 0:
+            raise RequestDeadlineExceeded(f"{what}: request deadline of {self.seconds:.1f}s exceeded")
+
+
+def deadline_from(config: Optional[Any]) -> Optional[Deadline]:
+    """The request's Deadline from a node's RunnableConfig, if any."""
+    if not config:
+        return None
+    return (config.get("configurable") or {}).get("deadline")
+
+
+def record_skipped(state: Any, step: str, partial: bool = True) -> None:
+    """Record work skipped for lack of time; `partial` marks the verdicts as incomplete."""
+    if partial:
+        state["partial"] = True
+    state["skipped_steps"] = list(state.get("skipped_steps") or []) + [step]
+    print(f"\n DEADLINE: skipped {step}")
@@ -0,0 +1,247 @@
+"""
+Streaming bulk import of cable designs.
+Rows are read lazily from CSV or NDJSON, validated with the DesignCreate
+schema and upserted in large batches (INSERT ... ON CONFLICT, or COPY
+into a staging table on PostgreSQL). Invalid rows are reported per line; a
+batch the database rejects is rolled back and reported by its line range.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from app.config import settings
+from app.models import Design
+from app.schemas import DesignCreate, DesignImportError, DesignImportReport
+from app.utils.normalization import normalize_records
+import csv
+import io
+import json
+import time
+
+
+DESIGN_COLUMNS = [
+    "id", "standard", "voltage", "conductor_material", "conductor_class",
+    "csa", "insulation_material", "insulation_thickness", "supplier"
+]
+UPDATABLE_COLUMNS = DESIGN_COLUMNS[1:]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """Guess 'csv' or 'ndjson' from a file name or content type."""
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl", ".json")) or "json" in (content_type or ""):
+        return "ndjson"
+    return "csv"
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, row dict) from CSV lines; blanks become None."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, {key: (value if value != "" else None) for key, value in row.items() if key}
+
+
+def iter_ndjson_rows(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, parsed object or the decode error) from NDJSON lines."""
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+
+
+def iter_normalized_rows(
+    rows: Iterable[Tuple[int, Any]],
+    chunk_size: int = 1000
+) -> Iterator[Tuple[int, Any]]:
+    """Normalize attribute units/spellings chunk by chunk (bulk, column-wise)."""
+    chunk: List[Tuple[int, Any]] = []
+
+    def drain() -> Iterator[Tuple[int, Any]]:
+        positions = [i for i, (_, row) in enumerate(chunk) if isinstance(row, dict)]
+        normalized = normalize_records([chunk[i][1] for i in positions])
+        for i, row in zip(positions, normalized):
+            chunk[i] = (chunk[i][0], row)
+        yield from chunk
+        chunk.clear()
+
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield from drain()
+    yield from drain()
+
+
+def iter_validated_rows(
+    rows: Iterable[Tuple[int, Any]]
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Validate rows with DesignCreate; yields (line, design dict, error)."""
+    for line_no, row in rows:
+        if isinstance(row, Exception):
+            yield line_no, None, f"Invalid JSON: {row}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "Row is not an object"
+            continue
+        try:
+            design = DesignCreate.model_validate(row)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            yield line_no, None, errors
+            continue
+        yield line_no, design.model_dump(), None
+
+
+def _dedupe(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """ON CONFLICT cannot touch the same row twice in one statement; last row wins."""
+    return list({row["id"]: row for row in batch}.values())
+
+
+def _upsert_statement(dialect_name: str):
+    insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect_name)
+    if insert is None:
+        return None
+    stmt = insert(Design)
+    return stmt.on_conflict_do_update(
+        index_elements=[Design.id],
+        set_={**{column: stmt.excluded[column] for column in UPDATABLE_COLUMNS},
+              "updated_at": stmt.excluded.updated_at}
+    )
+
+
+def _copy_upsert(db: Session, batch: List[Dict[str, Any]]) -> None:
+    """PostgreSQL: COPY the batch into a temp table, then upsert from it."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([row.get(column) for column in DESIGN_COLUMNS] + [row["created_at"], row["updated_at"]])
+    buffer.seek(0)
+
+    columns = ", ".join(DESIGN_COLUMNS + ["created_at", "updated_at"])
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in UPDATABLE_COLUMNS + ["updated_at"])
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS designs_import "
+            "(LIKE designs INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        cursor.copy_expert(f"COPY designs_import ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            f"INSERT INTO designs ({columns}) SELECT {columns} FROM designs_import "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}"
+        )
+    finally:
+        cursor.close()
+
+
+def upsert_designs(db: Session, batch: List[Dict[str, Any]], use_copy: bool = False) -> int:
+    """Insert or update a batch of validated design dicts; returns rows written."""
+    if not batch:
+        return 0
+    now = datetime.utcnow()
+    rows = [{**row, "created_at": now, "updated_at": now} for row in _dedupe(batch)]
+    dialect_name = db.get_bind().dialect.name
+
+    if use_copy and dialect_name == "postgresql":
+        _copy_upsert(db, rows)
+    else:
+        stmt = _upsert_statement(dialect_name)
+        if stmt is not None:
+            db.execute(stmt, rows)
+        else:
+            for row in rows:
+                db.merge(Design(**row))
+    db.commit()
+    return len(rows)
+
+
+def import_designs(
+    db: Session,
+    lines: Iterable[str],
+    fmt: str = "csv",
+    batch_size: Optional[int] = None,
+    max_errors: Optional[int] = None,
+    use_copy: Optional[bool] = None,
+    on_batch=None
+) -> DesignImportReport:
+    """
+    Stream rows from `lines` into the designs table.
+
+    Args:
+        db: Database session (committed once per batch)
+        lines: Iterable of text lines (an open file, a decoded upload, ...)
+        fmt: 'csv' (header row required) or 'ndjson'
+        on_batch: Optional callback receiving the design IDs of each written batch
+
+    Returns:
+        Report with counts, throughput and the first `max_errors` row errors
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    max_errors = settings.IMPORT_MAX_ERRORS if max_errors is None else max_errors
+    use_copy = settings.IMPORT_USE_COPY if use_copy is None else use_copy
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError(f"Unsupported import format: {fmt}")
+    rows = iter_csv_rows(lines) if fmt == "csv" else iter_ndjson_rows(lines)
+    if settings.NORMALIZATION_ENABLED:
+        rows = iter_normalized_rows(rows, chunk_size=min(batch_size, 1000))
+
+    started = time.perf_counter()
+    total = imported = failed = 0
+    errors: List[DesignImportError] = []
+    batch: List[Dict[str, Any]] = []
+    batch_lines: List[int] = []
+
+    def report(line_no: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < max_errors:
+            errors.append(DesignImportError(line=line_no, error=error))
+
+    def flush() -> int:
+        if not batch:
+            return 0
+        try:
+            written = upsert_designs(db, batch, use_copy=use_copy)
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f" Import batch (lines {batch_lines[0]}-{batch_lines[-1]}) rejected: {e}")
+            message = f"Batch not written (lines {batch_lines[0]}-{batch_lines[-1]}): {type(e).__name__}"
+            for line_no in batch_lines:
+                report(line_no, message)
+            written = 0
+        else:
+            if on_batch is not None:
+                on_batch([row["id"] for row in batch])
+        batch.clear()
+        batch_lines.clear()
+        return written
+
+    for line_no, design, error in iter_validated_rows(rows):
+        total += 1
+        if error is not None:
+            report(line_no, error)
+            continue
+        batch.append(design)
+        batch_lines.append(line_no)
+        if len(batch) >= batch_size:
+            imported += flush()
+    imported += flush()
+
+    elapsed = time.perf_counter() - started
+    return DesignImportReport(
+        format=fmt,
+        total_rows=total,
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(total / elapsed, 1) if elapsed > 0 else 0.0
+    )
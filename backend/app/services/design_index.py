@@ -0,0 +1,231 @@
+"""
+Nearest-neighbor index over validated designs.
+Complete designs that validated without FAIL are indexed (identical
+attribute combinations share one row with a count). For a partial spec the
+index finds the closest known designs on the attributes that ARE present
+and proposes values for the missing ones, with how many designs support them.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Design, Validation, ValidationResult
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from app.utils.metrics import registry
+import math
+import re
+import threading
+import numpy as np
+
+
+SUGGESTIONS = registry.counter(
+    "design_index_suggestions_total", "Missing-attribute lookups by outcome", ["outcome"]
+)
+INDEX_SIZE = registry.gauge(
+    "design_index_size", "Distinct attribute combinations in the design index"
+)
+
+NUMERIC_FIELDS = ["csa", "insulation_thickness", "voltage"]
+CATEGORICAL_FIELDS = ["standard", "conductor_material", "conductor_class", "insulation_material"]
+
+# Distance contributed by a one-unit difference on each numeric feature
+# (csa and voltage compare on a log2 scale, thickness in 0.5 mm steps)
+NUMERIC_SCALES = np.array([1.0, 0.5, 1.0])
+MISSING_NUMERIC_PENALTY = 1.0
+
+VOLTAGE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*kV', re.IGNORECASE)
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def numeric_features(attributes: Dict[str, Any]) -> List[float]:
+    """[log2 csa, thickness, log2 U (kV)] with NaN where unknown."""
+    csa = _float(attributes.get("csa"))
+    thickness = _float(attributes.get("insulation_thickness"))
+    match = VOLTAGE_PATTERN.search(str(attributes.get("voltage") or ""))
+    voltage = float(match.group(2)) if match else None
+    return [
+        math.log2(csa) if csa and csa > 0 else math.nan,
+        thickness if thickness is not None else math.nan,
+        math.log2(voltage) if voltage and voltage > 0 else math.nan,
+    ]
+
+
+def _category(value: Any) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return " ".join(str(value).split()).casefold()
+
+
+def _key(field: str, value: Any) -> Any:
+    """Canonical value for grouping: numbers for csa/thickness, normalised text otherwise."""
+    return _float(value) if field in ("csa", "insulation_thickness") else _category(value)
+
+
+def is_complete(attributes: Dict[str, Any]) -> bool:
+    return all(attributes.get(attr) not in (None, "") for attr in REQUIRED_ATTRIBUTES)
+
+
+class DesignIndex:
+    """Thread-safe in-memory k-NN index with incremental inserts."""
+
+    def __init__(self, neighbors: int = 15, min_support: int = 3, max_entries: int = 50000):
+        self.neighbors = neighbors
+        self.min_support = min_support
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._rows: Dict[Tuple, int] = {}  # canonical attribute tuple -> row
+        self._values: List[Dict[str, Any]] = []  # row -> attribute values as validated
+        self._counts: List[int] = []
+        self._codes: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+        self._numeric = np.empty((0, len(NUMERIC_FIELDS)))
+        self._categorical = np.empty((0, len(CATEGORICAL_FIELDS)), dtype=np.int32)
+        self._count_array = np.empty(0)
+        self._pending: List[int] = []  # rows added since the arrays were built
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _code(self, field: str, value: Any, create: bool) -> int:
+        key = _category(value)
+        if key is None:
+            return -1
+        codes = self._codes[field]
+        if key not in codes:
+            if not create:
+                return -2  # never seen: matches nothing
+            codes[key] = len(codes)
+        return codes[key]
+
+    def add(self, attributes: Dict[str, Any], count: int = 1) -> bool:
+        """Index a complete, validated design; returns False if not indexable."""
+        if not is_complete(attributes):
+            return False
+        key = tuple(_key(field, attributes[field]) for field in REQUIRED_ATTRIBUTES)
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                self._counts[row] += count
+                if row < len(self._count_array):
+                    self._count_array[row] += count
+                return True
+            if len(self._values) >= self.max_entries:
+                return False
+            self._rows[key] = len(self._values)
+            self._values.append({attr: attributes[attr] for attr in REQUIRED_ATTRIBUTES})
+            self._counts.append(count)
+            for field in CATEGORICAL_FIELDS:
+                self._code(field, attributes[field], create=True)
+            self._pending.append(len(self._values) - 1)
+            INDEX_SIZE.set(len(self._values))
+            return True
+
+    def add_many(self, designs: Iterable[Dict[str, Any]]) -> int:
+        return sum(1 for attributes in designs if self.add(attributes))
+
+    def _refresh_arrays(self) -> None:
+        """Append rows added since the last query to the feature arrays."""
+        if not self._pending:
+            return
+        rows = [self._values[row] for row in self._pending]
+        self._numeric = np.vstack([self._numeric, np.array([numeric_features(r) for r in rows])])
+        self._categorical = np.vstack([self._categorical, np.array(
+            [[self._code(field, r[field], create=False) for field in CATEGORICAL_FIELDS] for r in rows],
+            dtype=np.int32
+        )])
+        self._count_array = np.concatenate([self._count_array, [self._counts[row] for row in self._pending]])
+        self._pending.clear()
+
+    def suggest(self, attributes: Dict[str, Any], missing: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Most likely values for `missing` fields given the known ones.
+
+        Returns:
+            {field: {"value", "support", "confidence"}} for fields whose top
+            value is backed by at least `min_support` indexed designs
+        """
+        with self._lock:
+            self._refresh_arrays()
+            if not len(self._values) or not missing:
+                return {}
+            query_numeric = np.array(numeric_features(attributes))
+            query_codes = np.array([
+                self._code(field, attributes.get(field), create=False) for field in CATEGORICAL_FIELDS
+            ])
+            known_numeric = ~np.isnan(query_numeric)
+            known_categorical = query_codes != -1
+            if not known_numeric.any() and not known_categorical.any():
+                SUGGESTIONS.inc(outcome="no_known_fields")
+                return {}
+
+            diffs = np.abs(self._numeric[:, known_numeric] - query_numeric[known_numeric]) / NUMERIC_SCALES[known_numeric]
+            distance = np.nan_to_num(diffs, nan=MISSING_NUMERIC_PENALTY).sum(axis=1)
+            distance += (self._categorical[:, known_categorical] != query_codes[known_categorical]).sum(axis=1)
+
+            k = min(self.neighbors, len(distance))
+            nearest = np.argpartition(distance, k - 1)[:k]
+            weights = self._count_array[nearest] / (1.0 + distance[nearest])
+            counts = self._count_array[nearest]
+            neighbors = [self._values[row] for row in nearest]
+
+        suggestions: Dict[str, Dict[str, Any]] = {}
+        for field in missing:
+            votes: Dict[Any, List[float]] = {}
+            for neighbor, weight, count in zip(neighbors, weights, counts):
+                key = _key(field, neighbor[field])
+                vote = votes.setdefault(key, [0.0, 0.0, neighbor[field]])
+                vote[0] += weight
+                vote[1] += count
+            if not votes:
+                continue
+            weight, support, value = max(votes.values(), key=lambda vote: vote[0])
+            if support >= self.min_support:
+                suggestions[field] = {
+                    "value": value,
+                    "support": int(support),
+                    "confidence": round(float(weight / weights.sum()), 2),
+                }
+        SUGGESTIONS.inc(outcome="suggested" if suggestions else "no_support")
+        return suggestions
+
+    def load(self, db: Session, limit: Optional[int] = None) -> int:
+        """Bulk-load complete designs that have a validation without any FAIL."""
+        failed = exists().where(
+            ValidationResult.validation_id == Validation.id, ValidationResult.status == "FAIL"
+        )
+        validated = select(Validation.design_id).where(Validation.design_id.isnot(None), ~failed)
+        stmt = select(Design).where(
+            Design.id.in_(validated), *[getattr(Design, attr).isnot(None) for attr in REQUIRED_ATTRIBUTES]
+        ).limit(limit or self.max_entries)
+        return self.add_many(design.to_dict() for design in db.scalars(stmt))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+            INDEX_SIZE.set(0)
+
+
+def indexable(final_state: Dict[str, Any]) -> bool:
+    """A completed validation whose attributes are complete and nothing FAILed."""
+    validation = final_state.get("validation") or []
+    return (
+        bool(validation)
+        and not any(item.get("status") == "FAIL" for item in validation)
+        and is_complete(final_state.get("attributes") or {})
+    )
+
+
+# Global index instance (loaded during warmup, grown by completed validations)
+design_index = DesignIndex(
+    neighbors=settings.SUGGESTION_NEIGHBORS,
+    min_support=settings.SUGGESTION_MIN_SUPPORT,
+    max_entries=settings.SUGGESTION_INDEX_MAX_ENTRIES
+)
@@ -0,0 +1,118 @@
+"""
+Filtered keyset (cursor) pagination over the designs table.
+Pages continue strictly after the last row of the previous page on the
+sort key, so fetch time does not grow with page depth the way OFFSET does.
+"""
+from typing import List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models import Design
+from app.schemas import DesignFilters
+import base64
+import json
+
+# Sort name -> columns of the (unique) keyset; id breaks updated_at ties
+SORT_KEYS = {
+    "id": (Design.id,),
+    "updated_at": (Design.updated_at, Design.id),
+}
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or was issued for a different sort order."""
+
+
+def apply_filters(stmt: Select, filters: Optional[DesignFilters]) -> Select:
+    if filters is None:
+        return stmt
+    if filters.csa_min is not None:
+        stmt = stmt.where(Design.csa >= filters.csa_min)
+    if filters.csa_max is not None:
+        stmt = stmt.where(Design.csa <= filters.csa_max)
+    for field in ("conductor_material", "insulation_material", "standard", "voltage"):
+        value = getattr(filters, field)
+        if value is not None:
+            stmt = stmt.where(getattr(Design, field) == value)
+    return stmt
+
+
+def encode_cursor(sort: str, design: Design) -> str:
+    values = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in (getattr(design, column.key) for column in SORT_KEYS[sort])
+    ]
+    raw = json.dumps([sort, values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: str) -> List:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    if cursor_sort != sort or len(values) != len(SORT_KEYS[sort]):
+        raise InvalidCursorError(f"Cursor was not issued for sort={sort}")
+    if sort == "updated_at":
+        try:
+            values[0] = datetime.fromisoformat(values[0])
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError("Malformed cursor") from e
+    return values
+
+
+def designs_page_query(
+    filters: Optional[DesignFilters] = None,
+    sort: str = "id",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> Select:
+    """Page query fetching one row beyond `limit` to detect a next page."""
+    columns = SORT_KEYS[sort]
+    stmt = apply_filters(select(Design), filters).order_by(*columns)
+    if cursor:
+        values = decode_cursor(sort, cursor)
+        key = columns[0] if len(columns) == 1 else tuple_(*columns)
+        stmt = stmt.where(key > (values[0] if len(columns) == 1 else tuple_(*values)))
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit + 1)
+
+
+def _split_page(designs: List[Design], sort: str, limit: int) -> Tuple[List[Design], Optional[str]]:
+    if len(designs) <= limit:
+        return designs, None
+    designs = designs[:limit]
+    return designs, encode_cursor(sort, designs[-1])
+
+
+def list_designs_page(
+    db: Session,
+    filters: Optional[DesignFilters] = None,
+    sort: str = "id",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> Tuple[List[Design], Optional[str]]:
+    """
+    One page of designs plus the cursor of the next page (None on the last).
+    `skip` keeps legacy offset paging working but is ignored with a cursor.
+    """
+    stmt = designs_page_query(filters, sort, limit, cursor, skip)
+    return _split_page(list(db.scalars(stmt)), sort, limit)
+
+
+async def alist_designs_page(
+    db: AsyncSession,
+    filters: Optional[DesignFilters] = None,
+    sort: str = "id",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> Tuple[List[Design], Optional[str]]:
+    """Async variant of list_designs_page."""
+    stmt = designs_page_query(filters, sort, limit, cursor, skip)
+    return _split_page(list(await db.scalars(stmt)), sort, limit)
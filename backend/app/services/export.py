@@ -0,0 +1,186 @@
+"""
+Streaming export of designs and persisted validation results.
+Rows are fetched through server-side cursors in fixed-size partitions and
+encoded chunk by chunk (NDJSON, CSV, or Parquet/Arrow when pyarrow is
+installed), so memory stays flat regardless of table size.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+from app.models import Design, Validation, ValidationResult
+from app.schemas import DesignFilters
+from app.services.design_listing import apply_filters
+import csv
+import io
+import json
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+DESIGN_EXPORT_COLUMNS = [
+    Design.id, Design.standard, Design.voltage, Design.conductor_material,
+    Design.conductor_class, Design.csa, Design.insulation_material,
+    Design.insulation_thickness, Design.supplier, Design.created_at, Design.updated_at
+]
+
+RESULT_EXPORT_COLUMNS = [
+    Validation.id.label("validation_id"), Validation.created_at, Validation.design_id,
+    Validation.standard, Validation.route, Validation.confidence, Validation.hitl_mode,
+    ValidationResult.field, ValidationResult.status, ValidationResult.expected,
+    ValidationResult.comment
+]
+
+
+def designs_query(filters: Optional[DesignFilters] = None) -> Select:
+    return apply_filters(select(*DESIGN_EXPORT_COLUMNS), filters).order_by(Design.id)
+
+
+def validation_results_query(
+    design_id: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None
+) -> Select:
+    stmt = (
+        select(*RESULT_EXPORT_COLUMNS)
+        .join(ValidationResult, ValidationResult.validation_id == Validation.id)
+        .order_by(Validation.created_at, Validation.id)
+    )
+    if design_id:
+        stmt = stmt.where(Validation.design_id == design_id)
+    if status:
+        stmt = stmt.where(ValidationResult.status == status.upper())
+    if since:
+        stmt = stmt.where(Validation.created_at >= since)
+    return stmt
+
+
+def iter_partitions(db: Session, stmt: Select, chunk_size: int = 1000) -> Iterator[Sequence[Dict[str, Any]]]:
+    """
+    Yield lists of row mappings using a server-side cursor
+    (stream_results on PostgreSQL; SQLite steps its cursor lazily anyway).
+    """
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+    try:
+        for partition in result.mappings().partitions(chunk_size):
+            yield partition
+    finally:
+        result.close()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_ndjson(columns: List[str], partitions: Iterable[Sequence[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in partitions:
+        yield "".join(
+            json.dumps({column: _plain(row[column]) for column in columns}) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+def encode_csv(columns: List[str], partitions: Iterable[Sequence[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in partitions:
+        writer.writerows([_plain(row[column]) for column in columns] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands out what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def encode_arrow(
+    columns: List[str],
+    partitions: Iterable[Sequence[Dict[str, Any]]],
+    fmt: str = "parquet"
+) -> Iterator[bytes]:
+    """Parquet (one row group per partition) or Arrow IPC stream; requires pyarrow."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    try:
+        for rows in partitions:
+            batch = pa.RecordBatch.from_pylist(
+                [{column: _plain(row[column]) for column in columns} for row in rows]
+            )
+            if writer is None:
+                writer = (pq.ParquetWriter(sink, batch.schema) if fmt == "parquet"
+                          else pa.ipc.new_stream(sink, batch.schema))
+            writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.drain()
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+ENCODERS: Dict[str, Callable[..., Iterator[bytes]]] = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+    "parquet": lambda columns, partitions: encode_arrow(columns, partitions, "parquet"),
+    "arrow": lambda columns, partitions: encode_arrow(columns, partitions, "arrow"),
+}
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    stmt: Select,
+    fmt: str = "ndjson",
+    chunk_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Encoded export chunks. The generator owns its session because the
+    response body is produced after the request's dependencies are closed.
+    """
+    columns = list(stmt.selected_columns.keys())
+    db = session_factory()
+    try:
+        yield from ENCODERS[fmt](columns, iter_partitions(db, stmt, chunk_size))
+    finally:
+        db.close()
@@ -0,0 +1,148 @@
+"""
+Interactive HITL channel (WebSocket).
+One conversation per connection: the validation is run (or a saved HITL
+session loaded), then the interactive graph pauses at ask_missing with a
+LangGraph interrupt. Its state stays in the connection (a MemorySaver
+checkpointer) instead of being rebuilt from the cache on every answer.
+Each answer is parsed as soon as it arrives; after the last one the same
+run continues straight into revalidation.
+
+Every parsed answer is also saved to the shared HITL session, so a dropped
+connection can be continued over REST or a new connection with its session_id.
+Between messages the connection holds no database session; each message
+opens a short-lived one and gets its own REQUEST_DEADLINE_SECONDS budget.
+"""
+from app.config import settings
+from app.services.deadline import Deadline
+from app.services.hitl_sessions import hitl_sessions
+from app.services.usage import observe_usage
+from app.services.validation_service import ValidationService
+from app.utils.metrics import registry
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Optional
+import copy
+
+
+HITL_CHANNEL_MESSAGES = registry.counter(
+    "hitl_channel_messages_total", "Messages handled by interactive HITL channels by type", ["type"]
+)
+
+
+class HITLChannelError(ValueError):
+    """A message the conversation cannot accept in its current step."""
+
+
+class HITLChannel:
+    """A paused validation run waiting for answers over one connection."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        # Imported here: the graph nodes import app.services themselves
+        from app.langgraph.workflow import create_interactive_graph
+
+        self.session_factory = session_factory
+        self.service = ValidationService(None)
+        self.graph = create_interactive_graph(MemorySaver())
+        self.config: Optional[RunnableConfig] = None
+        self.session: Optional[Dict[str, Any]] = None
+        self.usage_seen = 0
+
+    def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one client message (with a database session of its own); returns the event to send back."""
+        HITL_CHANNEL_MESSAGES.inc(type=str(message.get("type")))
+        self.service.db = self.session_factory() if self.session_factory is not None else None
+        try:
+            return self._dispatch(message)
+        finally:
+            if self.service.db is not None:
+                self.service.db.close()
+            self.service.db = None
+
+    def _run_config(self) -> RunnableConfig:
+        """Config of one graph step: this message's session and time budget."""
+        return RunnableConfig(
+            recursion_limit=50,
+            configurable={
+                **self.config["configurable"],
+                "db": self.service.db,
+                "deadline": Deadline(settings.REQUEST_DEADLINE_SECONDS)
+            }
+        )
+
+    def _dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        kind = message.get("type")
+        if kind == "start":
+            if self.session is not None:
+                raise HITLChannelError("The conversation has already started")
+            return self.start(message.get("user_input"), message.get("session_id"))
+        if kind == "answer":
+            if self.session is None:
+                raise HITLChannelError("Send a start message first")
+            if not message.get("field") or message.get("value") is None:
+                raise HITLChannelError("An answer needs a field and a value")
+            return self.answer(message["field"], str(message["value"]))
+        raise HITLChannelError(f"Unknown message type: {kind!r} (expected start or answer)")
+
+    def start(self, user_input: Optional[str] = None, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Validate `user_input` (or load a saved session) and pause at the first question."""
+        if session_id is None:
+            if not user_input:
+                raise HITLChannelError("A start message needs user_input or session_id")
+            result = self.service.run_validation(
+                user_input, hitl_mode=True, deadline=Deadline(settings.REQUEST_DEADLINE_SECONDS)
+            )
+            if not result.get("session_id"):
+                return {"type": "result", "state": result}  # nothing to ask
+            session_id = result["session_id"]
+        self.session = hitl_sessions.get(session_id)
+
+        state = self.service._initial_state(self.session["user_input"], hitl_mode=True)
+        state.update(copy.deepcopy(self.session["state"]))
+        state.update({"skip_missing_prompts": False, "hitl_responses": {}})
+        self.config = RunnableConfig(configurable={"thread_id": session_id})
+        self.graph.invoke(state, self._run_config())  # runs up to the first interrupt
+        values = self.graph.get_state(self.config).values
+        print(f"\n HITL CHANNEL {session_id}: waiting for {values['missing_attributes']}")
+        return {
+            "type": "questions",
+            "session_id": session_id,
+            "session_version": self.session["version"],
+            "missing_attributes": values["missing_attributes"],
+            "suggestions": values.get("attribute_suggestions") or {},
+            "validation": values.get("validation") or []
+        }
+
+    def answer(self, field: str, value: str) -> Dict[str, Any]:
+        """Parse one answer; returns the remaining questions or, after the last one, the result."""
+        missing = self.graph.get_state(self.config).values.get("missing_attributes") or []
+        if field not in missing:
+            raise HITLChannelError(f"{field} is not a missing attribute (missing: {', '.join(missing)})")
+
+        self.graph.invoke(Command(resume={"field": field, "value": value}), self._run_config())
+        snapshot = self.graph.get_state(self.config)
+        state = snapshot.values
+        self._observe_usage(state)
+        if not snapshot.next:
+            # Last answer: the run went on through revalidation
+            self.service._finish_session(self.session, state)
+            print(f"\n HITL CHANNEL {self.session['id']}: complete")
+            return {"type": "result", "state": state}
+
+        self.session = hitl_sessions.save(self.session, state)
+        remaining = state.get("missing_attributes") or []
+        return {
+            "type": "parsed",
+            "field": field,
+            "value": (state.get("attributes") or {}).get(field),
+            "accepted": field not in remaining,
+            "missing_attributes": remaining,
+            "session_version": self.session["version"]
+        }
+
+    def _observe_usage(self, state: Dict[str, Any]) -> None:
+        """Record the LLM calls made since the last step."""
+        usage = state.get("llm_usage") or []
+        observe_usage(state.get("route"), usage[self.usage_seen:])
+        self.usage_seen = len(usage)
@@ -0,0 +1,119 @@
+"""
+HITL session store.
+A validation that needs answers for missing attributes is saved as a
+session in the shared cache backend ("sessions" namespace): the graph state
+needed to resume (attributes, missing fields, verdicts, answers so far) in
+one msgpack entry with a sliding TTL. With a sqlite or resp backend a
+follow-up can land on any worker and resume from it in one fetch.
+
+Writes are optimistic: every session has a version, and a writer must claim
+the next version (set-if-absent, so exactly one writer wins) before storing
+it. A follow-up based on an outdated version gets HITLSessionConflict.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from app.services.cache import Cache, namespace_cache
+from app.utils.metrics import registry
+from uuid import uuid4
+
+
+HITL_SESSIONS = registry.counter(
+    "hitl_sessions_total", "HITL session operations by outcome", ["outcome"]
+)
+
+# State kept between HITL rounds; everything else is rebuilt by the resume graph
+RESUME_FIELDS = (
+    "route", "design_id", "attributes", "missing_attributes", "validation", "validated_attributes",
+    "reasoning", "confidence", "conversation_history", "attribute_suggestions", "inferred_attributes",
+    "hitl_retry_count"
+)
+
+
+class HITLSessionNotFound(Exception):
+    """The session does not exist, has expired or was completed."""
+
+
+class HITLSessionConflict(Exception):
+    """The session moved on since the version the caller based its answers on."""
+
+    def __init__(self, session_id: str, version: Optional[int]):
+        super().__init__(f"HITL session {session_id} was updated concurrently (current version {version})")
+        self.session_id = session_id
+        self.version = version
+
+
+def compact_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """The resumable part of a graph state, without empty values."""
+    return {field: state[field] for field in RESUME_FIELDS if state.get(field) not in (None, [], {})}
+
+
+class HITLSessionStore:
+    """In-progress HITL validations by session ID, versioned."""
+
+    def __init__(self, cache: Cache):
+        self.cache = cache
+
+    def create(self, user_input: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a validation waiting for answers; returns the session (version 1)."""
+        session = self._write(uuid4().hex, 1, user_input, state, created_at=_now())
+        HITL_SESSIONS.inc(outcome="created")
+        return session
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        session = self.cache.get(("session", session_id))
+        if session is None:
+            HITL_SESSIONS.inc(outcome="expired")
+            raise HITLSessionNotFound(f"HITL session {session_id} not found or expired")
+        return session
+
+    def _claim(self, session: Dict[str, Any]) -> int:
+        """Reserve the next version of `session`, or raise HITLSessionConflict."""
+        version = session["version"] + 1
+        if not self.cache.add(("claim", session["id"], version), True):
+            HITL_SESSIONS.inc(outcome="conflict")
+            current = self.cache.get(("session", session["id"]))
+            raise HITLSessionConflict(session["id"], current["version"] if current else None)
+        return version
+
+    def save(self, session: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the state after a partial round as the session's next version."""
+        version = self._claim(session)
+        updated = self._write(session["id"], version, session["user_input"], state, session["created_at"])
+        HITL_SESSIONS.inc(outcome="resumed")
+        return updated
+
+    def complete(self, session: Dict[str, Any]) -> None:
+        """Close the session after its final round (claims a version like save)."""
+        self._claim(session)
+        self.cache.delete(("session", session["id"]))
+        HITL_SESSIONS.inc(outcome="completed")
+
+    def _write(
+        self,
+        session_id: str,
+        version: int,
+        user_input: str,
+        state: Dict[str, Any],
+        created_at: str
+    ) -> Dict[str, Any]:
+        session = {
+            "id": session_id,
+            "version": version,
+            "user_input": user_input,
+            "state": compact_state(state),
+            "created_at": created_at,
+            "updated_at": _now()
+        }
+        self.cache.set(("session", session_id), session)
+        return session
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# Global session store (shared across workers by the cache backend)
+hitl_sessions = HITLSessionStore(namespace_cache("sessions"))
@@ -0,0 +1,523 @@
+"""
+Resilient LLM client wrapper.
+Puts a concurrency limit, token-bucket rate limit, jittered retries,
+per-call deadlines and a circuit breaker in front of the chat model.
+"""
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+)
+from typing import Any, Callable, Deque, Dict, Optional
+from langchain_core.messages import AIMessage
+from app.services.cache import Cache, MemoryBackend
+from app.services.deadline import Deadline, RequestDeadlineExceeded
+from app.utils.metrics import registry
+import random
+import threading
+import time
+
+
+QUEUE_WAIT = registry.histogram(
+    "llm_queue_wait_seconds", "Time spent waiting for an LLM concurrency/rate slot", ["provider"]
+)
+BREAKER_STATE = registry.gauge(
+    "llm_circuit_breaker_state", "Circuit breaker state (0=closed, 1=half_open, 2=open)", ["provider"]
+)
+LLM_CALLS = registry.counter(
+    "llm_calls_total", "LLM calls by node and outcome", ["provider", "node", "outcome"]
+)
+LLM_RETRIES = registry.counter(
+    "llm_retries_total", "Retried LLM attempts after transient failures", ["provider", "node"]
+)
+LLM_LATENCY = registry.histogram(
+    "llm_call_duration_seconds", "Latency of successful provider calls", ["provider", "node"]
+)
+LLM_HEDGES = registry.counter(
+    "llm_hedged_requests_total", "Duplicate requests sent after the hedge delay", ["provider", "node"]
+)
+LLM_HEDGE_WINS = registry.counter(
+    "llm_hedge_wins_total", "Hedged requests that answered before the original", ["provider", "node"]
+)
+LLM_HEDGE_WASTED_TOKENS = registry.counter(
+    "llm_hedge_wasted_tokens_total", "Tokens spent on the losing side of hedged requests", ["provider", "node"]
+)
+
+CANCEL_POLL_SECONDS = 0.25  # how often a waiting call checks for cancellation
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+TRANSIENT_ERROR_NAMES = {
+    "ResourceExhausted", "ServiceUnavailable", "InternalServerError", "DeadlineExceeded",
+    "TooManyRequests", "RateLimitError", "APIConnectionError", "APITimeoutError",
+}
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the provider is unhealthy and no fallback answer exists."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for timeouts, rate limits and 5xx responses worth retrying."""
+    if isinstance(exc, (TimeoutError, FutureTimeoutError, ConnectionError)):
+        return True
+    for source in (exc, getattr(exc, "response", None)):
+        code = getattr(source, "status_code", None) or getattr(source, "code", None)
+        if isinstance(code, int) and code in TRANSIENT_STATUS_CODES:
+            return True
+    return type(exc).__name__ in TRANSIENT_ERROR_NAMES
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, sleeping until one is available or `timeout` elapses."""
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker.
+    Opens after `failure_threshold` consecutive failures, lets a single
+    probe through after `recovery_timeout` seconds (half-open) and closes
+    again on success.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    _GAUGE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(0, provider=name)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        BREAKER_STATE.set(self._GAUGE_VALUES[state], provider=self.name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._set_state(self.HALF_OPEN)
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will admit a probe again."""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe that ended without a verdict on the provider."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per node."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, node: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(node)
+            if samples is None:
+                samples = self._samples[node] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count(self, node: str) -> int:
+        return len(self._samples.get(node, ()))
+
+    def percentile(self, node: str, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(node, ()))
+        if not samples:
+            return None
+        rank = max(0, min(len(samples) - 1, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[rank]
+
+
+def _total_tokens(response: Any) -> int:
+    usage = getattr(response, "usage_metadata", None) or {}
+    return int(usage.get("total_tokens", 0) or 0)
+
+
+def _annotate(response: Any, seconds: float) -> None:
+    """Mark a provider answer with its latency (fallback and cached answers have none)."""
+    metadata = getattr(response, "response_metadata", None)
+    if isinstance(metadata, dict):
+        metadata["latency_seconds"] = seconds
+
+
+def _is_valid_response(future: Future) -> bool:
+    if future.cancelled() or future.exception() is not None:
+        return False
+    content = getattr(future.result(), "content", None)
+    return isinstance(content, str) and bool(content.strip())
+
+
+class ResilientLLM:
+    """
+    Drop-in wrapper around a LangChain chat model.
+
+    Nodes keep calling `llm.invoke(prompt)`; they may additionally pass the
+    node name (for metrics) and a `fallback` callable returning the content a
+    deterministic fast path would produce. When the provider is unhealthy the
+    fallback is used first, then the last good answer for the same prompt
+    (kept in `cache`, by default a private in-memory LRU of `cache_size`).
+
+    A request `deadline` caps the queue wait, call timeout and retries by the
+    remaining budget; once it is spent the fallback answers (or
+    RequestDeadlineExceeded is raised) without touching the breaker.
+
+    With `hedge_percentile` set, a call still running after that percentile
+    of the node's recent latency is duplicated (to `hedge_model`, or the same
+    model) and the first valid response wins.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        provider: str,
+        max_concurrency: int = 8,
+        rate_per_second: float = 5.0,
+        burst: int = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        call_timeout: float = 30.0,
+        queue_timeout: float = 10.0,
+        breaker: Optional[CircuitBreaker] = None,
+        cache_size: int = 512,
+        cache: Optional[Cache] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        hedge_model: Any = None,
+        latency_window: int = 200,
+    ):
+        self.model = model
+        self.provider = provider
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.call_timeout = call_timeout
+        self.queue_timeout = queue_timeout
+        self.breaker = breaker or CircuitBreaker(provider)
+        self.cache_size = cache_size
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_model = hedge_model
+        self.latencies = LatencyTracker(latency_window)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_per_second, burst)
+        # Timed-out calls keep their worker until the provider returns,
+        # so leave headroom beyond the concurrency limit.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency * 2, thread_name_prefix=f"llm-{provider}"
+        )
+        if cache is None and cache_size > 0:
+            cache = Cache(MemoryBackend(max_entries=cache_size), "llm")
+        self.cache = cache
+
+    def invoke(
+        self,
+        prompt: Any,
+        *,
+        node: str = "unknown",
+        fallback: Optional[Callable[[], str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AIMessage:
+        """Invoke the model with retries; degrade gracefully when unhealthy."""
+        if deadline is not None and deadline.expired():
+            return self._out_of_time(node, fallback, deadline)
+        if not self.breaker.allow_request():
+            return self._degraded(prompt, node, fallback, "circuit open")
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._call(prompt, node, deadline)
+            except RequestDeadlineExceeded:
+                # Our budget ran out, not the provider's fault
+                self.breaker.release_probe()
+                return self._out_of_time(node, fallback, deadline)
+            except Exception as exc:
+                if not is_transient_error(exc):
+                    # The provider answered (e.g. a 400), so it is healthy.
+                    self.breaker.record_success()
+                    LLM_CALLS.inc(provider=self.provider, node=node, outcome="error")
+                    raise
+                self.breaker.record_failure()
+                print(f"\n LLM CALL FAILED ({node}, attempt {attempt + 1}): {type(exc).__name__}: {exc}")
+                if attempt == self.max_retries or not self.breaker.allow_request():
+                    return self._degraded(prompt, node, fallback, str(exc) or type(exc).__name__)
+                backoff = self._backoff(attempt)
+                if deadline is not None and not deadline.allows(backoff):
+                    self.breaker.release_probe()
+                    return self._out_of_time(node, fallback, deadline)
+                LLM_RETRIES.inc(provider=self.provider, node=node)
+                time.sleep(backoff)
+                continue
+
+            self.breaker.record_success()
+            self._remember(prompt, response)
+            LLM_CALLS.inc(provider=self.provider, node=node, outcome="success")
+            return response
+
+        return self._degraded(prompt, node, fallback, "retries exhausted")
+
+    def _call(self, prompt: Any, node: str, deadline: Optional[Deadline] = None) -> Any:
+        """Run a single attempt under the semaphore, rate limit and deadline."""
+        budget = deadline.remaining() if deadline is not None else self.queue_timeout
+        wait_started = time.monotonic()
+        if not self._semaphore.acquire(timeout=min(self.queue_timeout, budget)):
+            self._check_deadline(deadline, node)
+            raise TimeoutError("timed out waiting for an LLM concurrency slot")
+        try:
+            remaining = min(self.queue_timeout, budget) - (time.monotonic() - wait_started)
+            if not self._bucket.acquire(timeout=max(0.0, remaining)):
+                self._check_deadline(deadline, node)
+                raise TimeoutError("timed out waiting for the LLM rate limiter")
+            QUEUE_WAIT.observe(time.monotonic() - wait_started, provider=self.provider)
+
+            timeout = self.call_timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline.remaining())
+            started = time.monotonic()
+            primary = self._submit(self.model, prompt, node)
+            hedge_delay = self._hedge_delay(node, timeout)
+            try:
+                if hedge_delay is None:
+                    try:
+                        response = self._result(primary, timeout, deadline)
+                    except FutureTimeoutError:
+                        primary.cancel()
+                        raise TimeoutError(f"LLM call exceeded {timeout:.1f}s deadline")
+                else:
+                    response = self._hedged(prompt, node, primary, started, hedge_delay, timeout)
+            except TimeoutError:
+                self._check_deadline(deadline, node)
+                raise
+            elapsed = time.monotonic() - started
+            LLM_LATENCY.observe(elapsed, provider=self.provider, node=node)
+            _annotate(response, elapsed)
+            return response
+        finally:
+            self._semaphore.release()
+
+    def _submit(self, model: Any, prompt: Any, node: str) -> Future:
+        """Start a provider call and feed its latency into the node's window."""
+        started = time.monotonic()
+        future = self._executor.submit(model.invoke, prompt)
+
+        def record(done: Future) -> None:
+            if _is_valid_response(done):
+                self.latencies.record(node, time.monotonic() - started)
+
+        future.add_done_callback(record)
+        return future
+
+    @staticmethod
+    def _result(future: Future, timeout: float, deadline: Optional[Deadline]) -> Any:
+        """Wait for a call, giving up early if the request is cancelled meanwhile."""
+        if deadline is None:
+            return future.result(timeout=timeout)
+        ends = time.monotonic() + timeout
+        while True:
+            try:
+                return future.result(timeout=max(0.0, min(ends - time.monotonic(), CANCEL_POLL_SECONDS)))
+            except FutureTimeoutError:
+                if deadline.cancelled or time.monotonic() >= ends:
+                    raise
+
+    def _check_deadline(self, deadline: Optional[Deadline], node: str) -> None:
+        """Turn a timeout caused by the request's own budget into RequestDeadlineExceeded."""
+        if deadline is not None and deadline.expired():
+            deadline.check(f"LLM call ({node})")
+
+    def _hedge_delay(self, node: str, timeout: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before hedging, or None when hedging is off for this node."""
+        if self.hedge_percentile is None or self.latencies.count(node) < self.hedge_min_samples:
+            return None
+        delay = self.latencies.percentile(node, self.hedge_percentile)
+        return min(delay, timeout or self.call_timeout) if delay is not None else None
+
+    def _hedged(
+        self,
+        prompt: Any,
+        node: str,
+        primary: Future,
+        started: float,
+        delay: float,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Wait `delay` for the primary call, then race a duplicate against it."""
+        timeout = self.call_timeout if timeout is None else timeout
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        futures = [primary]
+        hedge = self._start_hedge(prompt, node)
+        if hedge is not None:
+            futures.append(hedge)
+
+        pending = set(futures)
+        winner = None
+        while pending and winner is None:
+            remaining = timeout - (time.monotonic() - started)
+            done, pending = wait(pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            winner = next((f for f in done if _is_valid_response(f)), None)
+
+        if winner is None:
+            for future in futures:
+                future.cancel()
+            failed = next((f for f in futures if f.done() and not f.cancelled() and f.exception()), None)
+            if failed is not None:
+                raise failed.exception()
+            raise TimeoutError(f"LLM call exceeded {timeout:.1f}s deadline")
+
+        if winner is hedge:
+            LLM_HEDGE_WINS.inc(provider=self.provider, node=node)
+        for loser in futures:
+            if loser is not winner:
+                loser.cancel()
+                loser.add_done_callback(lambda f: self._count_waste(f, node))
+        return winner.result()
+
+    def _start_hedge(self, prompt: Any, node: str) -> Optional[Future]:
+        """Send the duplicate request if there is spare concurrency and rate budget."""
+        if not self._semaphore.acquire(blocking=False):
+            return None
+        if not self._bucket.acquire(timeout=0):
+            self._semaphore.release()
+            return None
+        LLM_HEDGES.inc(provider=self.provider, node=node)
+        hedge = self._submit(self.hedge_model or self.model, prompt, node)
+        hedge.add_done_callback(lambda _: self._semaphore.release())
+        return hedge
+
+    def _count_waste(self, future: Future, node: str) -> None:
+        if not future.cancelled() and future.exception() is None:
+            LLM_HEDGE_WASTED_TOKENS.inc(_total_tokens(future.result()), provider=self.provider, node=node)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _cache_key(self, prompt: Any) -> str:
+        return prompt if isinstance(prompt, str) else repr(prompt)
+
+    def _remember(self, prompt: Any, response: Any) -> None:
+        content = getattr(response, "content", None)
+        if not isinstance(content, str) or self.cache is None:
+            return
+        self.cache.set(self._cache_key(prompt), content)
+
+    def _out_of_time(
+        self,
+        node: str,
+        fallback: Optional[Callable[[], str]],
+        deadline: Deadline,
+    ) -> AIMessage:
+        """Answer from the fast path once the request's budget is spent, else give up."""
+        LLM_CALLS.inc(provider=self.provider, node=node, outcome="deadline")
+        if fallback is not None:
+            print(f"\n REQUEST OUT OF TIME - using deterministic fast path for {node}")
+            return AIMessage(content=fallback())
+        deadline.check(f"LLM call ({node})")
+        raise RequestDeadlineExceeded(f"LLM call ({node}): not enough time left to retry")
+
+    def _degraded(
+        self,
+        prompt: Any,
+        node: str,
+        fallback: Optional[Callable[[], str]],
+        reason: str,
+    ) -> AIMessage:
+        """Answer from the deterministic fast path, else the cache, else give up."""
+        if fallback is not None:
+            print(f"\n LLM UNAVAILABLE ({reason}) - using deterministic fast path for {node}")
+            LLM_CALLS.inc(provider=self.provider, node=node, outcome="fallback")
+            return AIMessage(content=fallback())
+
+        cached = self.cache.get(self._cache_key(prompt)) if self.cache is not None else None
+        if cached is not None:
+            print(f"\n LLM UNAVAILABLE ({reason}) - serving cached answer for {node}")
+            LLM_CALLS.inc(provider=self.provider, node=node, outcome="cached")
+            return AIMessage(content=cached)
+
+        LLM_CALLS.inc(provider=self.provider, node=node, outcome="unavailable")
+        raise LLMUnavailableError(
+            f"LLM provider '{self.provider}' is unavailable: {reason}",
+            retry_after=self.breaker.retry_after() or self.backoff_max,
+        )
@@ -1,35 +1,45 @@
 """
 LLM service for managing language model interactions.
-Supports Google Gemini (primary), OpenAI, and Azure OpenAI.
+Supports Google Gemini (primary), OpenAI, Azure OpenAI and a fake
+provider for local development and benchmarks.
 """
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI, AzureChatOpenAI
 from app.config import settings
+from app.services.cache import namespace_cache
+from app.services.llm_client import ResilientLLM, CircuitBreaker
+from app.services.fake_llm import FakeChatModel
+from typing import Optional
 import os
 
 
-def get_llm():
+def get_llm(provider: Optional[str] = None):
     """
     Get LLM instance based on configuration.
     Returns the same LLM type as used in the notebook (ChatGoogleGenerativeAI).
     """
-    provider = settings.LLM_PROVIDER.lower()
+    provider = (provider or settings.LLM_PROVIDER).lower()
     
     if provider == "google":
         # Set API key in environment (required by langchain-google-genai)
         os.environ["GOOGLE_API_KEY"] = settings.GOOGLE_API_KEY
         
         # Return exact same configuration as notebook
+        # Retries and deadlines are handled by ResilientLLM
         return ChatGoogleGenerativeAI(
             model=settings.LLM_MODEL,
-            temperature=settings.LLM_TEMPERATURE
+            temperature=settings.LLM_TEMPERATURE,
+            max_retries=0,
+            timeout=settings.LLM_CALL_TIMEOUT
         )
     
     elif provider == "openai":
         return ChatOpenAI(
             model=settings.LLM_MODEL,
             temperature=settings.LLM_TEMPERATURE,
-            api_key=settings.OPENAI_API_KEY
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,
+            timeout=settings.LLM_CALL_TIMEOUT
         )
     
     elif provider == "azure":
@@ -37,12 +47,50 @@ def get_llm():
             azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
             api_key=settings.AZURE_OPENAI_KEY,
             api_version="2024-02-01",
-            temperature=settings.LLM_TEMPERATURE
+            temperature=settings.LLM_TEMPERATURE,
+            max_retries=0,
+            timeout=settings.LLM_CALL_TIMEOUT
         )
     
+    elif provider == "fake":
+        return FakeChatModel()
+    
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
+def get_resilient_llm() -> ResilientLLM:
+    """
+    Wrap the configured LLM with concurrency limiting, rate limiting,
+    retries, deadlines, optional hedging and a circuit breaker. Last good
+    answers go to the shared cache backend ("llm" namespace).
+    """
+    provider = settings.LLM_PROVIDER.lower()
+    hedge_provider = settings.LLM_HEDGE_PROVIDER.lower()
+    return ResilientLLM(
+        get_llm(),
+        provider=provider,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        rate_per_second=settings.LLM_RATE_LIMIT_PER_SECOND,
+        burst=settings.LLM_RATE_LIMIT_BURST,
+        max_retries=settings.LLM_MAX_RETRIES,
+        backoff_base=settings.LLM_RETRY_BACKOFF_BASE,
+        backoff_max=settings.LLM_RETRY_BACKOFF_MAX,
+        call_timeout=settings.LLM_CALL_TIMEOUT,
+        queue_timeout=settings.LLM_QUEUE_TIMEOUT,
+        breaker=CircuitBreaker(
+            provider,
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.LLM_BREAKER_RECOVERY_SECONDS
+        ),
+        cache_size=settings.LLM_CACHE_SIZE,
+        cache=namespace_cache("llm") if settings.LLM_CACHE_SIZE > 0 else None,
+        hedge_percentile=settings.LLM_HEDGE_PERCENTILE if settings.LLM_HEDGING_ENABLED else None,
+        hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+        hedge_model=get_llm(hedge_provider) if hedge_provider and hedge_provider != provider else None,
+        latency_window=settings.LLM_LATENCY_WINDOW
+    )
+
+
 # Global LLM instance (same pattern as notebook)
-llm = get_llm()
+llm = get_resilient_llm()
@@ -0,0 +1,95 @@
+"""
+Deferred validation narratives.
+In two-phase mode /validate answers with deterministic verdicts at once and
+the LLM-written reasoning and per-field comments are produced here, on a
+small worker pool. Results are kept by validation ID (bounded, oldest
+first out) so clients can poll for them or wait on a stream.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.config import settings
+from app.utils.metrics import registry
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+
+NARRATIVES = registry.counter(
+    "narratives_total", "Deferred narratives by outcome", ["outcome"]
+)
+NARRATIVE_SECONDS = registry.histogram(
+    "narrative_duration_seconds", "Time from scheduling to a finished narrative"
+)
+
+
+class NarrativeStore:
+    """Pending and finished narratives by validation ID."""
+
+    def __init__(self, workers: int = 2, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="narrative")
+        self._entries: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, validation_id: str, fn: Callable[[], Dict[str, Any]]) -> Future:
+        """Generate a narrative in the background; `fn` returns {"reasoning", "comments"}."""
+        scheduled = time.monotonic()
+
+        def run() -> Dict[str, Any]:
+            try:
+                narrative = fn()
+            except Exception as exc:
+                NARRATIVES.inc(outcome="failed")
+                print(f"\n NARRATIVE FAILED ({validation_id}): {type(exc).__name__}: {exc}")
+                raise
+            NARRATIVES.inc(outcome="ready")
+            NARRATIVE_SECONDS.observe(time.monotonic() - scheduled)
+            return narrative
+
+        future = self._executor.submit(run)
+        with self._lock:
+            self._entries[validation_id] = future
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return future
+
+    @staticmethod
+    def _view(validation_id: str, future: Future) -> Dict[str, Any]:
+        if not future.done():
+            return {"validation_id": validation_id, "status": "pending"}
+        if future.exception() is not None:
+            return {"validation_id": validation_id, "status": "failed", "error": str(future.exception())}
+        return {"validation_id": validation_id, "status": "ready", **future.result()}
+
+    def get(self, validation_id: str) -> Optional[Dict[str, Any]]:
+        """Current status (and narrative once ready), or None for unknown IDs."""
+        with self._lock:
+            future = self._entries.get(validation_id)
+        return None if future is None else self._view(validation_id, future)
+
+    async def wait(self, validation_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Like get, but waits up to `timeout` seconds for a pending narrative."""
+        with self._lock:
+            future = self._entries.get(validation_id)
+        if future is None:
+            return None
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            pass
+        except Exception:
+            pass  # reported as failed by _view
+        return self._view(validation_id, future)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global narrative store for this worker
+narratives = NarrativeStore(
+    workers=settings.NARRATIVE_WORKERS,
+    max_entries=settings.NARRATIVE_STORE_SIZE
+)
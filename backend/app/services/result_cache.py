@@ -0,0 +1,95 @@
+"""
+Cache of final validation states.
+Entries live in the shared cache backend ("results" namespace), so with a
+sqlite or resp backend every worker sees them. Invalidation is by design
+generation: a counter per design, bumped on every change, is stored with
+each entry, and entries written under an older generation are misses. The
+design's latest entry stays readable as the "previous" result so
+re-validation can reuse its verdicts.
+"""
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+from app.services.cache import Cache, namespace_cache
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from app.utils.metrics import registry
+
+
+CACHE_LOOKUPS = registry.counter(
+    "validation_result_cache_lookups_total", "Result cache lookups by outcome", ["outcome"]
+)
+
+
+def attributes_cache_key(attributes: Dict[str, Any]) -> Tuple:
+    """
+    Key of a result by its (normalized) attribute values, shared by every
+    input that describes the same design however it was phrased.
+    """
+    return ("attributes",) + tuple(attributes.get(attr) for attr in REQUIRED_ATTRIBUTES)
+
+
+class ResultCache:
+    """Validation results keyed by request key, invalidated per design."""
+
+    def __init__(self, cache: Cache, generations: Cache):
+        self.cache = cache
+        # Never evicted: a lost counter would make stale entries look fresh
+        self.generations = generations
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a private copy of a fresh entry, or None."""
+        entry = self.cache.get(("entry", key))
+        if entry is None or (entry["design_id"] and entry["generation"] != self.generation(entry["design_id"])):
+            CACHE_LOOKUPS.inc(outcome="miss")
+            return None
+        CACHE_LOOKUPS.inc(outcome="hit")
+        return entry["state"]
+
+    def generation(self, design_id: Optional[str]) -> int:
+        """Counter bumped on every invalidation of `design_id`."""
+        return self.generations.counter(design_id) if design_id else 0
+
+    def set(
+        self,
+        key: Hashable,
+        state: Dict[str, Any],
+        design_id: Optional[str] = None,
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        Store a result. When `generation` is given and the design was
+        invalidated since, the (now stale) result is dropped.
+        """
+        current = self.generation(design_id)
+        if generation is not None and current != generation:
+            return False
+        if not self.cache.set(("entry", key), {"design_id": design_id, "generation": current, "state": state}):
+            return False
+        if design_id:
+            self.cache.set(("latest", design_id), key)
+        return True
+
+    def invalidate_design(self, design_id: str) -> int:
+        """Make every entry for `design_id` stale; its latest stays available as previous."""
+        return self.invalidate_designs([design_id])
+
+    def invalidate_designs(self, design_ids: Iterable[str]) -> int:
+        """Batch invalidation (bulk imports): one counter increment per design."""
+        targets = set(design_ids)
+        for design_id in targets:
+            self.generations.incr(design_id)
+        return len(targets)
+
+    def previous_for_design(self, design_id: str) -> Optional[Dict[str, Any]]:
+        """Last result stored for a design (verdicts to re-validate incrementally)."""
+        key = self.cache.get(("latest", design_id))
+        if key is None:
+            return None
+        entry = self.cache.get(("entry", key))  # msgpack keys: the list equals the original tuple
+        return entry["state"] if entry is not None else None
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.generations.clear()
+
+
+# Global result cache instance
+result_cache = ResultCache(namespace_cache("results"), namespace_cache("generations"))
@@ -0,0 +1,152 @@
+"""
+Background re-validation of changed designs.
+Design updates and imports enqueue design IDs; a worker thread waits for
+edits to settle (debounce), coalesces repeated edits of the same design
+and refreshes the cached and stored verdicts.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.services.admission import AdmissionRejected
+from app.services.validation_service import ValidationService
+from app.utils.metrics import registry
+import threading
+import time
+
+
+QUEUE_DEPTH = registry.gauge(
+    "revalidation_queue_depth", "Designs waiting for background re-validation"
+)
+REVALIDATIONS = registry.counter(
+    "revalidations_total", "Background re-validations by outcome", ["outcome"]
+)
+COALESCED_EDITS = registry.counter(
+    "revalidation_coalesced_edits_total", "Edits folded into an already queued re-validation"
+)
+
+
+class RevalidationWorker:
+    """
+    Debounced queue of design IDs processed by a single daemon thread.
+
+    Each enqueue pushes the design's due time `debounce_seconds` out, but
+    never later than `max_delay_seconds` after its first pending edit.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        debounce_seconds: float = 2.0,
+        max_delay_seconds: float = 30.0
+    ):
+        self.session_factory = session_factory
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._pending: Dict[str, Tuple[float, float]] = {}  # id -> (due, first enqueued)
+        self._active = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def enqueue(self, design_id: str) -> None:
+        """Schedule (or postpone) re-validation of a design."""
+        now = time.monotonic()
+        with self._cond:
+            first = now
+            if design_id in self._pending:
+                first = self._pending[design_id][1]
+                COALESCED_EDITS.inc()
+            due = min(now + self.debounce_seconds, first + self.max_delay_seconds)
+            self._pending[design_id] = (due, first)
+            QUEUE_DEPTH.set(len(self._pending))
+            self._cond.notify()
+
+    def enqueue_many(self, design_ids: Iterable[str]) -> None:
+        for design_id in design_ids:
+            self.enqueue(design_id)
+
+    def pending(self) -> List[str]:
+        with self._cond:
+            return list(self._pending)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="revalidation-worker", daemon=True)
+        self._thread.start()
+        print("\n REVALIDATION WORKER STARTED")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """Block until the queue is empty and nothing is running (used by tests/tools)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._active:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def _take_due(self) -> Optional[List[str]]:
+        """Wait for due design IDs; None once stopping."""
+        with self._cond:
+            while not self._stopping:
+                now = time.monotonic()
+                due = [design_id for design_id, (at, _) in self._pending.items() if at <= now]
+                if due:
+                    for design_id in due:
+                        del self._pending[design_id]
+                    self._active = len(due)
+                    QUEUE_DEPTH.set(len(self._pending))
+                    return due
+                timeout = min(at for at, _ in self._pending.values()) - now if self._pending else None
+                self._cond.wait(timeout)
+            return None
+
+    def _run(self) -> None:
+        while True:
+            due = self._take_due()
+            if due is None:
+                return
+            for design_id in due:
+                self._revalidate(design_id)
+                with self._cond:
+                    self._active -= 1
+                    self._cond.notify_all()
+
+    def _revalidate(self, design_id: str) -> None:
+        db = self.session_factory()
+        try:
+            started = time.monotonic()
+            result = ValidationService(db).refresh_design(design_id)
+            outcome = "success" if result.get("validation") else "failed"
+            print(f"\n BACKGROUND RE-VALIDATION {design_id}: {outcome} in {time.monotonic() - started:.2f}s")
+            REVALIDATIONS.inc(outcome=outcome)
+        except AdmissionRejected:
+            # Interactive traffic has priority; try again after the debounce
+            print(f"\n BACKGROUND RE-VALIDATION {design_id} SHED - requeued")
+            REVALIDATIONS.inc(outcome="shed")
+            self.enqueue(design_id)
+        except Exception as e:
+            print(f"\n BACKGROUND RE-VALIDATION {design_id} ERROR: {e}")
+            REVALIDATIONS.inc(outcome="error")
+        finally:
+            db.close()
+
+
+# Global worker instance (started by the application lifespan)
+revalidation_worker = RevalidationWorker(
+    SessionLocal,
+    debounce_seconds=settings.REVALIDATION_DEBOUNCE_SECONDS,
+    max_delay_seconds=settings.REVALIDATION_MAX_DELAY_SECONDS
+)
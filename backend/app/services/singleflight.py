@@ -0,0 +1,142 @@
+"""
+Single-flight request coalescing.
+Concurrent callers with the same key share one execution and its result,
+whether they arrive on the sync path (threads) or the async path.
+"""
+from concurrent.futures import Future
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Callable, ContextManager, Dict, Hashable, Optional, Tuple
+from app.utils.metrics import registry
+import asyncio
+import threading
+
+
+COALESCED = registry.counter(
+    "singleflight_coalesced_total", "Calls that joined an identical in-flight execution", ["group"]
+)
+EXECUTIONS = registry.counter(
+    "singleflight_executions_total", "Calls that led an execution", ["group"]
+)
+INFLIGHT = registry.gauge(
+    "singleflight_inflight_keys", "Distinct keys currently executing", ["group"]
+)
+
+
+class SingleFlight:
+    """Group of in-flight executions keyed by a canonical request key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._waiting: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Return the shared future for `key` and whether the caller leads it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                COALESCED.inc(group=self.name)
+                self._waiting[key] = self._waiting.get(key, 0) + 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            EXECUTIONS.inc(group=self.name)
+            INFLIGHT.set(len(self._calls), group=self.name)
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> Any:
+        # The future may already be failed by _abandon (async leader cancelled
+        # while fn kept running in its thread); a newer leader may own the key
+        try:
+            result = fn()
+        except BaseException as exc:
+            if not future.done():
+                future.set_exception(exc)
+            raise
+        else:
+            if not future.done():
+                future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+                INFLIGHT.set(len(self._calls), group=self.name)
+
+    def _abandon(self, key: Hashable, future: Future, exc: BaseException) -> None:
+        """The leader failed before running (e.g. shed by admission) or was cancelled: fail its followers too."""
+        if not future.done():
+            future.set_exception(exc)
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            INFLIGHT.set(len(self._calls), group=self.name)
+
+    def _leave(self, key: Hashable) -> None:
+        with self._lock:
+            self._waiting[key] -= 1
+            if not self._waiting[key]:
+                del self._waiting[key]
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+        admit: Optional[Callable[[], ContextManager]] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run `fn` unless an identical call is in flight, blocking the thread.
+        Callers joining an execution wait at most `timeout` seconds
+        (concurrent.futures.TimeoutError); the execution itself goes on.
+        Only the leader enters `admit()` (e.g. an admission slot) around `fn`;
+        the key is registered first, so callers arriving while the leader
+        is still queued join it instead of queueing themselves.
+
+        Returns:
+            (result, shared) where shared is True for callers that joined
+            another caller's execution
+        """
+        future, leader = self._join(key)
+        if leader:
+            try:
+                with admit() if admit is not None else nullcontext():
+                    return self._run(key, future, fn), False
+            except BaseException as exc:
+                self._abandon(key, future, exc)
+                raise
+        try:
+            return future.result(timeout=timeout), True
+        finally:
+            self._leave(key)
+
+    async def ado(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+        admit: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> Tuple[Any, bool]:
+        """Async variant: the leader waits for `admit()` on the loop, then runs blocking `fn` in a worker thread."""
+        future, leader = self._join(key)
+        if leader:
+            try:
+                async with admit() if admit is not None else nullcontext():
+                    return await asyncio.to_thread(self._run, key, future, fn), False
+            except BaseException as exc:
+                self._abandon(key, future, exc)
+                raise
+        try:
+            # Shielded: a follower giving up must not cancel the shared execution
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout), True
+        finally:
+            self._leave(key)
+
+    def inflight(self) -> int:
+        return len(self._calls)
+
+    def waiting(self, key: Hashable) -> int:
+        """Callers currently waiting on another caller's execution of `key`."""
+        with self._lock:
+            return self._waiting.get(key, 0)
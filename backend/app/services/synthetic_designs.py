@@ -0,0 +1,230 @@
+"""
+Synthetic cable designs for scale testing.
+Generates realistic design rows at any scale, seeded and reproducible:
+- copper and aluminium conductors at every IEC 60502-1 voltage class,
+  weighted towards 0.6/1 kV
+- nominal IEC 60228 sizes, plus a share of non-nominal ones (csa FAIL)
+- insulation thicknesses drawn around the tolerance boundaries of
+  iec_rules (below 85% FAIL, 85-100% borderline WARN, 100-110% PASS,
+  above 110% over-designed WARN)
+- a configurable share of missing attributes
+and renders each design as free text in several phrasing styles that
+parse_specification reads back to the same attributes. Rows are in the
+canonical (normalized) form and go straight into the designs table with
+load_designs, or into CSV/NDJSON files with generate_designs.py.
+"""
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.services.design_import import upsert_designs
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from app.utils.iec_rules import THICKNESS_FAIL_BELOW, THICKNESS_WARN_ABOVE
+from app.utils.iec_tables import INSULATION_THICKNESS_0_6_1_KV, STRANDED_FROM_CSA
+import random
+
+# Rated voltages (U0, U) in kV and how often they occur
+VOLTAGES = [
+    ((0.6, 1.0), 70), ((1.8, 3.0), 5), ((3.6, 6.0), 5), ((6.0, 10.0), 6),
+    ((8.7, 15.0), 4), ((12.0, 20.0), 6), ((18.0, 30.0), 4),
+]
+# Ratings outside IEC 60502-1 (voltage FAIL)
+INVALID_VOLTAGES = [(0.3, 0.5), (0.45, 0.75), (26.0, 45.0)]
+# Typical XLPE/EPR thickness (mm) above 0.6/1 kV; not tabulated by the checks, so always WARN
+MEDIUM_VOLTAGE_THICKNESS = {
+    (1.8, 3.0): 2.0, (3.6, 6.0): 2.5, (6.0, 10.0): 3.4, (8.7, 15.0): 4.5, (12.0, 20.0): 5.5, (18.0, 30.0): 8.0,
+}
+LOW_VOLTAGE_CSA = sorted(INSULATION_THICKNESS_0_6_1_KV["PVC"])
+MEDIUM_VOLTAGE_CSA = [25, 35, 50, 70, 95, 120, 150, 185, 240, 300, 400, 500, 630]
+# Sizes that look plausible but are not nominal IEC 60228 values (csa FAIL)
+INVALID_CSA = [3, 5, 7, 8, 12, 14, 20, 30, 45, 60, 100, 200]
+# Thickness as a fraction of nominal: (weight, low, high); half the draws land near a boundary
+THICKNESS_BANDS = [
+    (15, 1.0, 1.0),
+    (25, 1.0, THICKNESS_WARN_ABOVE),
+    (15, THICKNESS_FAIL_BELOW, 1.0),
+    (10, 0.6, THICKNESS_FAIL_BELOW),
+    (10, THICKNESS_WARN_ABOVE, 1.5),
+    (25, THICKNESS_FAIL_BELOW - 0.02, THICKNESS_FAIL_BELOW + 0.02),
+    (10, THICKNESS_WARN_ABOVE - 0.02, THICKNESS_WARN_ABOVE + 0.02),
+]
+SUPPLIERS = ["Nordkabel", "Cavi Sud", "Iberflex", "Baltic Wire", "Danube Cables", "Atlas Conductors"]
+
+
+def _kv(rating) -> str:
+    return f"{rating[0]:g}/{rating[1]:g} kV"
+
+
+def synthetic_designs(
+    count: int,
+    seed: int = 7,
+    missing_rate: float = 0.0,
+    invalid_rate: float = 0.05,
+    id_prefix: str = "SYN-"
+) -> Iterator[Dict[str, Any]]:
+    """
+    `count` design rows (DESIGN_COLUMNS keys). Each required attribute is
+    None with probability `missing_rate`; `invalid_rate` of the designs get
+    a non-nominal CSA or, for one in four of those, a non-IEC voltage.
+    """
+    rng = random.Random(seed)
+    ratings, rating_weights = zip(*VOLTAGES)
+    band_weights = [band[0] for band in THICKNESS_BANDS]
+    for i in range(count):
+        rating = rng.choices(ratings, rating_weights)[0]
+        low_voltage = rating == (0.6, 1.0)
+        insulation = rng.choice(["PVC", "XLPE", "EPR"] if low_voltage else ["XLPE", "XLPE", "EPR"])
+        csa = rng.choice(LOW_VOLTAGE_CSA if low_voltage else MEDIUM_VOLTAGE_CSA)
+        if low_voltage:
+            nominal = INSULATION_THICKNESS_0_6_1_KV[insulation][csa]
+        else:
+            nominal = MEDIUM_VOLTAGE_THICKNESS[rating]
+        _, low, high = rng.choices(THICKNESS_BANDS, band_weights)[0]
+        thickness = round(nominal * rng.uniform(low, high), 2)
+        if rng.random() < invalid_rate:
+            if rng.random() < 0.25:
+                rating = rng.choice(INVALID_VOLTAGES)
+            else:
+                csa = rng.choice(INVALID_CSA)
+        design = {
+            "id": f"{id_prefix}{i:07d}",
+            "standard": "IEC 60228" if rng.random() < 0.05 else "IEC 60502-1",
+            "voltage": _kv(rating),
+            "conductor_material": "Cu" if rng.random() < 0.65 else "Al",
+            "conductor_class": "Class 2" if csa >= STRANDED_FROM_CSA or rng.random() < 0.5 else "Class 1",
+            "csa": float(csa),
+            "insulation_material": insulation,
+            "insulation_thickness": thickness,
+            "supplier": rng.choice(SUPPLIERS),
+        }
+        if missing_rate:
+            for field in REQUIRED_ATTRIBUTES:
+                if rng.random() < missing_rate:
+                    design[field] = None
+        yield design
+
+
+# Phrasings of each attribute; every one normalizes back to the canonical value
+MATERIALS = {"Cu": ["Cu", "copper", "Copper", "COPPER"], "Al": ["Al", "aluminium", "aluminum", "Aluminium"]}
+CLASSES = {"Class 1": ["Class 1", "class 1", "cl. 1", "solid"], "Class 2": ["Class 2", "class 2", "cl. 2", "stranded"]}
+
+
+def _standard(value: str, rng: random.Random) -> str:
+    number = value.split()[1]
+    return rng.choice([value, f"IEC{number}", f"iec {number}"])
+
+
+def _voltage(value: str, rng: random.Random) -> str:
+    u0, u = (float(part) for part in value[:-3].split("/"))
+    return rng.choice([value, value.replace(" kV", "kV"), f"{u0:g} / {u:g} kV", f"{u0 * 1000:g}/{u * 1000:g} V"])
+
+
+def _csa(value: float, rng: random.Random) -> str:
+    return rng.choice([f"{value:g} mm²", f"{value:g}mm2", f"{value:g} sqmm", f"{value:g} sq mm", f"{value:g} mm^2"])
+
+
+def _thickness(value: float, rng: random.Random) -> str:
+    return rng.choice([f"{value:g} mm", f"{value:g}mm", f"{value:.2f} mm"])
+
+
+def _phrases(design: Dict[str, Any], rng: random.Random) -> Dict[str, str]:
+    """Each present attribute in a random phrasing."""
+    render = {
+        "standard": _standard,
+        "voltage": _voltage,
+        "conductor_material": lambda value, rng: rng.choice(MATERIALS[value]),
+        "conductor_class": lambda value, rng: rng.choice(CLASSES[value]),
+        "csa": _csa,
+        "insulation_material": lambda value, rng: rng.choice([value, value.lower()]),
+        "insulation_thickness": _thickness,
+    }
+    return {
+        field: render[field](design[field], rng)
+        for field in REQUIRED_ATTRIBUTES if design.get(field) is not None
+    }
+
+
+def _compact(p: Dict[str, str], rng: random.Random) -> str:
+    parts = [p.get("standard"), p.get("voltage"),
+             " ".join(filter(None, [p.get("conductor_material"), p.get("conductor_class")])),
+             p.get("csa"), " ".join(filter(None, [p.get("insulation_material"), p.get("insulation_thickness")]))]
+    parts = [part for part in parts if part]
+    rng.shuffle(parts)
+    return rng.choice([", ", " ", "; "]).join(parts)
+
+
+def _prose(p: Dict[str, str], rng: random.Random) -> str:
+    conductor = " ".join(filter(None, [p.get("csa"), p.get("conductor_class"), p.get("conductor_material")]))
+    text = rng.choice(["Please check a", "I need a", "We are quoting a"])
+    text += f" {p['voltage']}" if "voltage" in p else ""
+    text += f" cable with a {conductor} conductor" if conductor else " cable"
+    if "insulation_material" in p or "insulation_thickness" in p:
+        insulation = " of ".join(filter(None, [p.get("insulation_thickness"), p.get("insulation_material")]))
+        text += f", insulated with {insulation}"
+    text += f", to {p['standard']}" if "standard" in p else ""
+    return text + "."
+
+
+def _key_value(p: Dict[str, str], rng: random.Random) -> str:
+    keys = {
+        "standard": "standard", "voltage": "voltage", "conductor_material": "conductor",
+        "conductor_class": "class", "csa": "csa", "insulation_material": "insulation",
+        "insulation_thickness": "thickness",
+    }
+    separator, joiner = rng.choice([("=", "; "), (": ", ", "), (": ", " | ")])
+    return joiner.join(f"{keys[field]}{separator}{phrase}" for field, phrase in p.items())
+
+
+def _catalogue(p: Dict[str, str], rng: random.Random) -> str:
+    head = " ".join(filter(None, [
+        f"1x{p['csa']}" if "csa" in p else None,
+        "/".join(filter(None, [p.get("conductor_material"), p.get("insulation_material")])),
+        p.get("voltage"), p.get("standard"),
+    ]))
+    tail = [p["conductor_class"]] if "conductor_class" in p else []
+    tail += [f"insulation {p['insulation_thickness']}"] if "insulation_thickness" in p else []
+    return ", ".join(filter(None, [head] + tail))
+
+
+def _question(p: Dict[str, str], rng: random.Random) -> str:
+    subject = " ".join(filter(None, [p.get("csa"), p.get("conductor_material"), p.get("conductor_class"), "conductor"]))
+    insulation = " ".join(filter(None, [p.get("insulation_thickness"), p.get("insulation_material")]))
+    text = f"Is a {subject}" + (f" with {insulation} insulation" if insulation else "")
+    text += f" OK for {p['voltage']}" if "voltage" in p else " OK"
+    text += f" under {p['standard']}" if "standard" in p else ""
+    return text + "?"
+
+
+RENDER_STYLES: Dict[str, Callable[[Dict[str, str], random.Random], str]] = {
+    "compact": _compact,
+    "prose": _prose,
+    "key_value": _key_value,
+    "catalogue": _catalogue,
+    "question": _question,
+}
+
+
+def render_text(design: Dict[str, Any], rng: random.Random, style: Optional[str] = None) -> str:
+    """One way a user might type the design (missing attributes are left out)."""
+    style = style or rng.choice(list(RENDER_STYLES))
+    return RENDER_STYLES[style](_phrases(design, rng), rng)
+
+
+def synthetic_requests(designs: List[Dict[str, Any]], count: int, seed: int = 11) -> List[str]:
+    """
+    A request log of `count` free-text inputs over `designs`, skewed towards
+    popular designs (Zipf-like) and phrased at random.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(designs))]
+    return [render_text(design, rng) for design in rng.choices(designs, weights, k=count)]
+
+
+def load_designs(db: Session, count: int, batch_size: Optional[int] = None, **options) -> int:
+    """Generate `count` designs (see synthetic_designs) and upsert them in batches; returns rows written."""
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    designs = synthetic_designs(count, **options)
+    written = 0
+    while batch := list(islice(designs, batch_size)):
+        written += upsert_designs(db, batch)
+    return written
@@ -0,0 +1,141 @@
+"""
+LLM token and cost accounting.
+Nodes record the usage metadata of every provider response in the graph
+state (`llm_usage`); the service turns it into metrics per route, node and
+model once the request has run, persists it with the validation and can
+return a summary to the caller. Costs come from LLM_PRICING (USD per
+million input/output tokens); models without a price count as free.
+"""
+from app.config import settings
+from app.models import LLMUsage, Validation
+from app.utils.metrics import registry
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional
+
+
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "LLM tokens used by requests", ["route", "node", "model", "kind"]
+)
+LLM_COST = registry.counter(
+    "llm_cost_usd_total", "Estimated LLM spend in USD", ["route", "node", "model"]
+)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """USD cost of one call from the configured per-million-token prices."""
+    price = settings.LLM_PRICING.get(model)
+    if not price:
+        return 0.0
+    input_price, output_price = (list(price) + [0.0, 0.0])[:2]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def record_usage(state: Any, node: str, response: Any) -> None:
+    """
+    Append a response's token usage to state["llm_usage"].
+    Only provider answers count: fallbacks and cached answers made no call.
+    """
+    metadata = getattr(response, "response_metadata", None) or {}
+    if "latency_seconds" not in metadata:
+        return
+    usage = getattr(response, "usage_metadata", None) or {}
+    model = str(metadata.get("model_name") or metadata.get("model") or settings.LLM_MODEL)
+    input_tokens = int(usage.get("input_tokens", 0) or 0)
+    output_tokens = int(usage.get("output_tokens", 0) or 0)
+    state["llm_usage"] = list(state.get("llm_usage") or []) + [{
+        "node": node,
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": int(usage.get("total_tokens", 0) or 0) or input_tokens + output_tokens,
+        "cost_usd": estimate_cost(model, input_tokens, output_tokens),
+        "latency_seconds": round(float(metadata["latency_seconds"]), 4)
+    }]
+
+
+def _add(totals: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    totals["calls"] = totals.get("calls", 0) + 1
+    for field in ("input_tokens", "output_tokens", "total_tokens"):
+        totals[field] = totals.get(field, 0) + entry.get(field, 0)
+    totals["cost_usd"] = round(totals.get("cost_usd", 0.0) + entry.get("cost_usd", 0.0), 8)
+
+
+def summarize_usage(entries: Optional[Iterable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Totals of a request's LLM calls, overall and by node and model."""
+    summary: Dict[str, Any] = {
+        "calls": 0, "input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cost_usd": 0.0,
+        "by_node": {}, "by_model": {}
+    }
+    for entry in entries or []:
+        _add(summary, entry)
+        _add(summary["by_node"].setdefault(entry["node"], {}), entry)
+        _add(summary["by_model"].setdefault(entry["model"], {}), entry)
+    return summary
+
+
+def usage_header(entries: Optional[List[Dict[str, Any]]]) -> str:
+    """Compact X-LLM-Usage header value: calls, tokens and cost."""
+    summary = summarize_usage(entries)
+    return (
+        f"calls={summary['calls']}; input={summary['input_tokens']}; "
+        f"output={summary['output_tokens']}; cost_usd={summary['cost_usd']:.6f}"
+    )
+
+
+def observe_usage(route: Optional[str], entries: Optional[Iterable[Dict[str, Any]]]) -> None:
+    """Feed a finished request's usage into the token and cost counters."""
+    route = route or "unknown"
+    for entry in entries or []:
+        labels = {"route": route, "node": entry["node"], "model": entry["model"]}
+        LLM_TOKENS.inc(entry.get("input_tokens", 0), kind="input", **labels)
+        LLM_TOKENS.inc(entry.get("output_tokens", 0), kind="output", **labels)
+        LLM_COST.inc(entry.get("cost_usd", 0.0), **labels)
+
+
+def usage_rows(entries: Optional[Iterable[Dict[str, Any]]]) -> List[LLMUsage]:
+    """LLMUsage rows for a validation's recorded calls."""
+    return [
+        LLMUsage(
+            node=entry["node"][:50],
+            model=entry["model"][:100],
+            input_tokens=entry.get("input_tokens", 0),
+            output_tokens=entry.get("output_tokens", 0),
+            cost_usd=entry.get("cost_usd", 0.0),
+            latency_seconds=entry.get("latency_seconds")
+        )
+        for entry in entries or []
+    ]
+
+
+def usage_report(db: Session, since: Optional[datetime] = None) -> Dict[str, Any]:
+    """Persisted usage summed overall and grouped by node, route and model."""
+    totals = (
+        func.count(LLMUsage.id),
+        func.coalesce(func.sum(LLMUsage.input_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.output_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.cost_usd), 0.0),
+    )
+
+    def query(*columns: Any) -> Any:
+        query = (
+            db.query(*columns, *totals)
+            .select_from(LLMUsage)
+            .join(Validation, LLMUsage.validation_id == Validation.id)
+        )
+        return query.filter(LLMUsage.created_at >= since) if since is not None else query
+
+    def row(calls: int, input_tokens: int, output_tokens: int, cost: float) -> Dict[str, Any]:
+        return {
+            "calls": int(calls),
+            "input_tokens": int(input_tokens),
+            "output_tokens": int(output_tokens),
+            "total_tokens": int(input_tokens) + int(output_tokens),
+            "cost_usd": round(float(cost), 8)
+        }
+
+    report: Dict[str, Any] = {"since": since, "totals": row(*query().one())}
+    for name, column in (("by_node", LLMUsage.node), ("by_route", Validation.route), ("by_model", LLMUsage.model)):
+        report[name] = {str(key or "unknown"): row(*values) for key, *values in query(column).group_by(column).all()}
+    return report
@@ -1,37 +1,115 @@
 """
 Validation service - Orchestrates the LangGraph workflow.
-This service executes the exact notebook logic without database persistence.
+Identical concurrent requests are coalesced into a single graph execution,
+final results are cached per design/input and persisted as Validation rows.
+HITL-mode results waiting for answers are saved as sessions (hitl_sessions.py)
+that follow-ups resume from on any worker.
+In two-phase mode the deterministic verdicts are returned at once and the
+LLM narrative is generated in the background (see narrative.py).
 """
-from app.langgraph.workflow import create_validation_graph
+from app.config import settings
+from app.services.admission import admission
+from app.services.deadline import Deadline, RequestDeadlineExceeded
+from app.services.singleflight import SingleFlight
+from app.services.result_cache import attributes_cache_key, result_cache
+from app.services.design_index import design_index, indexable
+from app.services.hitl_sessions import HITLSessionConflict, hitl_sessions
+from app.services.narrative import narratives
+from app.services.profiling import profiler
+from app.services.usage import observe_usage, usage_rows
+from app.models import Design, Validation, ValidationResult, HITLInteraction
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from uuid import UUID, uuid4
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from langchain_core.runnables import RunnableConfig
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from app.utils.iec_tables import infer_attributes
+import asyncio
+import concurrent.futures
+import copy
+import re
+
+
+# Shared across service instances so every request in the worker coalesces
+_validation_flights = SingleFlight("validation")
+
+
+def canonical_request_key(
+    user_input: str,
+    hitl_mode: bool,
+    hitl_responses: Optional[Dict[str, str]] = None,
+    accept_suggestions: bool = False,
+    deferred_narrative: bool = False
+) -> Tuple:
+    """
+    Canonical coalescing key: whitespace/case-normalized input plus mode.
+    HITL responses are part of the key so different answers never share a run.
+    """
+    normalized = " ".join(user_input.split()).casefold()
+    responses = tuple(sorted(
+        (field, " ".join(str(value).split()).casefold())
+        for field, value in (hitl_responses or {}).items()
+    ))
+    return (normalized, bool(hitl_mode), responses, bool(accept_suggestions), bool(deferred_narrative))
+
+
+# Inputs that do nothing but reference a stored design ("Validate DESIGN-001")
+DESIGN_REFERENCE_PATTERN = re.compile(
+    r'^\W*(?:(?:validate|check|verify|fetch|show)\s+)?(?:design\s+)?(DESIGN-\d+)\W*$',
+    re.IGNORECASE
+)
+
+
+def design_reference(user_input: str) -> Optional[str]:
+    """Design ID when the input is a plain design lookup, else None."""
+    match = DESIGN_REFERENCE_PATTERN.match(user_input.strip())
+    return match.group(1).upper() if match else None
+
+
+def result_cache_key(user_input: str) -> Tuple:
+    """
+    Result cache key. Plain design lookups share one entry per design so
+    background re-validation can refresh it; anything else is keyed by the
+    normalized text. hitl_mode only changes the response flags, not the verdicts.
+    """
+    design_id = design_reference(user_input)
+    if design_id:
+        return ("design", design_id)
+    return ("text", " ".join(user_input.split()).casefold())
+
+
+def _standard(state: Dict[str, Any]) -> Optional[str]:
+    standard = (state.get("attributes") or {}).get("standard")
+    return str(standard)[:100] if standard not in (None, "") else None
+
+
+def with_narrative(state: Dict[str, Any], narrative: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a two-phase result with the LLM reasoning and comments filled in."""
+    final_state = copy.deepcopy(state)
+    comments = narrative.get("comments") or {}
+    for item in final_state.get("validation") or []:
+        if comments.get(item.get("field")):
+            item["comment"] = comments[item["field"]]
+    final_state["reasoning"] = narrative.get("reasoning")
+    final_state["narrative_pending"] = False
+    return final_state
 
 
 class ValidationService:
     """Service for running cable design validation."""
-    
+
     def __init__(self, db: Session):
+        # Imported here: the graph nodes import app.services themselves
+        from app.langgraph.workflow import get_resume_graph, get_validation_graph
+
         self.db = db
-        self.graph = create_validation_graph()
-    
-    def run_validation(
-        self,
-        user_input: str,
-        hitl_mode: bool = False
-    ) -> Dict[str, Any]:
-        """
-        Run validation workflow (exact logic from notebook).
-        
-        Args:
-            user_input: Cable design specification or design ID
-            hitl_mode: Enable Human-in-the-Loop mode
-        
-        Returns:
-            Final state dictionary with validation results
-        """
-        # Create initial state (exact from notebook)
-        initial_state = {
+        self.graph = get_validation_graph()
+        self.resume_graph = get_resume_graph()
+
+    def _initial_state(self, user_input: str, hitl_mode: bool) -> Dict[str, Any]:
+        """Create initial state (exact from notebook)."""
+        return {
             "user_input": user_input,
             "route": None,
             "design_id": None,
@@ -47,67 +125,554 @@ class ValidationService:
             "hitl_retry_count": {},  # Track retry attempts per attribute
             "hitl_max_retries": 3  # Maximum retries before giving up
         }
-        
-        # Run the graph with increased recursion limit for HITL interactions
-        final_state = self.graph.invoke(
+
+    def _execute(
+        self,
+        initial_state: Dict[str, Any],
+        deadline: Optional[Deadline] = None,
+        graph: Any = None
+    ) -> Dict[str, Any]:
+        """Run the graph with increased recursion limit for HITL interactions."""
+        final_state = (graph or self.graph).invoke(
             initial_state,
-            config=RunnableConfig(recursion_limit=50)
+            config=RunnableConfig(recursion_limit=50, configurable={"db": self.db, "deadline": deadline})
         )
-        
+        observe_usage(final_state.get("route"), final_state.get("llm_usage"))
         return final_state
-    
-    def run_validation_with_responses(
+
+    def _validate_and_store(
+        self,
+        user_input: str,
+        hitl_mode: bool,
+        deadline: Optional[Deadline] = None,
+        deferred_narrative: bool = False
+    ) -> Dict[str, Any]:
+        """Execute the graph and publish the result to the cache and database."""
+        design_id = design_reference(user_input)
+        generation = result_cache.generation(design_id)
+        initial_state = self._initial_state(user_input, hitl_mode)
+        if deferred_narrative:
+            initial_state["deferred_narrative"] = True
+            initial_state["validation_id"] = str(uuid4())
+        final_state = self._execute(initial_state, deadline)
+        self._store(user_input, final_state, generation)
+        return final_state
+
+    def _store(self, user_input: str, final_state: Dict[str, Any], generation: Optional[int] = None) -> None:
+        """Cache a completed validation and persist its verdicts."""
+        if final_state.get("route") != "IGNORE" and not final_state.get("validation"):
+            return  # Failed validations are neither cached nor stored
+        if final_state.get("partial"):
+            return  # Cut short by the request deadline
+        if final_state.get("narrative_pending"):
+            self._defer_narrative(user_input, final_state, generation)
+            return
+        key = result_cache_key(user_input)
+        design_id = key[1] if key[0] == "design" else final_state.get("design_id")
+        result_cache.set(key, final_state, design_id=design_id, generation=generation)
+        if final_state.get("validation"):
+            if settings.NORMALIZATION_ENABLED:
+                result_cache.set(attributes_cache_key(final_state["attributes"]), final_state)
+            self._persist(final_state)
+        if indexable(final_state):
+            design_index.add(final_state["attributes"])
+
+    def _persist(self, final_state: Dict[str, Any]) -> Optional[Validation]:
+        """Store a Validation with its field results and HITL interactions."""
+        if self.db is None:
+            return None
+        try:
+            validation_id = final_state.get("validation_id")
+            record = Validation(
+                **({"id": UUID(validation_id)} if validation_id else {}),
+                user_input=final_state["user_input"],
+                route=final_state.get("route"),
+                design_id=final_state.get("design_id"),
+                standard=_standard(final_state),
+                confidence=final_state.get("confidence"),
+                reasoning=final_state.get("reasoning"),
+                hitl_mode=bool(final_state.get("hitl_mode", False))
+            )
+            for item in final_state.get("validation") or []:
+                expected = item.get("expected")
+                record.results.append(ValidationResult(
+                    field=str(item.get("field")),
+                    status=str(item.get("status")),
+                    expected=str(expected)[:200] if expected is not None else None,
+                    comment=item.get("comment")
+                ))
+            for interaction in final_state.get("conversation_history") or []:
+                parts = interaction.split(" | ")
+                if len(parts) == 2:
+                    record.hitl_interactions.append(HITLInteraction(
+                        field=parts[0].replace("Q: ", "").strip()[:50],
+                        user_response=parts[1].replace("A: ", "").strip()[:200]
+                    ))
+            record.llm_usage.extend(usage_rows(final_state.get("llm_usage")))
+            self.db.add(record)
+            self.db.commit()
+            final_state["validation_id"] = str(record.id)
+            return record
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            print(f"\n FAILED TO PERSIST VALIDATION: {e}")
+            return None
+
+    def _defer_narrative(self, user_input: str, final_state: Dict[str, Any], generation: Optional[int]) -> None:
+        """
+        Persist the deterministic verdicts now and generate the narrative in
+        the background. The result is cached only once the narrative is in,
+        so cache hits always carry the full answer.
+        """
+        persisted = self._persist(final_state) is not None
+        if indexable(final_state):
+            design_index.add(final_state["attributes"])
+        snapshot = copy.deepcopy(final_state)
+        narratives.submit(
+            final_state["validation_id"],
+            lambda: self._narrate(user_input, snapshot, generation, persisted)
+        )
+
+    def _narrate(
         self,
         user_input: str,
-        hitl_responses: Dict[str, str]
+        state: Dict[str, Any],
+        generation: Optional[int],
+        persisted: bool
     ) -> Dict[str, Any]:
         """
-        Re-run validation with HITL responses provided.
-        
-        Args:
-            user_input: Original user input
-            hitl_responses: Dictionary of user responses for missing attributes
-        
-        Returns:
-            Final state dictionary with validation results
+        Second phase: ask the LLM to explain the settled verdicts. The statuses
+        stay the deterministic ones; only reasoning and comments are added.
         """
-        # Create initial state with HITL responses pre-loaded
-        initial_state = {
-            "user_input": user_input,
-            "route": None,
-            "design_id": None,
-            "attributes": {},
-            "missing_attributes": [],
-            "validation": None,
-            "reasoning": None,
-            "confidence": None,
-            "conversation_history": [],
-            "skip_missing_prompts": False,  # Enable HITL workflow
-            "initial_validation_done": False,
-            "hitl_mode": True,
-            "hitl_responses": hitl_responses,  # Pre-load responses
-            "hitl_retry_count": {},
-            "hitl_max_retries": 3
+        from app.langgraph.nodes.validation import narrate_verdicts
+
+        draft = copy.deepcopy(state)
+        narrative = narrate_verdicts(draft)
+        usage = (draft.get("llm_usage") or [])[len(state.get("llm_usage") or []):]
+        observe_usage(state.get("route"), usage)
+        if narrative is None:
+            raise RuntimeError("no narrative returned")
+        final_state = with_narrative(state, narrative)
+        final_state["llm_usage"] = list(state.get("llm_usage") or []) + usage
+        key = result_cache_key(user_input)
+        design_id = key[1] if key[0] == "design" else final_state.get("design_id")
+        result_cache.set(key, final_state, design_id=design_id, generation=generation)
+        if settings.NORMALIZATION_ENABLED:
+            result_cache.set(attributes_cache_key(final_state["attributes"]), final_state)
+        if persisted:
+            self._persist_narrative(final_state["validation_id"], narrative, usage)
+        return narrative
+
+    def _persist_narrative(
+        self,
+        validation_id: str,
+        narrative: Dict[str, Any],
+        usage: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """Fill in reasoning and comments of a Validation stored in two-phase mode."""
+        # Own session: the request's session is closed by the time the narrative is ready
+        with Session(bind=self.db.get_bind()) as session:
+            try:
+                record = session.get(Validation, UUID(validation_id))
+                if record is None:
+                    return
+                record.reasoning = narrative["reasoning"]
+                for result in record.results:
+                    if narrative["comments"].get(result.field):
+                        result.comment = narrative["comments"][result.field]
+                record.llm_usage.extend(usage_rows(usage))
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                print(f"\n FAILED TO PERSIST NARRATIVE: {e}")
+
+    def stored_narrative(self, validation_id: str) -> Optional[Dict[str, Any]]:
+        """Narrative of a persisted validation (e.g. generated by another worker)."""
+        if self.db is None:
+            return None
+        try:
+            record = self.db.get(Validation, UUID(validation_id))
+        except ValueError:
+            return None
+        if record is None:
+            return None
+        if record.reasoning is None:
+            return {"validation_id": validation_id, "status": "pending"}
+        return {
+            "validation_id": validation_id,
+            "status": "ready",
+            "reasoning": record.reasoning,
+            "comments": {result.field: result.comment for result in record.results}
         }
-        
+
+    def _cached_result(self, user_input: str, hitl_mode: bool) -> Optional[Dict[str, Any]]:
+        """Fresh result from the in-process cache."""
+        state = result_cache.get(result_cache_key(user_input))
+        return self._as_response_state(state, user_input, hitl_mode)
+
+    def _stored_result(self, user_input: str, hitl_mode: bool) -> Optional[Dict[str, Any]]:
+        """
+        Fresh verdicts persisted for a referenced design (e.g. by another
+        worker's background re-validation), newer than the design's last edit.
+        """
+        design_id = design_reference(user_input)
+        if design_id is None or self.db is None:
+            return None
+        design = self.db.query(Design).filter(Design.id == design_id).first()
+        if design is None:
+            return None
+        record = (
+            self.db.query(Validation)
+            .filter(
+                Validation.design_id == design_id,
+                Validation.hitl_mode.is_(False),
+                Validation.created_at >= design.updated_at
+            )
+            .order_by(Validation.created_at.desc())
+            .first()
+        )
+        if record is None:
+            return None
+        attributes = design.to_dict()
+        missing = [attr for attr in REQUIRED_ATTRIBUTES if attributes.get(attr) in (None, "")]
+        inferred = infer_attributes(attributes, missing) if settings.INFERENCE_ENABLED else {}
+        for field, item in inferred.items():
+            attributes[field] = item["value"]
+            missing.remove(field)
+        state = self._initial_state(user_input, hitl_mode=False)
+        state.update({
+            "route": record.route,
+            "validation_id": str(record.id),
+            "narrative_pending": record.reasoning is None,
+            "design_id": design_id,
+            "attributes": attributes,
+            "missing_attributes": missing,
+            "inferred_attributes": inferred,
+            "validation": [
+                {"field": r.field, "status": r.status, "expected": r.expected, "comment": r.comment}
+                for r in record.results
+            ],
+            "validated_attributes": dict(attributes),
+            "reasoning": record.reasoning,
+            "confidence": record.confidence,
+            "initial_validation_done": True
+        })
+        result_cache.set(result_cache_key(user_input), state, design_id=design_id)
+        return self._as_response_state(state, user_input, hitl_mode)
+
+    @staticmethod
+    def _as_response_state(
+        state: Optional[Dict[str, Any]],
+        user_input: str,
+        hitl_mode: bool
+    ) -> Optional[Dict[str, Any]]:
+        if state is None:
+            return None
+        print(f"\n SERVED FROM CACHE: {result_cache_key(user_input)}")
+        state["user_input"] = user_input
+        state["hitl_mode"] = hitl_mode
+        state["llm_usage"] = []  # answered without calling the LLM
+        return state
+
+    def refresh_design(self, design_id: str) -> Dict[str, Any]:
+        """
+        Re-validate a design after it changed, bypassing the caches.
+        Verdicts from before the change seed incremental re-validation.
+        """
+        user_input = f"Validate {design_id}"
+        generation = result_cache.generation(design_id)
+        initial_state = self._initial_state(user_input, hitl_mode=False)
+        previous = result_cache.previous_for_design(design_id)
+        if previous and previous.get("validation") and previous.get("validated_attributes"):
+            initial_state["validation"] = previous["validation"]
+            initial_state["validated_attributes"] = previous["validated_attributes"]
+            initial_state["reasoning"] = previous.get("reasoning")
+        with admission.slot("background"):
+            final_state = self._execute(initial_state)
+        self._store(user_input, final_state, generation)
+        return final_state
+
+    def _execute_with_responses(
+        self,
+        user_input: str,
+        hitl_responses: Dict[str, str],
+        accept_suggestions: bool = False,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        # Create initial state with HITL responses pre-loaded
+        initial_state = self._initial_state(user_input, hitl_mode=True)
+        initial_state["skip_missing_prompts"] = False  # Enable HITL workflow
+        initial_state["hitl_responses"] = dict(hitl_responses)  # Pre-load responses
+        initial_state["accept_suggestions"] = accept_suggestions
+
         print("\n" + "="*80)
         print("🚀 STARTING VALIDATION WITH HITL RESPONSES")
         print("="*80)
         print(f"Initial state hitl_responses: {initial_state['hitl_responses']}")
         print(f"Number of responses: {len(initial_state['hitl_responses'])}")
         print("="*80)
-        
+
         # Run the graph with pre-loaded responses
-        final_state = self.graph.invoke(
-            initial_state,
-            config=RunnableConfig(recursion_limit=50)
-        )
-        
+        final_state = self._execute(initial_state, deadline)
+        if final_state.get("validation") and not final_state.get("partial"):
+            self._persist(final_state)
+        if indexable(final_state) and not final_state.get("partial"):
+            design_index.add(final_state["attributes"])
+
         print("\n" + "="*80)
         print("VALIDATION COMPLETE")
         print("="*80)
         print(f"Final attributes: {final_state.get('attributes', {})}")
         print(f"Final missing: {final_state.get('missing_attributes', [])}")
         print("="*80)
-        
+
+        return final_state
+
+    def _resume_session(
+        self,
+        session: Dict[str, Any],
+        hitl_responses: Dict[str, str],
+        accept_suggestions: bool = False,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply answers to a saved HITL session on the resume graph. Fields
+        still unanswered keep the session open (as its next version);
+        otherwise it is completed and the verdicts are persisted.
+        """
+        initial_state = self._initial_state(session["user_input"], hitl_mode=True)
+        initial_state.update(copy.deepcopy(session["state"]))  # the graph mutates lists in place
+        responses = dict(hitl_responses)
+        if accept_suggestions:
+            for field, suggestion in (initial_state.get("attribute_suggestions") or {}).items():
+                responses.setdefault(field, str(suggestion["value"]))
+        initial_state.update({
+            "skip_missing_prompts": False,
+            "hitl_responses": responses,
+            "accept_suggestions": accept_suggestions
+        })
+        print(f"\n RESUMING HITL SESSION {session['id']} (version {session['version']}): {list(responses)}")
+
+        final_state = self._execute(initial_state, deadline, graph=self.resume_graph)
+        if final_state.get("partial"):
+            # Out of time: the session is unchanged and the answers can be sent again
+            final_state.update(session_id=session["id"], session_version=session["version"])
+            return final_state
+        attributes = final_state.get("attributes") or {}
+        missing = [
+            field for field in session["state"].get("missing_attributes", [])
+            if attributes.get(field) is None or attributes.get(field) == ""
+        ]
+        if missing:
+            final_state["missing_attributes"] = missing
+            saved = hitl_sessions.save(session, final_state)
+            final_state.update(session_id=saved["id"], session_version=saved["version"])
+            return final_state
+        self._finish_session(session, final_state)
         return final_state
+
+    def _finish_session(self, session: Dict[str, Any], final_state: Dict[str, Any]) -> None:
+        """Complete a HITL session whose last answer came in and persist its verdicts."""
+        hitl_sessions.complete(session)
+        if final_state.get("validation"):
+            self._persist(final_state)
+        if indexable(final_state):
+            design_index.add(final_state["attributes"])
+
+    def _hitl_run(
+        self,
+        user_input: Optional[str],
+        hitl_responses: Dict[str, str],
+        accept_suggestions: bool,
+        deadline: Optional[Deadline],
+        session_id: Optional[str],
+        session_version: Optional[int]
+    ) -> Tuple[Tuple, Callable[[], Dict[str, Any]]]:
+        """Coalescing key and graph run of a HITL follow-up: from a saved session or from scratch."""
+        if session_id is None:
+            key = canonical_request_key(user_input, True, hitl_responses, accept_suggestions)
+            return key, lambda: self._execute_with_responses(user_input, hitl_responses, accept_suggestions, deadline)
+        session = hitl_sessions.get(session_id)  # one fetch: everything needed to resume
+        if session_version is not None and session_version != session["version"]:
+            raise HITLSessionConflict(session_id, session["version"])
+        answers = canonical_request_key("", True, hitl_responses, accept_suggestions)[2:4]
+        key = ("session", session_id, session["version"]) + answers
+        return key, lambda: self._resume_session(session, hitl_responses, accept_suggestions, deadline)
+
+    @staticmethod
+    def _open_session(result: Dict[str, Any], hitl_mode: bool) -> Dict[str, Any]:
+        """Save a HITL-mode result that needs answers as a session follow-ups can resume."""
+        if (
+            hitl_mode and result.get("missing_attributes") and result.get("validation")
+            and not result.get("conversation_history") and not result.get("partial")
+        ):
+            session = hitl_sessions.create(result["user_input"], result)
+            result.update(session_id=session["id"], session_version=session["version"])
+        return result
+
+    @staticmethod
+    def _flight(
+        key: Tuple,
+        lane: str,
+        fn: Callable[[], Dict[str, Any]],
+        deadline: Optional[Deadline] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Coalesce on `key`; only the leader of an execution takes an admission
+        slot, so identical requests queue once and their followers cost no
+        slot. Queueing and joining are bounded by the deadline; a leader's
+        deadline is not cancelled while other callers wait on its result.
+        """
+        budget = deadline.timeout() if deadline is not None else None
+        if deadline is not None:
+            deadline.keep_alive = lambda: _validation_flights.waiting(key) > 0
+        try:
+            return _validation_flights.do(
+                key, fn, timeout=budget, admit=lambda: admission.slot(lane, timeout=budget)
+            )
+        except concurrent.futures.TimeoutError:
+            raise RequestDeadlineExceeded("request deadline exceeded waiting for an identical validation")
+
+    @staticmethod
+    async def _aflight(
+        key: Tuple,
+        lane: str,
+        fn: Callable[[], Dict[str, Any]],
+        deadline: Optional[Deadline] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Async variant of _flight; queued requests wait on the event loop."""
+        budget = deadline.timeout() if deadline is not None else None
+        if deadline is not None:
+            deadline.keep_alive = lambda: _validation_flights.waiting(key) > 0
+        try:
+            return await _validation_flights.ado(
+                key, fn, timeout=budget, admit=lambda: admission.aslot(lane, timeout=budget)
+            )
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            raise RequestDeadlineExceeded("request deadline exceeded waiting for an identical validation")
+
+    @staticmethod
+    def _own_copy(result: Dict[str, Any], shared: bool) -> Dict[str, Any]:
+        """Followers get a private copy so callers never mutate each other's state."""
+        if shared:
+            print("\n COALESCED with an identical in-flight validation")
+            result = copy.deepcopy(result)
+            result["llm_usage"] = []  # the leader's request paid for the calls
+        return result
+
+    def run_validation(
+        self,
+        user_input: str,
+        hitl_mode: bool = False,
+        lane: str = "interactive",
+        deadline: Optional[Deadline] = None,
+        deferred_narrative: bool = False,
+        profile: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run validation workflow (exact logic from notebook).
+
+        Args:
+            user_input: Cable design specification or design ID
+            hitl_mode: Enable Human-in-the-Loop mode
+            lane: Admission priority (interactive, batch or background)
+            deadline: Time budget; when it runs out the result is partial
+            deferred_narrative: Return deterministic verdicts at once and
+                generate the LLM narrative in the background
+            profile: Ask for this run to be profiled (when profiling is enabled)
+
+        Returns:
+            Final state dictionary with validation results
+        """
+        cached = self._cached_result(user_input, hitl_mode) or self._stored_result(user_input, hitl_mode)
+        if cached is not None:
+            return self._open_session(cached, hitl_mode)
+        key = canonical_request_key(user_input, hitl_mode, deferred_narrative=deferred_narrative)
+        result, shared = self._flight(
+            key, lane,
+            profiler.wrap(
+                lambda: self._validate_and_store(user_input, hitl_mode, deadline, deferred_narrative),
+                "run_validation", profile
+            ),
+            deadline
+        )
+        return self._open_session(self._own_copy(result, shared), hitl_mode)
+
+    async def arun_validation(
+        self,
+        user_input: str,
+        hitl_mode: bool = False,
+        lane: str = "interactive",
+        deadline: Optional[Deadline] = None,
+        deferred_narrative: bool = False,
+        profile: bool = False
+    ) -> Dict[str, Any]:
+        """Async variant of run_validation; the graph runs off the event loop."""
+        cached = (
+            self._cached_result(user_input, hitl_mode)
+            or await asyncio.to_thread(self._stored_result, user_input, hitl_mode)
+        )
+        if cached is not None:
+            return self._open_session(cached, hitl_mode)
+        key = canonical_request_key(user_input, hitl_mode, deferred_narrative=deferred_narrative)
+        result, shared = await self._aflight(
+            key, lane,
+            profiler.wrap(
+                lambda: self._validate_and_store(user_input, hitl_mode, deadline, deferred_narrative),
+                "run_validation", profile
+            ),
+            deadline
+        )
+        return self._open_session(self._own_copy(result, shared), hitl_mode)
+
+    def run_validation_with_responses(
+        self,
+        user_input: Optional[str],
+        hitl_responses: Dict[str, str],
+        accept_suggestions: bool = False,
+        lane: str = "interactive",
+        deadline: Optional[Deadline] = None,
+        profile: bool = False,
+        session_id: Optional[str] = None,
+        session_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-run validation with HITL responses provided.
+
+        Args:
+            user_input: Original user input (not needed with a session)
+            hitl_responses: Dictionary of user responses for missing attributes
+            accept_suggestions: Use the suggested values for unanswered fields
+            lane: Admission priority (interactive, batch or background)
+            deadline: Time budget; when it runs out the result is partial
+            profile: Ask for this run to be profiled (when profiling is enabled)
+            session_id: HITL session to resume instead of starting over
+            session_version: Session version the answers are based on
+                (HITLSessionConflict if it moved on)
+
+        Returns:
+            Final state dictionary with validation results
+        """
+        key, fn = self._hitl_run(user_input, hitl_responses, accept_suggestions, deadline, session_id, session_version)
+        result, shared = self._flight(
+            key, lane, profiler.wrap(fn, "run_validation_with_responses", profile), deadline
+        )
+        return self._own_copy(result, shared)
+
+    async def arun_validation_with_responses(
+        self,
+        user_input: Optional[str],
+        hitl_responses: Dict[str, str],
+        accept_suggestions: bool = False,
+        lane: str = "interactive",
+        deadline: Optional[Deadline] = None,
+        profile: bool = False,
+        session_id: Optional[str] = None,
+        session_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Async variant of run_validation_with_responses."""
+        key, fn = self._hitl_run(user_input, hitl_responses, accept_suggestions, deadline, session_id, session_version)
+        result, shared = await self._aflight(
+            key, lane, profiler.wrap(fn, "run_validation_with_responses", profile), deadline
+        )
+        return self._own_copy(result, shared)
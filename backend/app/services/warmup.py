@@ -0,0 +1,157 @@
+"""
+Startup warmup and readiness.
+Pre-builds what the first request would otherwise pay for (compiled graph,
+OpenAPI/Pydantic schemas, pooled DB connections, the design index, the bulk
+process pool, the LLM client's HTTP connection) and gates /ready on it. The
+database is required: its probe is retried until it succeeds. The index,
+process pool and LLM probe are advisory: the workflow works without them,
+so failures are reported only.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from app.config import settings
+from app.utils.metrics import registry
+import asyncio
+import time
+
+
+WARMUP_SECONDS = registry.gauge(
+    "startup_warmup_seconds", "Wall time of the last completed warmup"
+)
+WARMUP_STEP_SECONDS = registry.gauge(
+    "startup_warmup_step_seconds", "Wall time of each warmup step", ["step"]
+)
+WARMUP_FAILURES = registry.counter(
+    "startup_warmup_failures_total", "Failed warmup step attempts", ["step"]
+)
+READY = registry.gauge(
+    "app_ready", "1 once warmup has completed and the worker accepts traffic"
+)
+
+
+def build_graph() -> None:
+    from app.langgraph.workflow import get_resume_graph, get_validation_graph
+    get_validation_graph()
+    get_resume_graph()
+
+
+def build_schemas(app) -> None:
+    """Generate the OpenAPI document (and with it every route's JSON schema)."""
+    app.openapi()
+
+
+def fill_sync_pool(connections: int) -> None:
+    from app.database import engine
+    held = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            held.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in held:
+            connection.close()
+
+
+async def fill_async_pool(connections: int) -> None:
+    from app.database import async_engine
+    held = []
+    try:
+        for _ in range(connections):
+            connection = await async_engine.connect()
+            held.append(connection)
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in held:
+            await connection.close()
+
+
+def load_design_index() -> None:
+    from app.database import SessionLocal
+    from app.services.design_index import design_index
+    db = SessionLocal()
+    try:
+        print(f"\n DESIGN INDEX: loaded {design_index.load(db)} validated designs")
+    finally:
+        db.close()
+
+
+def start_process_pool() -> None:
+    from app.services.process_pool import process_pool
+    process_pool.start()
+
+
+def probe_llm() -> None:
+    from app.services.llm_service import llm
+    llm.invoke('Reply with the single word "ok".', node="warmup")
+
+
+class Warmup:
+    """Runs the warmup steps once and records readiness."""
+
+    def __init__(self, retry_seconds: float = 5.0):
+        self.retry_seconds = retry_seconds
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.checks: Dict[str, Dict[str, Any]] = {}
+
+    def steps(self, app) -> List[Tuple[str, Callable[[], Awaitable[None]], bool]]:
+        """(name, coroutine factory, required) in execution order."""
+        connections = max(1, min(settings.DB_POOL_SIZE, settings.WARMUP_DB_CONNECTIONS))
+        steps = [
+            ("graph", lambda: asyncio.to_thread(build_graph), True),
+            ("schemas", lambda: asyncio.to_thread(build_schemas, app), True),
+            ("database", lambda: asyncio.to_thread(fill_sync_pool, connections), True),
+            ("database_async", lambda: fill_async_pool(connections), True),
+        ]
+        if settings.SUGGESTIONS_ENABLED:
+            steps.append(("design_index", lambda: asyncio.to_thread(load_design_index), False))
+        from app.services.process_pool import process_pool
+        if not process_pool.inline:
+            steps.append(("process_pool", lambda: asyncio.to_thread(start_process_pool), False))
+        if settings.WARMUP_LLM_PROBE:
+            steps.append(("llm", lambda: asyncio.to_thread(probe_llm), False))
+        return steps
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[None]], required: bool) -> None:
+        while True:
+            started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                WARMUP_FAILURES.inc(step=name)
+                self.checks[name] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                print(f"\n WARMUP {name} FAILED: {type(e).__name__}: {e}")
+                if not required:
+                    return
+                await asyncio.sleep(self.retry_seconds)
+                continue
+            elapsed = time.perf_counter() - started
+            WARMUP_STEP_SECONDS.set(elapsed, step=name)
+            self.checks[name] = {"ok": True, "seconds": round(elapsed, 3)}
+            return
+
+    async def run(self, app) -> None:
+        self.started_at = time.perf_counter()
+        for name, step, required in self.steps(app):
+            await self._run_step(name, step, required)
+        self.duration = time.perf_counter() - self.started_at
+        WARMUP_SECONDS.set(self.duration)
+        self.mark_ready()
+        print(f"\n WARMUP COMPLETE in {self.duration:.2f}s")
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        READY.set(1)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "warmup_seconds": round(self.duration, 3) if self.duration is not None else None,
+            "checks": self.checks,
+        }
+
+
+# Global warmup state for this worker
+warmup = Warmup(retry_seconds=settings.WARMUP_RETRY_SECONDS)
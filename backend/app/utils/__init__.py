@@ -1,4 +1,5 @@
 """Utils package."""
 from app.utils.constants import REQUIRED_ATTRIBUTES, DESIGN_DATABASE
+from app.utils.metrics import registry
 
-__all__ = ["REQUIRED_ATTRIBUTES", "DESIGN_DATABASE"]
+__all__ = ["REQUIRED_ATTRIBUTES", "DESIGN_DATABASE", "registry"]
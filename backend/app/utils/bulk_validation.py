@@ -0,0 +1,44 @@
+"""
+Deterministic bulk validation of design rows.
+The CPU-bound part of bulk jobs runs here: unit normalization, the IEC rule
+checks and JSON encoding of one verdict line per design. The functions are
+module-level and import only app.utils, so process-pool workers can run
+them without loading the LLM stack.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+from app.utils.iec_rules import evaluate_attributes
+from app.utils.normalization import normalize_records
+from app.utils.shared_columns import ColumnsHandle, unpack_rows
+import json
+
+STATUSES = ("PASS", "WARN", "FAIL")
+
+
+def validate_rows(rows: Sequence[Dict[str, Any]]) -> Tuple[bytes, List[int]]:
+    """
+    NDJSON verdict lines for `rows` plus how many designs PASS, WARN and FAIL
+    overall (the worst field verdict). A "line" key, if present, is carried over.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    counts = [0, 0, 0]
+    lines = []
+    for row in normalize_records(list(rows)):
+        verdicts = evaluate_attributes(row)
+        worst = max(STATUSES.index(verdict["status"]) for verdict in verdicts)
+        counts[worst] += 1
+        item = {
+            "design_id": row.get("id"),
+            "status": STATUSES[worst],
+            "missing_attributes": [v["field"] for v in verdicts if row.get(v["field"]) in (None, "")],
+            "attributes": {verdict["field"]: row.get(verdict["field"]) for verdict in verdicts},
+            "validation": verdicts
+        }
+        if row.get("line") is not None:
+            item = {"line": row["line"], **item}
+        lines.append(encode(item))
+    return "".join(line + "\n" for line in lines).encode(), counts
+
+
+def validate_chunk(handle: ColumnsHandle) -> Tuple[bytes, List[int]]:
+    """Process-pool task: validate_rows over a chunk packed in shared memory."""
+    return validate_rows(unpack_rows(handle))
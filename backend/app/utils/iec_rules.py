@@ -0,0 +1,130 @@
+"""
+Deterministic IEC rule checks.
+Computes the PASS/WARN/FAIL verdict of every required attribute from the
+IEC tables alone, following the same classification rules the validation
+prompt gives the LLM (85-99% of nominal thickness is WARN, below 85% FAIL,
+missing fields WARN). Used to answer instantly while the LLM writes the
+narrative in the background.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from app.utils.iec_tables import (
+    IEC_60228_NOMINAL_CSA, IEC_60502_1_VOLTAGES, INSULATION_THICKNESS_0_6_1_KV, rated_voltage
+)
+
+KNOWN_STANDARDS = {"IEC 60502-1", "IEC 60228"}
+CONDUCTOR_MATERIALS = {"Cu", "Al"}
+CONDUCTOR_CLASSES = {"Class 1", "Class 2"}
+INSULATION_MATERIALS = {"PVC", "XLPE", "EPR"}
+
+# Share of the nominal insulation thickness below which a value fails / warns
+THICKNESS_FAIL_BELOW = 0.85
+THICKNESS_WARN_ABOVE = 1.10
+
+Verdict = Tuple[str, Optional[str], str]  # status, expected, comment
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def check_standard(value: Any, attributes: Dict[str, Any]) -> Verdict:
+    expected = "IEC 60502-1"
+    if value in KNOWN_STANDARDS:
+        return "PASS", expected, f"{value} applies to this design"
+    return "WARN", expected, f"Standard '{value}' is not one this check covers; validation basis unclear"
+
+
+def check_voltage(value: Any, attributes: Dict[str, Any]) -> Verdict:
+    expected = "0.6/1 kV to 18/30 kV range (IEC 60502-1)"
+    rating = rated_voltage(value)
+    if rating is None:
+        return "WARN", expected, f"Voltage '{value}' is not a U0/U rating"
+    if rating in IEC_60502_1_VOLTAGES:
+        return "PASS", expected, "Rated voltage is within IEC 60502-1"
+    return "FAIL", expected, f"Rated voltage {value} is not an IEC 60502-1 rating"
+
+
+def check_conductor_material(value: Any, attributes: Dict[str, Any]) -> Verdict:
+    expected = "Cu or Al per IEC 60228"
+    if value in CONDUCTOR_MATERIALS:
+        return "PASS", expected, "IEC 60228 permits copper and aluminium conductors"
+    return "FAIL", expected, f"Conductor material '{value}' is not covered by IEC 60228"
+
+
+def check_conductor_class(value: Any, attributes: Dict[str, Any]) -> Verdict:
+    expected = "Class 1 or Class 2 per IEC 60228"
+    if value in CONDUCTOR_CLASSES:
+        return "PASS", expected, f"{value} is a fixed-installation class per IEC 60228"
+    return "WARN", expected, f"Conductor class '{value}' is unusual for IEC 60502-1 power cables"
+
+
+def check_csa(value: Any, attributes: Dict[str, Any]) -> Verdict:
+    expected = "Nominal value from IEC 60228 Table 1"
+    csa = _number(value)
+    if csa is None:
+        return "WARN", expected, f"Cross-sectional area '{value}' is not a number"
+    if csa in IEC_60228_NOMINAL_CSA:
+        return "PASS", expected, f"{csa:g} mm² is a nominal IEC 60228 size"
+    return "FAIL", expected, f"{csa:g} mm² is not a nominal IEC 60228 size"
+
+
+def check_insulation_material(value: Any, attributes: Dict[str, Any]) -> Verdict:
+    expected = "PVC, XLPE, or EPR per IEC 60502-1"
+    if value in INSULATION_MATERIALS:
+        return "PASS", expected, f"{value} is an IEC 60502-1 insulation compound"
+    return "WARN", expected, f"Insulation material '{value}' is not one this check covers"
+
+
+def nominal_thickness(attributes: Dict[str, Any]) -> Optional[float]:
+    """Nominal insulation thickness (mm) from IEC 60502-1, when tabulated here."""
+    if rated_voltage(attributes.get("voltage")) != (0.6, 1.0):
+        return None
+    table = INSULATION_THICKNESS_0_6_1_KV.get(str(attributes.get("insulation_material") or ""))
+    csa = _number(attributes.get("csa"))
+    return table.get(csa) if table and csa is not None else None
+
+
+def check_insulation_thickness(value: Any, attributes: Dict[str, Any]) -> Verdict:
+    thickness = _number(value)
+    nominal = nominal_thickness(attributes)
+    if thickness is None:
+        return "WARN", None, f"Insulation thickness '{value}' is not a number"
+    if nominal is None:
+        return "WARN", None, "Nominal thickness is not tabulated for this voltage/material/size"
+    expected = f"{nominal:g} mm"
+    ratio = thickness / nominal
+    if ratio < THICKNESS_FAIL_BELOW:
+        return "FAIL", expected, f"{thickness:g} mm is {ratio:.0%} of the nominal {nominal:g} mm (below 85%)"
+    if ratio < 1.0:
+        return "WARN", expected, f"{thickness:g} mm is {ratio:.0%} of the nominal {nominal:g} mm (borderline)"
+    if ratio > THICKNESS_WARN_ABOVE:
+        return "WARN", expected, f"{thickness:g} mm is {ratio:.0%} of the nominal {nominal:g} mm (over-designed)"
+    return "PASS", expected, f"Meets the nominal {nominal:g} mm of IEC 60502-1"
+
+
+RULES: Dict[str, Callable[[Any, Dict[str, Any]], Verdict]] = {
+    "standard": check_standard,
+    "voltage": check_voltage,
+    "conductor_material": check_conductor_material,
+    "conductor_class": check_conductor_class,
+    "csa": check_csa,
+    "insulation_material": check_insulation_material,
+    "insulation_thickness": check_insulation_thickness,
+}
+
+
+def evaluate_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Verdict for every required attribute, in canonical field order (normalized input expected)."""
+    verdicts = []
+    for field in REQUIRED_ATTRIBUTES:
+        value = attributes.get(field)
+        if value in (None, ""):
+            status, expected, comment = "WARN", None, "Field is missing; cannot validate without data"
+        else:
+            status, expected, comment = RULES[field](value, attributes)
+        verdicts.append({"field": field, "status": status, "expected": expected, "comment": comment})
+    return verdicts
@@ -0,0 +1,105 @@
+"""
+IEC lookup tables for deriving missing design attributes.
+Nominal insulation thickness is taken from IEC 60502-1 (0.6/1 kV,
+Tables 5-7) and the usual conductor class from common IEC 60228 practice.
+Only values the tables determine unambiguously are inferred; anything else
+is left missing for the user.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+# Rated voltages U0/U (kV) covered by IEC 60502-1
+IEC_60502_1_VOLTAGES = {(0.6, 1.0), (1.8, 3.0), (3.6, 6.0), (6.0, 10.0), (8.7, 15.0), (12.0, 20.0), (18.0, 30.0)}
+
+# Nominal insulation thickness (mm) at 0.6/1 kV by material and nominal CSA (mm²)
+INSULATION_THICKNESS_0_6_1_KV: Dict[str, Dict[float, float]] = {
+    "PVC": {
+        1.5: 0.8, 2.5: 0.8, 4: 1.0, 6: 1.0, 10: 1.0, 16: 1.0, 25: 1.2, 35: 1.2,
+        50: 1.4, 70: 1.4, 95: 1.6, 120: 1.6, 150: 1.8, 185: 2.0, 240: 2.2,
+        300: 2.4, 400: 2.6, 500: 2.8, 630: 2.8, 800: 2.8, 1000: 3.0,
+    },
+    "XLPE": {
+        1.5: 0.7, 2.5: 0.7, 4: 0.7, 6: 0.7, 10: 0.7, 16: 0.7, 25: 0.9, 35: 0.9,
+        50: 1.0, 70: 1.1, 95: 1.1, 120: 1.2, 150: 1.4, 185: 1.6, 240: 1.7,
+        300: 1.8, 400: 2.0, 500: 2.2, 630: 2.4, 800: 2.6, 1000: 2.8,
+    },
+    "EPR": {
+        1.5: 1.0, 2.5: 1.0, 4: 1.0, 6: 1.0, 10: 1.0, 16: 1.0, 25: 1.2, 35: 1.2,
+        50: 1.4, 70: 1.4, 95: 1.6, 120: 1.6, 150: 1.8, 185: 2.0, 240: 2.2,
+        300: 2.4, 400: 2.6, 500: 2.8, 630: 2.8, 800: 2.8, 1000: 3.0,
+    },
+}
+
+# Nominal cross-sectional areas (mm²), IEC 60228 Table 1 onwards
+IEC_60228_NOMINAL_CSA = (
+    0.5, 0.75, 1, 1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240,
+    300, 400, 500, 630, 800, 1000, 1200, 1400, 1600, 1800, 2000, 2500,
+)
+
+# Smallest CSA (mm²) from which stranded Class 2 is the usual construction;
+# below it solid Class 1 is just as common, so the class is not inferred
+STRANDED_FROM_CSA = 16
+
+INFERABLE_ATTRIBUTES = ["standard", "conductor_class", "insulation_thickness"]
+
+VOLTAGE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*kV', re.IGNORECASE)
+
+
+def rated_voltage(value: Any) -> Optional[Tuple[float, float]]:
+    """(U0, U) in kV from a rating such as "0.6/1 kV", else None."""
+    match = VOLTAGE_PATTERN.search(str(value or ""))
+    return (float(match.group(1)), float(match.group(2))) if match else None
+
+
+def _csa(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def infer_standard(attributes: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
+    if rated_voltage(attributes.get("voltage")) in IEC_60502_1_VOLTAGES:
+        return "IEC 60502-1", "IEC 60502-1 scope (rated voltage)"
+    return None
+
+
+def infer_conductor_class(attributes: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
+    csa = _csa(attributes.get("csa"))
+    if csa is not None and csa >= STRANDED_FROM_CSA:
+        return "Class 2", f"IEC 60228 (stranded is usual from {STRANDED_FROM_CSA} mm²)"
+    return None
+
+
+def infer_insulation_thickness(attributes: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
+    if rated_voltage(attributes.get("voltage")) != (0.6, 1.0):
+        return None
+    material = str(attributes.get("insulation_material") or "").strip().upper()
+    thickness = INSULATION_THICKNESS_0_6_1_KV.get(material, {}).get(_csa(attributes.get("csa")))
+    if thickness is None:
+        return None
+    return thickness, f"IEC 60502-1 nominal for {material} at 0.6/1 kV"
+
+
+INFERENCE_RULES = {
+    "standard": infer_standard,
+    "conductor_class": infer_conductor_class,
+    "insulation_thickness": infer_insulation_thickness,
+}
+
+
+def infer_attributes(attributes: Dict[str, Any], missing: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Values for the `missing` fields the tables determine from the known ones.
+
+    Returns:
+        {field: {"value", "source"}} for each field that could be derived
+    """
+    inferred: Dict[str, Dict[str, Any]] = {}
+    for field in INFERABLE_ATTRIBUTES:
+        if field not in missing:
+            continue
+        result = INFERENCE_RULES[field](attributes)
+        if result is not None:
+            inferred[field] = {"value": result[0], "source": result[1]}
+    return inferred
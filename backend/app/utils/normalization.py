@@ -0,0 +1,203 @@
+"""
+Unit and synonym normalization of design attributes.
+Every attribute is mapped to one canonical form ("copper" -> "Cu",
+"10sqmm" -> 10.0, "600/1000 V" -> "0.6/1 kV", "iec60502-1" -> "IEC 60502-1")
+with precompiled regexes and lookup tables of interned canonical strings, so
+equal designs compare, hash and cache equal. Values that cannot be
+recognised are kept (whitespace-collapsed) for validation to judge.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+from app.utils.constants import REQUIRED_ATTRIBUTES
+import math
+import re
+import sys
+import numpy as np
+
+
+def _interned(table: Dict[str, str]) -> Dict[str, str]:
+    return {key: sys.intern(value) for key, value in table.items()}
+
+
+CONDUCTOR_MATERIALS = _interned({
+    "cu": "Cu", "copper": "Cu", "annealed copper": "Cu", "plain copper": "Cu",
+    "al": "Al", "alu": "Al", "aluminium": "Al", "aluminum": "Al",
+})
+INSULATION_MATERIALS = _interned({
+    "pvc": "PVC", "polyvinyl chloride": "PVC", "pvc/a": "PVC",
+    "xlpe": "XLPE", "pex": "XLPE", "cross-linked polyethylene": "XLPE", "crosslinked polyethylene": "XLPE",
+    "epr": "EPR", "ethylene propylene rubber": "EPR",
+    "hepr": "HEPR", "hard epr": "HEPR",
+})
+CONDUCTOR_CLASSES = _interned({
+    "solid": "Class 1", "stranded": "Class 2", "flexible": "Class 5", "extra flexible": "Class 6",
+})
+
+NUMBER = r'(\d+(?:[.,]\d+)?)'
+CSA_PATTERN = re.compile(NUMBER + r'\s*(?:mm²|mm2|mm\^2|sq\.?\s*mm|sqmm|mm)?$', re.IGNORECASE)
+THICKNESS_PATTERN = re.compile(NUMBER + r'\s*(?:mm)?$', re.IGNORECASE)
+VOLTAGE_PATTERN = re.compile(NUMBER + r'\s*/\s*' + NUMBER + r'\s*(kv|v)?', re.IGNORECASE)
+STANDARD_PATTERN = re.compile(r'^(?:IEC)?\s*(\d{5})(?:\s*-\s*(\d+))?$', re.IGNORECASE)
+CLASS_PATTERN = re.compile(r'^(?:class|cl\.?)?\s*(\d)$', re.IGNORECASE)
+SPACES = re.compile(r'\s+')
+
+
+def _collapse(value: str) -> str:
+    return SPACES.sub(" ", value).strip()
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
+
+
+def _format_kv(value: float) -> str:
+    return f"{value:g}"
+
+
+def normalize_standard(text: str) -> str:
+    match = STANDARD_PATTERN.match(text)
+    if not match:
+        return text
+    number, part = match.groups()
+    return sys.intern(f"IEC {number}-{part}" if part else f"IEC {number}")
+
+
+def normalize_voltage(text: str) -> str:
+    """U0/U rating in kV ("600/1000 V" and "0.6/1kV" both -> "0.6/1 kV")."""
+    match = VOLTAGE_PATTERN.search(text)
+    if not match:
+        return text
+    u0, u = _number(match.group(1)), _number(match.group(2))
+    unit = (match.group(3) or "").lower()
+    if unit == "v" or (not unit and u >= 100):
+        u0, u = u0 / 1000, u / 1000
+    return sys.intern(f"{_format_kv(u0)}/{_format_kv(u)} kV")
+
+
+def normalize_conductor_class(text: str) -> str:
+    match = CLASS_PATTERN.match(text)
+    if match:
+        return sys.intern(f"Class {match.group(1)}")
+    return CONDUCTOR_CLASSES.get(text.casefold(), text)
+
+
+def _lookup(table: Dict[str, str]) -> Callable[[str], str]:
+    return lambda text: table.get(text.casefold(), text)
+
+
+def _measure(pattern: "re.Pattern") -> Callable[[str], Any]:
+    def parse(text: str) -> Any:
+        match = pattern.match(text)
+        return _number(match.group(1)) if match else text
+    return parse
+
+
+STRING_NORMALIZERS: Dict[str, Callable[[str], Any]] = {
+    "standard": normalize_standard,
+    "voltage": normalize_voltage,
+    "conductor_material": _lookup(CONDUCTOR_MATERIALS),
+    "conductor_class": normalize_conductor_class,
+    "csa": _measure(CSA_PATTERN),
+    "insulation_material": _lookup(INSULATION_MATERIALS),
+    "insulation_thickness": _measure(THICKNESS_PATTERN),
+}
+NUMERIC_FIELDS = ("csa", "insulation_thickness")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_text(field: str, text: str) -> Any:
+    text = _collapse(text)
+    if not text:
+        return None
+    return STRING_NORMALIZERS[field](text)
+
+
+def normalize_value(field: str, value: Any) -> Any:
+    """Canonical form of one attribute value; unknown fields pass through."""
+    if value is None or field not in STRING_NORMALIZERS:
+        return value
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        if field in NUMERIC_FIELDS:
+            return None if math.isnan(value) else float(value)
+        value = str(value)
+    if isinstance(value, str):
+        return _normalize_text(field, value)
+    return value
+
+
+def normalize_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of `attributes` with every known field normalized."""
+    return {field: normalize_value(field, value) for field, value in attributes.items()}
+
+
+def _numeric_column(values: List[Any]) -> Optional[List[Any]]:
+    """Vectorized path for columns that are already numeric (or empty)."""
+    if any(isinstance(value, (str, bool)) for value in values):
+        return None
+    try:
+        array = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return None
+    return [None if math.isnan(value) else value for value in array.tolist()]
+
+
+def normalize_records(records: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Bulk variant of normalize_attributes for imports. Works column by column:
+    numeric columns convert in one NumPy pass and every other column
+    normalizes each distinct value once, then maps the rows through it.
+    """
+    if not records:
+        return []
+    normalized = [dict(record) for record in records]
+    for field in fields or REQUIRED_ATTRIBUTES:
+        column = [record.get(field) for record in records]
+        converted = _numeric_column(column) if field in NUMERIC_FIELDS else None
+        if converted is None:
+            try:
+                mapping = {value: normalize_value(field, value) for value in set(column)}
+                converted = [mapping[value] for value in column]
+            except TypeError:  # unhashable values (e.g. nested JSON) are left for validation
+                converted = [normalize_value(field, value) for value in column]
+        for record, original, value in zip(normalized, records, converted):
+            if field in original:
+                record[field] = value
+    return normalized
+
+
+# Attribute mentions in free text, for deterministic extraction
+SPEC_PATTERNS = {
+    "standard": re.compile(r'\bIEC\s*\d{5}(?:\s*-\s*\d+)?', re.IGNORECASE),
+    "voltage": re.compile(NUMBER + r'\s*/\s*' + NUMBER + r'\s*k?V\b', re.IGNORECASE),
+    "conductor_material": re.compile(r'\b(?:copper|cu|aluminium|aluminum|alu|al)\b', re.IGNORECASE),
+    "conductor_class": re.compile(r'\b(?:class|cl\.?)\s*\d\b|\b(?:solid|stranded|flexible)\b', re.IGNORECASE),
+    "csa": re.compile(NUMBER + r'\s*(?:mm²|mm2|mm\^2|sq\.?\s*mm|sqmm)', re.IGNORECASE),
+    "insulation_material": re.compile(r'\b(?:PVC|XLPE|HEPR|EPR)\b', re.IGNORECASE),
+    "insulation_thickness": re.compile(NUMBER + r'\s*mm\b(?![²2^])', re.IGNORECASE),
+}
+MIN_PARSED_FIELDS = 2
+
+
+def parse_specification(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Normalized attributes stated in a well-formed specification, without the LLM.
+    Returns None when fewer than MIN_PARSED_FIELDS are recognised or a field
+    is mentioned with two different values (e.g. "16 mm ... 1.0 mm"), so
+    anything unclear is still left to LLM extraction.
+    """
+    attributes: Dict[str, Any] = {}
+    for field, pattern in SPEC_PATTERNS.items():
+        values = {normalize_value(field, match.group(0)) for match in pattern.finditer(text)}
+        if len(values) > 1:
+            return None
+        attributes[field] = values.pop() if values else None
+    if sum(value is not None for value in attributes.values()) < MIN_PARSED_FIELDS:
+        return None
+    return attributes
+
+
+def normalization_cache_info():
+    """Hit statistics of the per-value normalization cache."""
+    return _normalize_text.cache_info()
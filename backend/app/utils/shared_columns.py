@@ -0,0 +1,93 @@
+"""
+Row chunks as NumPy columns in shared memory, for process-pool workers.
+A chunk of rows is packed into one SharedMemory block, one column per field:
+- integers as int64
+- other numbers as float64 (NaN for missing)
+- low-cardinality values as int32 codes into a small vocabulary (-1 for missing)
+- everything else, such as IDs, as fixed-width unicode
+Workers attach by name and read views of the block. Only the handle (name,
+layout, vocabularies) is pickled, never the rows.
+"""
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from types import NoneType
+from typing import Any, Dict, List, Sequence, Tuple
+import math
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ColumnsHandle:
+    """What a worker needs to read a packed chunk."""
+    name: str
+    length: int
+    layout: Tuple[Tuple[str, str, int], ...]  # field, dtype, byte offset
+    vocabularies: Dict[str, Tuple[Any, ...]]
+
+
+def _column(values: List[Any]) -> Tuple[np.ndarray, Tuple[Any, ...]]:
+    """The most compact array for one column and its vocabulary (empty unless coded)."""
+    types = set(map(type, values))
+    if types == {int}:
+        return np.array(values, dtype=np.int64), ()
+    if types <= {int, float, NoneType}:
+        return np.array(values, dtype=np.float64), ()  # None becomes NaN
+    present = [value for value in values if value is not None]
+    try:
+        vocabulary = tuple(dict.fromkeys(present))
+    except TypeError:  # unhashable values (nested JSON) travel as text
+        vocabulary = None
+        values = [None if value is None else str(value) for value in values]
+    if vocabulary is not None and len(vocabulary) <= max(len(values) // 2, 1):
+        codes = {value: code for code, value in enumerate(vocabulary)}
+        codes[None] = -1
+        return np.array([codes[value] for value in values], dtype=np.int32), vocabulary
+    return np.array(["" if value is None else str(value) for value in values], dtype=str), ()
+
+
+def pack_columns(
+    rows: Sequence[Dict[str, Any]],
+    fields: Sequence[str]
+) -> Tuple[shared_memory.SharedMemory, ColumnsHandle]:
+    """
+    Copy `fields` of `rows` into a new shared-memory block. The caller owns
+    the block: close() and unlink() it once the workers are done.
+    """
+    arrays, vocabularies = {}, {}
+    for field in fields:
+        arrays[field], vocabulary = _column([row.get(field) for row in rows])
+        if vocabulary:
+            vocabularies[field] = vocabulary
+
+    layout, offset = [], 0
+    for field, array in arrays.items():
+        offset = -(-offset // 8) * 8  # keep every column 8-byte aligned
+        layout.append((field, array.dtype.str, offset))
+        offset += array.nbytes
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (field, dtype, start), array in zip(layout, arrays.values()):
+        np.ndarray(array.shape, dtype=dtype, buffer=block.buf, offset=start)[:] = array
+    return block, ColumnsHandle(block.name, len(rows), tuple(layout), vocabularies)
+
+
+def unpack_rows(handle: ColumnsHandle) -> List[Dict[str, Any]]:
+    """Attach to a packed chunk and rebuild its rows (missing values as None)."""
+    block = shared_memory.SharedMemory(name=handle.name)
+    try:
+        columns = {}
+        for field, dtype, offset in handle.layout:
+            array = np.ndarray((handle.length,), dtype=dtype, buffer=block.buf, offset=offset)
+            if field in handle.vocabularies:
+                vocabulary = handle.vocabularies[field] + (None,)  # code -1 picks the None
+                columns[field] = [vocabulary[code] for code in array.tolist()]
+            elif array.dtype.kind == "f":
+                columns[field] = [None if math.isnan(value) else value for value in array.tolist()]
+            elif array.dtype.kind == "U":
+                columns[field] = [value or None for value in array.tolist()]
+            else:
+                columns[field] = array.tolist()
+            del array  # no views may outlive the block
+    finally:
+        block.close()
+    fields = list(columns)
+    return [dict(zip(fields, values)) for values in zip(*columns.values())]
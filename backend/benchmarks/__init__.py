@@ -0,0 +1 @@
+"""Benchmark harnesses (run from the backend directory with `python -m benchmarks.<name>`)."""
@@ -0,0 +1,105 @@
+"""
+Validation analytics benchmark.
+
+Seeds a fresh database with synthetic validations (7 field verdicts each),
+then times a full aggregate refresh (rows/sec), an incremental refresh
+after 1% more validations, and reading the report from the aggregates
+versus a plain GROUP BY over validation_results.
+
+Usage:
+    python -m benchmarks.bench_analytics [--validations 100000] [--database-url URL] [--batch-size 5000]
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import Design, Validation, ValidationResult
+from app.services.analytics import analytics_report, refresh_aggregates
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from uuid import uuid4
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+STANDARDS = ["IEC 60502-1", "IEC 60502-2", "IEC 60228", None]
+SUPPLIERS = [f"Supplier {i}" for i in range(20)]
+START = datetime(2026, 1, 1)
+
+
+def seed(db, count: int, offset: int = 0, seed: int = 11, chunk: int = 5000) -> None:
+    """Insert `count` validations with one verdict per required attribute."""
+    rng = random.Random(seed + offset)
+    if offset == 0:
+        db.execute(insert(Design), [
+            {"id": f"BENCH-{i:04d}", "supplier": SUPPLIERS[i % len(SUPPLIERS)]} for i in range(200)
+        ])
+    for begin in range(offset, offset + count, chunk):
+        validations, results = [], []
+        for i in range(begin, min(begin + chunk, offset + count)):
+            validation_id = uuid4()
+            validations.append({
+                "id": validation_id, "user_input": "synthetic", "route": "FETCH_DESIGN",
+                "design_id": f"BENCH-{rng.randrange(200):04d}", "standard": rng.choice(STANDARDS),
+                "confidence": round(rng.uniform(0.3, 1.0), 2), "hitl_mode": False,
+                "created_at": START + timedelta(milliseconds=i)
+            })
+            for field in REQUIRED_ATTRIBUTES:
+                roll = rng.random()
+                status = "PASS" if roll < 0.8 else "WARN" if roll < 0.92 else "FAIL"
+                results.append({"id": uuid4(), "validation_id": validation_id, "field": field, "status": status})
+        db.execute(insert(Validation), validations)
+        db.execute(insert(ValidationResult), results)
+        db.commit()
+
+
+def timed(fn):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--validations", type=int, default=100_000)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(args.database_url or f"sqlite:///{os.path.join(directory, 'analytics.db')}")
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            _, seconds = timed(lambda: seed(db, args.validations))
+            print(f"Seeded {args.validations} validations "
+                  f"({args.validations * len(REQUIRED_ATTRIBUTES)} results) in {seconds:.1f}s")
+
+            now = START + timedelta(days=1)
+            summary, seconds = timed(lambda: refresh_aggregates(db, now=now, batch_size=args.batch_size, settle_seconds=0))
+            print(f"Full refresh:        {seconds:8.2f}s  {summary['results'] / seconds:>12,.0f} rows/s")
+
+            extra = max(1, args.validations // 100)
+            seed(db, extra, offset=args.validations)
+            summary, seconds = timed(lambda: refresh_aggregates(db, now=now, batch_size=args.batch_size, settle_seconds=0))
+            print(f"Incremental (+{extra}): {seconds:8.3f}s  {summary['results']} new rows")
+
+            report, seconds = timed(lambda: analytics_report(db))
+            print(f"Report from aggregates: {seconds * 1000:8.1f} ms  "
+                  f"(overall fail rate {report['overall']['fail_rate']:.2%})")
+            scan = (select(ValidationResult.field, ValidationResult.status, func.count())
+                    .group_by(ValidationResult.field, ValidationResult.status))
+            _, seconds = timed(lambda: db.execute(scan).all())
+            print(f"GROUP BY over raw results: {seconds * 1000:8.1f} ms (by field only)")
+        finally:
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
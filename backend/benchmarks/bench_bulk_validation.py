@@ -0,0 +1,79 @@
+"""
+Bulk validation process-pool benchmark.
+
+Validates synthetic designs (1M by default) with 1, 2, 4 ... workers and
+reports rows/sec and the speedup over the in-process run. It also reports
+what one chunk costs to send to a worker: pickled row dicts versus the
+shared-memory handle plus the packing time. Speedup is bounded by the
+cores on the host; the printed CPU count says how many there are.
+
+Usage:
+    python -m benchmarks.bench_bulk_validation [--rows 1000000] [--workers 1 2 4] [--chunk-size 10000] [--missing-rate 0.1]
+"""
+from app.services.process_pool import PACKED_FIELDS, ProcessPool, validate_designs
+from app.utils.shared_columns import pack_columns
+from benchmarks.bench_import import synthetic_rows
+import argparse
+import itertools
+import os
+import pickle
+import time
+
+
+def run(rows, workers: int, chunk_size: int) -> float:
+    pool = ProcessPool(workers)
+    try:
+        pool.start()  # spawn cost is paid once per server, not per request
+        started = time.perf_counter()
+        lines = sum(chunk.count(b"\n") for chunk in validate_designs(rows, pool, chunk_size))
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+    assert lines == len(rows), lines
+    return elapsed
+
+
+def transport(rows, chunk_size: int) -> None:
+    chunk = rows[:chunk_size]
+    started = time.perf_counter()
+    pickled = pickle.dumps(chunk, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle.loads(pickled)
+    pickle_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    block, handle = pack_columns(chunk, PACKED_FIELDS)
+    pack_seconds = time.perf_counter() - started
+    try:
+        print(f"Per {len(chunk)}-row chunk: pickled dicts {len(pickled) / 1e6:.2f} MB "
+              f"({pickle_seconds * 1000:.1f} ms round trip); shared memory {block.size / 1e6:.2f} MB, "
+              f"handle {len(pickle.dumps(handle)) / 1e3:.1f} kB, packed in {pack_seconds * 1000:.1f} ms")
+    finally:
+        block.close()
+        block.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Defaults to 1, 2, 4 ... up to the CPU count")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="Share of attributes left empty")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers = args.workers or sorted({1, *itertools.takewhile(lambda n: n <= cpus, (2 ** i for i in range(1, 8))), cpus})
+    rows = list(synthetic_rows(args.rows, missing_rate=args.missing_rate))
+    print(f"{args.rows} designs, {cpus} CPU(s), chunks of {args.chunk_size}")
+    transport(rows, args.chunk_size)
+
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>12}{'speedup':>9}")
+    baseline = None
+    for count in workers:
+        elapsed = run(rows, count, args.chunk_size)
+        baseline = baseline or elapsed
+        print(f"{count:>8}{elapsed:>10.2f}{args.rows / elapsed:>12.0f}{baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
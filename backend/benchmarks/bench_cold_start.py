@@ -0,0 +1,76 @@
+"""
+Worker cold-start benchmark.
+
+Spawns a uvicorn worker and measures the time from process start to the
+first successful /health response, for the current startup and for the
+previous one (create_all at import, emulated by running it before serving).
+
+Usage:
+    python -m benchmarks.bench_cold_start [--runs 5] [--database-url URL]
+
+Pointing --database-url at an unreachable server shows the other half of
+the change: the worker still comes up, where create_all used to hang and
+then crash on boot.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+SERVE = "import uvicorn; uvicorn.run('app.main:app', port={port}, log_level='warning')"
+LEGACY = (
+    "import app.main, uvicorn; from app.database import Base, engine; "
+    "Base.metadata.create_all(bind=engine); "
+    "uvicorn.run(app.main.app, port={port}, log_level='warning')"
+)
+
+
+def time_to_ready(code: str, env: dict, port: int, timeout: float) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", code.format(port=port)], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                return float("nan")  # worker crashed during boot
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=0.5) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        return float("inf")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(directory, 'cold.db')}",
+            "REVALIDATION_ENABLED": "false",
+            "PYTHONPATH": os.getcwd(),
+        }
+        print(f"{'startup':<22}{'median s':>10}{'min s':>10}{'max s':>10}")
+        for label, code in (("migrations (current)", SERVE), ("create_all at import", LEGACY)):
+            samples = [time_to_ready(code, env, args.port, args.timeout) for _ in range(args.runs)]
+            print(f"{label:<22}{statistics.median(samples):>10.3f}{min(samples):>10.3f}{max(samples):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+CRUD throughput benchmark: blocking sessions vs the async engine.
+
+Serves GET /designs/{id} and a filtered list page two ways from the same
+database - the previous style (sync Session used directly inside
+`async def` routes) and the async engine - and drives each with concurrent
+in-process clients.
+
+With SQLAlchemy's default pool (5 + 10 overflow) the blocking style
+deadlocks beyond 15 concurrent requests: the route blocks the event loop
+waiting for a connection that only a (loop-scheduled) dependency teardown
+can return. The baseline therefore gets one pooled connection per client.
+
+Usage:
+    python -m benchmarks.bench_db_throughput [--requests 4000] [--clients 1 16 64]
+    python -m benchmarks.bench_db_throughput --database-url postgresql://user:pw@localhost/cables
+"""
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from app.database import Base, create_async_database_engine, pool_options
+from app.models import Design
+from benchmarks.bench_export import load
+import argparse
+import asyncio
+import httpx
+import os
+import random
+import tempfile
+import time
+
+
+def build_app(sync_factory, async_factory) -> FastAPI:
+    bench = FastAPI()
+
+    def sync_db():
+        db = sync_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def async_db():
+        async with async_factory() as db:
+            yield db
+
+    @bench.get("/sync/{design_id}")
+    async def sync_get(design_id: str, db: Session = Depends(sync_db)):
+        return db.query(Design).filter(Design.id == design_id).first().to_dict()
+
+    @bench.get("/sync-list/{material}")
+    async def sync_list(material: str, db: Session = Depends(sync_db)):
+        stmt = select(Design).where(Design.conductor_material == material).order_by(Design.id).limit(50)
+        return [d.id for d in db.scalars(stmt)]
+
+    @bench.get("/async/{design_id}")
+    async def async_get(design_id: str, db: AsyncSession = Depends(async_db)):
+        return (await db.get(Design, design_id)).to_dict()
+
+    @bench.get("/async-list/{material}")
+    async def async_list(material: str, db: AsyncSession = Depends(async_db)):
+        stmt = select(Design).where(Design.conductor_material == material).order_by(Design.id).limit(50)
+        return [d.id for d in await db.scalars(stmt)]
+
+    return bench
+
+
+async def drive(bench: FastAPI, prefix: str, requests: int, clients: int, rows: int) -> float:
+    rng = random.Random(1)
+    paths = [
+        f"/{prefix}/BENCH-{rng.randrange(rows):07d}" if i % 4 else f"/{prefix}-list/{rng.choice(['Cu', 'Al'])}"
+        for i in range(requests)
+    ]
+    queue = iter(paths)
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for path in queue:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main_async(args, database_url: str):
+    sync_engine = create_engine(
+        database_url, **{**pool_options(database_url), "pool_size": max(args.clients), "max_overflow": 0}
+    )
+    Base.metadata.create_all(bind=sync_engine)
+    sync_factory = sessionmaker(bind=sync_engine)
+    if sync_factory().query(Design).count() < args.rows:
+        load(sync_factory, args.rows)
+    async_engine = create_async_database_engine(database_url)
+    bench = build_app(sync_factory, async_sessionmaker(async_engine, expire_on_commit=False))
+
+    print(f"{'clients':>8}{'sync req/s':>12}{'async req/s':>13}")
+    for clients in args.clients:
+        sync_rps = await drive(bench, "sync", args.requests, clients, args.rows)
+        async_rps = await drive(bench, "async", args.requests, clients, args.rows)
+        print(f"{clients:>8}{sync_rps:>12.0f}{async_rps:>13.0f}")
+    await async_engine.dispose()
+    sync_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directory, 'throughput.db')}"
+        asyncio.run(main_async(args, database_url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Streaming export memory benchmark.
+
+Loads N synthetic designs into a temporary database, streams them through
+stream_export and reports throughput plus peak Python heap (tracemalloc),
+which should stay flat as N grows.
+
+Usage:
+    python -m benchmarks.bench_export [--rows 10000 100000 1000000] [--format ndjson]
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.services.design_import import upsert_designs
+from app.services.export import designs_query, stream_export
+from benchmarks.bench_import import synthetic_rows
+import argparse
+import itertools
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def load(factory, count: int, batch_size: int = 5000) -> None:
+    db = factory()
+    try:
+        rows = synthetic_rows(count)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            upsert_designs(db, batch)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "csv", "parquet", "arrow"])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'seconds':>10}{'rows/s':>12}{'MB out':>10}{'peak heap MB':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.rows:
+            engine = create_engine(f"sqlite:///{os.path.join(directory, f'export_{count}.db')}")
+            Base.metadata.create_all(bind=engine)
+            factory = sessionmaker(bind=engine)
+            load(factory, count)
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            written = 0
+            for chunk in stream_export(factory, designs_query(), args.format, args.chunk_size):
+                written += len(chunk)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            engine.dispose()
+            print(f"{count:>10}{elapsed:>10.2f}{count / elapsed:>12.0f}"
+                  f"{written / 1e6:>10.1f}{peak / 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Hedged LLM request benchmark.
+
+Drives ResilientLLM with the fake provider using a heavy-tailed latency
+distribution and compares p50/p95/p99 with hedging off and on.
+
+Usage:
+    python -m benchmarks.bench_hedging [--calls 2000] [--clients 8]
+"""
+from concurrent.futures import ThreadPoolExecutor
+from app.services.fake_llm import FakeChatModel, tail_latency
+from app.services.llm_client import ResilientLLM, LLM_HEDGES, LLM_HEDGE_WASTED_TOKENS
+import argparse
+import random
+import time
+
+PROMPT = 'Extract cable specifications from text. Return ONLY values explicitly stated.\n\nInput: "IEC 60502-1, 0.6/1 kV, Cu Class 2, 10 mm², PVC 1.0mm"'
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+
+def run(calls: int, clients: int, hedge_percentile, seed: int):
+    model = FakeChatModel(latency=tail_latency(base=0.02, slow=0.5, slow_ratio=0.03, rng=random.Random(seed)))
+    client = ResilientLLM(
+        model,
+        provider=f"bench-{'hedged' if hedge_percentile else 'plain'}",
+        max_concurrency=clients * 2,
+        rate_per_second=0,
+        hedge_percentile=hedge_percentile,
+        hedge_min_samples=50,
+    )
+
+    def one_call(_):
+        started = time.perf_counter()
+        client.invoke(PROMPT, node="extract_from_text")
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = list(pool.map(one_call, range(calls)))
+    return client, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--percentile", type=float, default=95.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'hedge %':>10}{'wasted tok':>12}")
+    for label, pct in (("plain", None), ("hedged", args.percentile)):
+        client, latencies = run(args.calls, args.clients, pct, seed=42)
+        hedges = LLM_HEDGES.value(provider=client.provider, node="extract_from_text")
+        wasted = LLM_HEDGE_WASTED_TOKENS.value(provider=client.provider, node="extract_from_text")
+        print(f"{label:<10}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}"
+              f"{percentile(latencies, 95) * 1000:>10.1f}"
+              f"{percentile(latencies, 99) * 1000:>10.1f}"
+              f"{100.0 * hedges / args.calls:>10.1f}"
+              f"{int(wasted):>12}")
+
+
+if __name__ == "__main__":
+    main()
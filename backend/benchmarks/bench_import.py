@@ -0,0 +1,80 @@
+"""
+Bulk design import benchmark.
+
+Writes synthetic CSV/NDJSON files (synthetic_designs.py) of 10k, 100k and
+1M designs and streams them through import_designs into a fresh database,
+reporting rows/sec.
+
+Usage:
+    python -m benchmarks.bench_import [--rows 10000 100000 1000000] [--database-url URL] [--copy] [--missing-rate 0.1]
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.services.design_import import DESIGN_COLUMNS, import_designs
+from app.services.synthetic_designs import synthetic_designs
+import app.models  # noqa: F401 - registers the tables
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+
+def synthetic_rows(count: int, seed: int = 7, missing_rate: float = 0.0):
+    return synthetic_designs(count, seed=seed, missing_rate=missing_rate, id_prefix="BENCH-")
+
+
+def write_file(directory: str, fmt: str, count: int, missing_rate: float = 0.0) -> str:
+    path = os.path.join(directory, f"designs_{count}.{fmt}")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=DESIGN_COLUMNS)
+            writer.writeheader()
+            writer.writerows(synthetic_rows(count, missing_rate=missing_rate))
+        else:
+            for row in synthetic_rows(count, missing_rate=missing_rate):
+                f.write(json.dumps(row) + "\n")
+    return path
+
+
+def run(path: str, fmt: str, database_url: str, batch_size: int, use_copy: bool):
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        with open(path, encoding="utf-8", newline="") as f:
+            report = import_designs(db, f, fmt, batch_size=batch_size, use_copy=use_copy)
+        return report, time.perf_counter() - started
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", default=["csv", "ndjson"], choices=["csv", "ndjson"])
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--copy", action="store_true", help="Use COPY (PostgreSQL only)")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="Share of attributes left empty")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'format':>8}{'seconds':>10}{'rows/s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        for count in args.rows:
+            for fmt in args.formats:
+                path = write_file(directory, fmt, count, args.missing_rate)
+                report, elapsed = run(path, fmt, database_url, args.batch_size, args.copy)
+                assert report.imported == count, report
+                print(f"{count:>10}{fmt:>8}{elapsed:>10.2f}{count / elapsed:>12.0f}")
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
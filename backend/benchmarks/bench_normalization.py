@@ -0,0 +1,88 @@
+"""
+Attribute normalization benchmark.
+
+1. Replays a synthetic request log (skewed towards popular designs, each
+   request phrased in a random style with random synonyms and units) through
+   ValidationService with the fake LLM, with normalization off and on, and
+   reports how often verdicts were reused instead of asking the LLM.
+2. Times row-by-row vs bulk (column-wise) normalization of import rows.
+
+Usage (unthrottled fake LLM):
+    LLM_PROVIDER=fake LLM_RATE_LIMIT_PER_SECOND=0 \
+        python -m benchmarks.bench_normalization [--requests 5000] [--designs 200] [--rows 200000]
+"""
+from app.config import settings
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.result_cache import result_cache
+from app.services.synthetic_designs import synthetic_requests
+from app.services.validation_service import ValidationService
+from app.utils.normalization import normalization_cache_info, normalize_attributes, normalize_records
+from benchmarks.bench_import import synthetic_rows
+import argparse
+import contextlib
+import os
+import random
+import time
+
+MATERIALS = {"Cu": ["Cu", "copper", "COPPER", "Copper"], "Al": ["Al", "aluminium", "aluminum"]}
+
+
+def replay(log, normalization: bool):
+    prompts = []
+
+    class CountingModel(FakeChatModel):
+        def invoke(self, prompt):
+            prompts.append(prompt)
+            return super().invoke(prompt)
+
+    llm.model = CountingModel()
+    settings.NORMALIZATION_ENABLED = normalization
+    result_cache.clear()
+    service = ValidationService(None)
+    started = time.perf_counter()
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):  # workflow logging
+        for user_input in log:
+            service.run_validation(user_input)
+    elapsed = time.perf_counter() - started
+    validations = sum("cable design validation engineer" in prompt for prompt in prompts)
+    return validations, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--designs", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    designs = list(synthetic_rows(args.designs))
+    log = synthetic_requests(designs, args.requests)
+    distinct = len({tuple(sorted(normalize_attributes(d).items())) for d in designs})
+    print(f"Replay: {args.requests} requests, {len(set(log))} distinct inputs, {distinct} distinct designs")
+    print(f"{'normalization':<14} {'LLM validations':>16} {'verdict reuse':>14} {'seconds':>9}")
+    for enabled in (False, True):
+        validations, elapsed = replay(log, enabled)
+        reuse = 1 - validations / args.requests
+        print(f"{'on' if enabled else 'off':<14} {validations:>16} {reuse:>13.1%} {elapsed:>9.2f}")
+    info = normalization_cache_info()
+    print(f"Value cache: {info.hits} hits / {info.misses} misses ({info.hits / max(1, info.hits + info.misses):.1%})")
+
+    rows = [dict(row, conductor_material=rng.choice(MATERIALS[row["conductor_material"]]),
+                 csa=rng.choice([row["csa"], f"{row['csa']:g} mm²"]))
+            for row in synthetic_rows(args.rows)]
+    started = time.perf_counter()
+    by_row = [normalize_attributes(row) for row in rows]
+    row_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    bulk = normalize_records(rows)
+    bulk_seconds = time.perf_counter() - started
+    assert bulk == by_row
+    print(f"\nImport rows: {args.rows}")
+    print(f"  row by row  {row_seconds:7.3f}s  {args.rows / row_seconds:>10,.0f} rows/s")
+    print(f"  bulk        {bulk_seconds:7.3f}s  {args.rows / bulk_seconds:>10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Deep pagination benchmark for the designs listing.
+
+Loads N synthetic designs and times fetching one page at increasing
+depths with legacy OFFSET paging and with keyset cursors (by id and by
+updated_at, unfiltered and with a material + CSA range filter).
+
+Usage:
+    python -m benchmarks.bench_pagination [--rows 200000] [--limit 100]
+"""
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import Design
+from app.schemas import DesignFilters
+from app.services.design_listing import SORT_KEYS, apply_filters, encode_cursor, list_designs_page
+from benchmarks.bench_export import load
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def timed(fn, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def cursor_at(db, sort: str, filters, depth: int):
+    """Cursor that resumes after the first `depth` matching rows."""
+    if depth == 0:
+        return None
+    stmt = apply_filters(select(Design), filters).order_by(*SORT_KEYS[sort]).offset(depth - 1).limit(1)
+    return encode_cursor(sort, db.scalars(stmt).one())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'pages.db')}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        load(factory, args.rows)
+        db = factory()
+
+        filtered = DesignFilters(conductor_material="Cu", insulation_material="XLPE", csa_min=10, csa_max=150)
+        matching = db.query(Design).filter(
+            Design.conductor_material == "Cu", Design.insulation_material == "XLPE",
+            Design.csa >= 10, Design.csa <= 150
+        ).count()
+        depths = [d for d in (0, 1_000, 10_000, 50_000, 100_000, args.rows - args.limit) if d < args.rows]
+
+        print(f"{args.rows} designs, page size {args.limit}, median of 5 (ms); filter matches {matching} rows")
+        print(f"{'depth':>8}{'offset':>10}{'keyset id':>12}{'keyset upd':>12}{'offset flt':>12}{'keyset flt':>12}")
+        for depth in depths:
+            row = [timed(lambda: list_designs_page(db, limit=args.limit, skip=depth))]
+            for sort in ("id", "updated_at"):
+                cursor = cursor_at(db, sort, None, depth)
+                row.append(timed(lambda: list_designs_page(db, sort=sort, limit=args.limit, cursor=cursor)))
+            flt_depth = min(depth, max(matching - args.limit, 0))
+            row.append(timed(lambda: list_designs_page(db, filtered, limit=args.limit, skip=flt_depth)))
+            cursor = cursor_at(db, "id", filtered, flt_depth)
+            row.append(timed(lambda: list_designs_page(db, filtered, limit=args.limit, cursor=cursor)))
+            print(f"{depth:>8}" + "".join(f"{ms:>12.2f}" if i else f"{ms:>10.2f}" for i, ms in enumerate(row)))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
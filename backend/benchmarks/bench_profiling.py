@@ -0,0 +1,82 @@
+"""
+Profiler overhead benchmark.
+
+Runs uncached validations through ValidationService with the fake LLM
+(small fixed latency) and compares the mean latency with profiling
+disabled, enabled but not sampling this request, and sampling every
+request at the configured interval. Also times the per-request sampling
+decision on its own.
+
+Usage (unthrottled fake LLM):
+    LLM_PROVIDER=fake LLM_RATE_LIMIT_PER_SECOND=0 \
+        python -m benchmarks.bench_profiling [--requests 300] [--interval-ms 5] [--latency-ms 20]
+"""
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.profiling import profiler
+from app.services.result_cache import result_cache
+from app.services.validation_service import ValidationService
+from benchmarks.bench_import import synthetic_rows
+import argparse
+import contextlib
+import os
+import statistics
+import time
+import timeit
+
+
+def spec(design) -> str:
+    return (
+        f"{design['standard']}, {design['voltage']}, {design['conductor_material']} "
+        f"{design['conductor_class']}, {design['csa']:g} mm², "
+        f"{design['insulation_material']} {design['insulation_thickness']:g}mm"
+    )
+
+
+def run(inputs, profile: bool):
+    result_cache.clear()
+    service = ValidationService(None)
+    latencies = []
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):  # workflow logging
+        for user_input in inputs:
+            started = time.perf_counter()
+            service.run_validation(user_input, profile=profile)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    llm.model = FakeChatModel(latency=lambda: args.latency_ms / 1000)
+    inputs = list(dict.fromkeys(spec(design) for design in synthetic_rows(args.requests * 4)))[:args.requests]
+    modes = [
+        ("disabled", dict(enabled=False), False),
+        ("enabled, not sampled", dict(enabled=True, sample_rate=0.0), False),
+        ("sampling every request", dict(enabled=True, interval=args.interval_ms / 1000), True),
+    ]
+    print(f"{len(inputs)} uncached validations, fake LLM latency {args.latency_ms:g} ms, "
+          f"sampling interval {args.interval_ms:g} ms")
+    print(f"{'mode':<24} {'mean ms':>9} {'p95 ms':>9} {'overhead':>9}")
+    baseline = None
+    for name, options, profile in modes:
+        profiler.configure(**options)
+        latencies = run(inputs, profile)
+        mean = statistics.mean(latencies) * 1000
+        p95 = sorted(latencies)[int(0.95 * len(latencies)) - 1] * 1000
+        baseline = baseline or mean
+        print(f"{name:<24} {mean:>9.2f} {p95:>9.2f} {mean / baseline - 1:>+9.1%}")
+    profiler.configure(enabled=False)
+    print(f"Profiles kept: {len(profiler.list())}")
+
+    work = lambda: None
+    per_call = min(timeit.repeat(lambda: profiler.wrap(work, "bench", True), number=100_000, repeat=5)) / 100_000
+    print(f"Disabled wrap() decision: {per_call * 1e9:.0f} ns per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Synthetic design generator script.
+Loads synthetic designs straight into the database, or writes them to a
+CSV/NDJSON file for import_designs.py, optionally with a matching file of
+free-text renderings (one request per line).
+
+Usage:
+    python generate_designs.py --count 1000000 --load
+    python generate_designs.py --count 100000 --missing-rate 0.1 --out designs.ndjson --texts requests.txt
+"""
+from app.database import SessionLocal
+from app.services.design_import import DESIGN_COLUMNS, detect_format
+from app.services.synthetic_designs import load_designs, render_text, synthetic_designs
+import argparse
+import csv
+import json
+import random
+import time
+
+
+def write_designs(path: str, options: dict, count: int) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if detect_format(path) == "csv":
+            writer = csv.DictWriter(f, fieldnames=DESIGN_COLUMNS)
+            writer.writeheader()
+            writer.writerows(synthetic_designs(count, **options))
+        else:
+            for design in synthetic_designs(count, **options):
+                f.write(json.dumps(design) + "\n")
+
+
+def write_texts(path: str, options: dict, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for design in synthetic_designs(count, **options):
+            f.write(render_text(design, rng) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic cable designs")
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="Share of attributes left empty")
+    parser.add_argument("--invalid-rate", type=float, default=0.05, help="Share of designs with a non-IEC size or voltage")
+    parser.add_argument("--id-prefix", default="SYN-")
+    parser.add_argument("--load", action="store_true", help="Upsert into the designs table")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per upsert batch")
+    parser.add_argument("--out", help="CSV or NDJSON file to write")
+    parser.add_argument("--texts", help="File to write one free-text rendering per design to")
+    args = parser.parse_args()
+    if not (args.load or args.out or args.texts):
+        parser.error("nothing to do: pass --load, --out and/or --texts")
+
+    options = dict(seed=args.seed, missing_rate=args.missing_rate,
+                   invalid_rate=args.invalid_rate, id_prefix=args.id_prefix)
+    if args.out:
+        write_designs(args.out, options, args.count)
+        print(f" Wrote {args.count} designs to {args.out}")
+    if args.texts:
+        write_texts(args.texts, options, args.count, args.seed)
+        print(f" Wrote {args.count} renderings to {args.texts}")
+    if args.load:
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            written = load_designs(db, args.count, batch_size=args.batch_size, **options)
+            elapsed = time.perf_counter() - started
+        finally:
+            db.close()
+        print(f" Loaded {written} designs in {elapsed:.2f}s ({written / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
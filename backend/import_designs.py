@@ -0,0 +1,39 @@
+"""
+Bulk design import script.
+Streams a CSV (with header) or NDJSON file of designs into the database.
+
+Usage:
+    python import_designs.py designs.csv
+    python import_designs.py designs.ndjson --batch-size 10000 --copy
+"""
+from app.database import SessionLocal
+from app.services.design_import import detect_format, import_designs
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import cable designs")
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per upsert batch")
+    parser.add_argument("--copy", action="store_true", help="Use COPY (PostgreSQL only)")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8", newline="") as f:
+            report = import_designs(db, f, fmt, batch_size=args.batch_size, use_copy=args.copy or None)
+    finally:
+        db.close()
+
+    print(f" Imported {report.imported}/{report.total_rows} designs "
+          f"in {report.elapsed_seconds}s ({report.rows_per_second} rows/s)")
+    for error in report.errors:
+        print(f"   line {error.line}: {error.error}")
+    if report.errors_truncated:
+        print(f"   ... {report.failed - len(report.errors)} more errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Seeds the database with mock designs from the notebook.
 """
 from app.database import SessionLocal
 from app.models import Design
+from app.services.design_import import upsert_designs
 from app.utils.constants import DESIGN_DATABASE
 
 
@@ -18,15 +19,11 @@ def seed_designs():
             print(f"Database already has {existing_count} designs. Skipping seed.")
             return
         
-        # Seed designs from notebook
-        for design_id, attributes in DESIGN_DATABASE.items():
-            design = Design(
-                id=design_id,
-                **attributes
-            )
-            db.add(design)
-        
-        db.commit()
+        # Seed designs from notebook in a single bulk insert
+        upsert_designs(db, [
+            {"id": design_id, **attributes}
+            for design_id, attributes in DESIGN_DATABASE.items()
+        ])
         print(f" Seeded {len(DESIGN_DATABASE)} designs from notebook")
         
         # Display seeded designs
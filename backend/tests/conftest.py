@@ -0,0 +1,31 @@
+"""
+Shared test fixtures.
+Deployments get their schema from Alembic migrations; tests create it from
+the models in a fresh SQLite file per test.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+import app.models  # noqa: F401 - registers the tables
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine of a new SQLite database with every table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
@@ -0,0 +1,81 @@
+"""
+Tests for admission control of graph executions.
+"""
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.api.deps import get_database
+from app.main import app
+from app.services.admission import AdmissionController, AdmissionRejected
+from app.services.validation_service import ValidationService
+
+
+def test_interactive_lane_is_served_first():
+    """When a slot frees up, queued interactive work goes ahead of earlier batch work."""
+    controller = AdmissionController(max_inflight=1, max_queue=8, queue_timeout=5)
+    order = []
+
+    def run(lane):
+        with controller.slot(lane):
+            order.append(lane)
+
+    with controller.slot("interactive"):
+        threads = [threading.Thread(target=run, args=(lane,)) for lane in ("background", "batch", "interactive")]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)  # deterministic queue order
+        assert controller.status() == {"inflight": 1, "interactive": 1, "batch": 1, "background": 1}
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["interactive", "batch", "background"]
+    assert controller.status()["inflight"] == 0
+
+
+def test_full_queue_sheds_lower_lanes_first():
+    """Batch may only fill half the queue (429); queued work is shed with 503 once it waited too long."""
+    controller = AdmissionController(max_inflight=1, max_queue=2, queue_timeout=0.1)
+
+    def queued_batch():
+        with pytest.raises(AdmissionRejected):
+            with controller.slot("batch"):
+                pass
+
+    with controller.slot("interactive"):
+        waiter = threading.Thread(target=queued_batch)
+        waiter.start()
+        time.sleep(0.02)
+
+        with pytest.raises(AdmissionRejected) as shed:
+            with controller.slot("batch"):
+                pass
+        assert shed.value.status_code == 429 and shed.value.retry_after >= 1
+
+        with pytest.raises(AdmissionRejected) as timed_out:
+            with controller.slot("interactive"):
+                pass
+        assert timed_out.value.status_code == 503
+        waiter.join(5)
+    assert controller.status() == {"inflight": 0, "interactive": 0, "batch": 0, "background": 0}
+
+
+def test_shed_request_gets_retry_after(monkeypatch):
+    """The validate endpoint maps a shed execution to 429 with Retry-After."""
+    async def shed(self, user_input, hitl_mode=False, lane="interactive", **options):
+        assert lane == "batch"
+        raise AdmissionRejected("Server is busy (queue_full); retry later", 429, 7)
+
+    monkeypatch.setattr(ValidationService, "arun_validation", shed)
+    app.dependency_overrides[get_database] = lambda: None
+    try:
+        response = TestClient(app).post(
+            "/api/validations/validate",
+            json={"user_input": "Validate DESIGN-001"},
+            headers={"X-Priority": "batch"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
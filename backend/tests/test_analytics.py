@@ -0,0 +1,111 @@
+"""
+Tests for the columnar validation analytics and its materialized aggregates.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+from fastapi.testclient import TestClient
+from app.api.deps import get_database
+from app.config import settings
+from app.main import app
+from app.models import Design, Validation, ValidationResult
+from app.services import llm
+from app.services.analytics import aggregate, analytics_report, latest_refresh, refresh_aggregates
+from app.services.fake_llm import FakeChatModel
+from app.services.result_cache import result_cache
+
+START = datetime(2026, 1, 1)
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+def add_validation(db, seconds, statuses, standard="IEC 60502-1", design_id=None, confidence=0.9):
+    validation = Validation(user_input="spec", standard=standard, design_id=design_id,
+                            confidence=confidence, created_at=START + timedelta(seconds=seconds))
+    for field, status in statuses.items():
+        validation.results.append(ValidationResult(field=field, status=status))
+    db.add(validation)
+
+
+def test_batch_aggregation_is_column_wise():
+    """Counts per field/standard, confidence bins (edges included) and fields failing together."""
+    columns = {
+        "validation": np.array(["a", "a", "a", "b", "b", "c"]),
+        "standard": np.array(["IEC 60502-1"] * 3 + [""] * 3),
+        "supplier": np.array(["Acme"] * 3 + [""] * 3),
+        "confidence": np.array([0.3, 0.3, 0.3, 0.95, 0.95, np.nan]),
+        "field": np.array(["csa", "voltage", "insulation_thickness", "voltage", "csa", "csa"]),
+        "status": np.array(["FAIL", "PASS", "FAIL", "FAIL", "FAIL", "WARN"]),
+    }
+    counts = aggregate(columns)
+    assert counts[("field", "csa", "", "FAIL")] == 2 and counts[("field", "csa", "", "WARN")] == 1
+    assert counts[("standard", "IEC 60502-1", "insulation_thickness", "FAIL")] == 1
+    assert counts[("supplier", "", "voltage", "FAIL")] == 1
+    assert counts[("validations", "", "", "")] == 3
+    assert counts[("confidence", "0.3", "", "")] == 1 and counts[("confidence", "0.9", "", "")] == 1
+    assert counts[("failing_combination", "csa+insulation_thickness", "", "")] == 1
+    assert counts[("failing_combination", "csa+voltage", "", "")] == 1
+
+
+def test_refresh_is_incremental_and_claims_each_watermark_once(session_factory, monkeypatch):
+    """Only new, settled validations are folded in; a concurrent refresh of the same range is dropped."""
+    factory = session_factory
+    db = factory()
+    db.add(Design(id="DESIGN-001", supplier="Acme"))
+    add_validation(db, 1, {"csa": "PASS", "voltage": "FAIL"}, design_id="DESIGN-001")
+    add_validation(db, 2, {"csa": "FAIL", "voltage": "WARN"}, standard=None, confidence=0.4)
+    add_validation(db, 3, {"csa": "PASS"})
+    db.commit()
+
+    # Tiny batches: validations are never split across them
+    assert refresh_aggregates(db, now=START + timedelta(seconds=12.5), batch_size=1, settle_seconds=10) == \
+        {"validations": 2, "results": 4}
+    stale = SimpleNamespace(**{column: getattr(latest_refresh(db), column)
+                               for column in ("id", "watermark_created_at", "watermark_validation_id")})
+    assert refresh_aggregates(db, now=START + timedelta(seconds=60), settle_seconds=10) == \
+        {"validations": 1, "results": 1}
+
+    add_validation(db, 4, {"csa": "FAIL", "voltage": "FAIL"}, design_id="DESIGN-001")
+    db.commit()
+    assert refresh_aggregates(db, now=START + timedelta(seconds=60), settle_seconds=0) == \
+        {"validations": 1, "results": 2}
+    report_before = analytics_report(db)
+    # A worker that read the watermark before those refreshes committed loses the race
+    monkeypatch.setattr("app.services.analytics.latest_refresh", lambda session: stale)
+    assert refresh_aggregates(db, now=START + timedelta(seconds=60), settle_seconds=0) is None
+    monkeypatch.undo()
+
+    report = analytics_report(db)
+    assert report == report_before and report["validations"] == 4
+    assert report["by_field"]["csa"]["failed"] == 2 and report["by_field"]["csa"]["fail_rate"] == 0.5
+    assert report["by_supplier"]["Acme"]["total"] == 4 and report["by_standard"]["unknown"]["warned"] == 1
+    assert {"fields": ["csa", "voltage"], "count": 1} in report["top_failing_combinations"]
+    assert sum(item["count"] for item in report["confidence"]) == 4
+    db.close()
+
+
+def test_stored_validations_reach_the_analytics_endpoint(session_factory, monkeypatch):
+    """Persisted verdicts carry their standard; an admin refresh makes them reportable."""
+    monkeypatch.setattr(llm, "model", FakeChatModel())
+    monkeypatch.setattr(settings, "ANALYTICS_SETTLE_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    result_cache.clear()
+    factory = session_factory
+    app.dependency_overrides[get_database] = lambda: factory()
+    client = TestClient(app)
+    try:
+        client.post("/api/validations/validate", json={"user_input": "IEC 60502-1, 0.6/1 kV, Cu Class 2, 16 mm², PVC"})
+        assert client.get("/api/validations/analytics").json()["validations"] == 0
+
+        refreshed = client.post("/api/admin/analytics/refresh", headers=ADMIN).json()
+        assert refreshed == {"refreshed": True, "validations": 1, "results": 7}
+        report = client.get("/api/validations/analytics").json()
+        assert report["by_standard"]["IEC 60502-1"]["total"] == 7
+        assert report["overall"]["total"] == 7 and report["by_field"]["csa"]["passed"] == 1
+        assert report["refreshed_at"] is not None
+
+        rebuilt = client.post("/api/admin/analytics/refresh", params={"rebuild": True}, headers=ADMIN).json()
+        assert rebuilt["validations"] == 1
+        assert client.get("/api/validations/analytics").json()["overall"] == report["overall"]
+    finally:
+        app.dependency_overrides.clear()
+        result_cache.clear()
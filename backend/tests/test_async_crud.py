@@ -0,0 +1,48 @@
+"""
+Tests for the async engine configuration and the async design CRUD routes.
+"""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.api.deps import get_async_database
+from app.database import Base, async_database_url, create_async_database_engine
+from app.main import app
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+
+def test_async_database_url():
+    assert async_database_url("postgresql://u:p@db/cables") == "postgresql+asyncpg://u:p@db/cables"
+    assert async_database_url("postgresql+psycopg2://u:p@db/cables") == "postgresql+asyncpg://u:p@db/cables"
+    assert async_database_url("sqlite:///./local.db") == "sqlite+aiosqlite:///./local.db"
+    assert async_database_url("sqlite+aiosqlite:///./local.db") == "sqlite+aiosqlite:///./local.db"
+
+
+@pytest.fixture
+def client(tmp_path):
+    """App client whose CRUD routes use an async engine on a temporary SQLite file."""
+    engine = create_async_database_engine(f"sqlite:///{tmp_path / 'async.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    asyncio.run(create_tables())
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override():
+        async with factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_database] = override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    asyncio.run(engine.dispose())
+
+
+def test_crud_round_trip(client):
+    assert client.post("/api/designs/", json={"id": "ASYNC-1", "csa": 10}).status_code == 201
+    assert client.post("/api/designs/", json={"id": "ASYNC-1"}).status_code == 400
+    updated = client.put("/api/designs/ASYNC-1", json={"insulation_material": "XLPE"}).json()
+    assert updated["csa"] == 10 and updated["insulation_material"] == "XLPE"
+    assert [d["id"] for d in client.get("/api/designs/", params={"insulation_material": "XLPE"}).json()] == ["ASYNC-1"]
+    assert client.delete("/api/designs/ASYNC-1").status_code == 204
+    assert client.get("/api/designs/ASYNC-1").status_code == 404
@@ -0,0 +1,78 @@
+"""
+Tests for process-pool bulk validation and its shared-memory transport.
+"""
+import json
+import os
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.process_pool import ProcessPool, validate_designs
+from app.utils.iec_rules import evaluate_attributes
+from app.utils.normalization import normalize_attributes
+from app.utils.shared_columns import pack_columns, unpack_rows
+
+ROWS = [
+    {"id": f"BULK-{i:03d}", "standard": "IEC 60502-1", "voltage": ["0.6/1 kV", "600/1000 V", None][i % 3],
+     "conductor_material": ["Cu", "copper", "Al"][i % 3], "conductor_class": "Class 2",
+     "csa": [16, "16 mm²", 25.0, 7][i % 4], "insulation_material": ["PVC", "XLPE"][i % 2],
+     "insulation_thickness": [1.0, 0.8, None, 1.2][i % 4]}
+    for i in range(40)
+]
+
+
+def shared_segments():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")} if os.path.isdir("/dev/shm") else set()
+
+
+def test_shared_columns_round_trip():
+    """Integers, floats with gaps, coded categories, unique IDs and nested JSON survive packing."""
+    rows = [
+        {"id": "A-1", "csa": 16, "line": 2, "voltage": "0.6/1 kV", "extra": {"nested": 1}},
+        {"id": "A-2", "csa": None, "line": 3, "voltage": "0.6/1 kV", "extra": None},
+        {"id": "A-3", "csa": 2.5, "line": 4, "voltage": None, "extra": [1, 2]},
+    ]
+    block, handle = pack_columns(rows, ["id", "csa", "line", "voltage", "extra"])
+    try:
+        kinds = {field: dtype for field, dtype, _ in handle.layout}
+        assert kinds["line"] == "<i8" and kinds["csa"] == "<f8" and kinds["id"].startswith("<U")
+        assert handle.vocabularies == {"voltage": ("0.6/1 kV",)}
+        assert unpack_rows(handle) == [
+            {"id": "A-1", "csa": 16.0, "line": 2, "voltage": "0.6/1 kV", "extra": "{'nested': 1}"},
+            {"id": "A-2", "csa": None, "line": 3, "voltage": "0.6/1 kV", "extra": None},
+            {"id": "A-3", "csa": 2.5, "line": 4, "voltage": None, "extra": "[1, 2]"},
+        ]
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_process_pool_output_matches_inline():
+    """Chunks validated by two worker processes give the in-process bytes, in order, without leaks."""
+    before = shared_segments()
+    inline = b"".join(validate_designs(ROWS, ProcessPool(1), chunk_size=7))
+    pool = ProcessPool(2)
+    try:
+        assert b"".join(validate_designs(ROWS, pool, chunk_size=7)) == inline
+    finally:
+        pool.shutdown()
+    assert shared_segments() == before
+
+    lines = [json.loads(line) for line in inline.splitlines()]
+    assert [line["design_id"] for line in lines] == [row["id"] for row in ROWS]
+    for row, line in zip(ROWS, lines):
+        assert line["validation"] == evaluate_attributes(normalize_attributes(row))
+    assert lines[2]["missing_attributes"] == ["voltage", "insulation_thickness"]
+    assert lines[3]["status"] == "FAIL"  # 7 mm² is not a nominal size
+
+
+def test_validate_bulk_endpoint_streams_verdicts_and_row_errors():
+    """NDJSON upload: one verdict per design, bad lines reported by number."""
+    body = "\n".join([json.dumps(ROWS[0]), "{not json", json.dumps([1, 2]), json.dumps(ROWS[3])]) + "\n"
+    response = TestClient(app).post(
+        "/api/designs/validate-bulk", files={"file": ("designs.ndjson", body, "application/x-ndjson")}
+    )
+    assert response.status_code == 200
+    lines = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda line: line["line"])
+    assert [line["line"] for line in lines] == [1, 2, 3, 4]
+    assert lines[0]["status"] == "PASS" and lines[0]["attributes"]["csa"] == 16.0
+    assert lines[1]["error"].startswith("Invalid JSON") and lines[2]["error"] == "Row is not an object"
+    assert lines[3]["design_id"] == "BULK-003" and lines[3]["status"] == "FAIL"
@@ -0,0 +1,169 @@
+"""
+Tests for the shared cache backends (memory, SQLite, Redis protocol).
+"""
+import socketserver
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.services.cache import Cache, MemoryBackend, RESPBackend, SQLiteBackend, check_backend_sharing, namespace_cache
+from app.services.result_cache import ResultCache
+
+STATE = {"route": "FETCH_DESIGN", "attributes": {"csa": 16.0, "conductor_class": None},
+         "validation": [{"field": "csa", "status": "PASS"}], "confidence": 0.9}
+
+
+class RESPStandIn(socketserver.ThreadingTCPServer):
+    """Just enough of a Redis-protocol server for the RESP backend: GET, SET [PX] [NX], DEL, INCR, SCAN."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), RESPHandler)
+
+    def value(self, key):
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and time.monotonic() > entry[1]:
+            del self.data[key]
+            return None
+        return entry[0] if entry is not None else None
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def bulk(self, value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        server = self.server
+        while (args := self.read_command()) is not None:
+            command, keys = args[0].upper(), args[1:]
+            with server.lock:
+                if command == b"GET":
+                    reply = self.bulk(server.value(keys[0]))
+                elif command == b"SET":
+                    options = [option.upper() for option in keys[2:]]
+                    expires = time.monotonic() + int(keys[3]) / 1000 if b"PX" in options else None
+                    if b"NX" in options and server.value(keys[0]) is not None:
+                        reply = b"$-1\r\n"
+                    else:
+                        server.data[keys[0]] = (keys[1], expires)
+                        reply = b"+OK\r\n"
+                elif command == b"DEL":
+                    reply = b":%d\r\n" % sum(server.data.pop(key, None) is not None for key in keys)
+                elif command == b"INCR":
+                    value = int(server.value(keys[0]) or 0) + 1
+                    server.data[keys[0]] = (str(value).encode(), None)
+                    reply = b":%d\r\n" % value
+                elif command == b"SCAN":
+                    prefix = keys[2].rstrip(b"*")
+                    matches = [key for key in server.data if key.startswith(prefix)]
+                    reply = b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(matches) + b"".join(map(self.bulk, matches))
+                else:
+                    reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def resp_server():
+    server = RESPStandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "resp"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+        yield backend
+        backend.close()
+    else:
+        server = request.getfixturevalue("resp_server")
+        backend = RESPBackend(f"redis://127.0.0.1:{server.server_address[1]}/0")
+        yield backend
+        backend.close()
+
+
+def test_backend_contract(backend):
+    """Round trip with private copies, TTL expiry, counters and per-namespace clear."""
+    results, llm = Cache(backend, "results", ttl=60), Cache(backend, "llm")
+    assert results.get(("design", "DESIGN-001")) is None
+    results.set(("design", "DESIGN-001"), STATE)
+    cached = results.get(("design", "DESIGN-001"))
+    assert cached == STATE and cached is not STATE
+
+    results.set("short-lived", STATE, ttl=0.05)
+    time.sleep(0.1)
+    assert results.get("short-lived") is None
+
+    assert [results.incr("generation"), results.incr("generation")] == [1, 2]
+    assert results.counter("generation") == 2
+    assert results.add("claim", 1) and not results.add("claim", 2)
+
+    llm.set("prompt", "answer")
+    results.clear()
+    assert results.get(("design", "DESIGN-001")) is None and results.counter("generation") == 0
+    assert llm.get("prompt") == "answer"
+    assert results.stats()["hits"] == 1 and results.stats()["errors"] == 0
+
+
+def test_sqlite_backend_shares_results_and_invalidation_between_workers(tmp_path):
+    """Two workers on one SQLite file: one stores, the other reads and invalidates."""
+    path = str(tmp_path / "cache.sqlite3")
+
+    def worker():
+        backend = SQLiteBackend(path)
+        return ResultCache(Cache(backend, "results", ttl=60), Cache(backend, "generations"))
+
+    first, second = worker(), worker()
+    first.set(("design", "DESIGN-001"), STATE, design_id="DESIGN-001")
+    assert second.get(("design", "DESIGN-001")) == STATE
+
+    generation = first.generation("DESIGN-001")
+    second.invalidate_design("DESIGN-001")
+    assert first.get(("design", "DESIGN-001")) is None
+    assert first.previous_for_design("DESIGN-001") == STATE  # seed for re-validation
+    assert not first.set(("design", "DESIGN-001"), STATE, design_id="DESIGN-001", generation=generation)
+
+
+def test_unreachable_backend_degrades_to_misses(monkeypatch):
+    """A cache outage costs hit rate, not requests; errors are counted and reported."""
+    with socketserver.TCPServer(("127.0.0.1", 0), socketserver.BaseRequestHandler) as probe:
+        port = probe.server_address[1]  # closed again once the block exits
+    cache = Cache(RESPBackend(f"redis://127.0.0.1:{port}/0", timeout=0.2), "results")
+    assert cache.get("key", default="fallback") == "fallback"
+    assert cache.set("key", STATE) is False
+    assert cache.incr("generation") is None
+    assert cache.stats()["errors"] == 3
+
+    namespace_cache("results").get(("text", "warm the stats"))
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    admin = {"X-Admin-Token": "secret"}
+    stats = {item["namespace"]: item for item in TestClient(app).get("/api/admin/cache", headers=admin).json()}
+    assert stats["results"]["backend"] == "memory" and stats["results"]["misses"] >= 1
+
+
+def test_memory_backend_is_refused_with_several_workers(tmp_path):
+    """Generation counters in process memory cannot invalidate other workers' entries."""
+    check_backend_sharing(MemoryBackend(), 1)
+    check_backend_sharing(SQLiteBackend(str(tmp_path / "cache.sqlite3")), 4)
+    with pytest.raises(RuntimeError, match="CACHE_BACKEND=memory with 4 workers"):
+        check_backend_sharing(MemoryBackend(), 4)
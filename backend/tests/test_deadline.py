@@ -0,0 +1,114 @@
+"""
+Tests for per-request deadlines and cancellation.
+"""
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.api.deps import get_database
+from app.main import app
+from app.services import llm
+from app.services.deadline import Deadline, RequestDeadlineExceeded
+from app.services.fake_llm import FakeChatModel
+from app.services.llm_client import CircuitBreaker, ResilientLLM
+from app.services.result_cache import result_cache
+from app.services.validation_service import ValidationService, result_cache_key
+
+SPEC = "IEC 60502-1, 0.6/1 kV, Cu Class 2, 16 mm², PVC 1.0mm"
+
+
+class SlowValidationModel(FakeChatModel):
+    """Fast everywhere except the validation prompt."""
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        if "cable design validation engineer" in prompt:
+            time.sleep(self.seconds)
+        return super().invoke(prompt)
+
+
+def test_llm_call_stops_at_deadline_or_cancellation():
+    """Out of budget: fallback if there is one, else RequestDeadlineExceeded; the breaker stays closed."""
+    client = ResilientLLM(SlowValidationModel(2.0), provider="test", rate_per_second=0, backoff_base=0)
+    prompt = "You are an expert cable design validation engineer."
+
+    started = time.monotonic()
+    response = client.invoke(prompt, node="validate", fallback=lambda: "{}", deadline=Deadline(0.2))
+    assert response.content == "{}"
+    assert time.monotonic() - started < 1.0
+
+    deadline = Deadline(30)
+    threading.Timer(0.2, deadline.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(RequestDeadlineExceeded) as cancelled:
+        client.invoke(prompt, node="validate", deadline=deadline)
+    assert cancelled.value.cancelled
+    assert time.monotonic() - started < 1.0
+    assert client.breaker.state == "closed"
+
+
+def test_deadline_releases_half_open_probe():
+    """A half-open probe cut off by the deadline is given back; the next call still reaches the provider."""
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    model = SlowValidationModel(0.3)
+    client = ResilientLLM(model, provider="test", rate_per_second=0, backoff_base=0, breaker=breaker)
+    prompt = "You are an expert cable design validation engineer."
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    response = client.invoke(prompt, node="validate", fallback=lambda: "{}", deadline=Deadline(0.05))
+    assert response.content == "{}"
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    calls = len(model.prompts)
+    assert client.invoke(prompt, node="validate").content != "{}"
+    assert len(model.prompts) == calls + 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_expired_deadline_returns_partial_response(monkeypatch):
+    """A slow validation call is cut off; unvalidated fields come back as WARN and nothing is cached."""
+    monkeypatch.setattr(llm, "model", SlowValidationModel(1.0))
+    result_cache.clear()
+    app.dependency_overrides[get_database] = lambda: None
+    try:
+        started = time.monotonic()
+        response = TestClient(app).post(
+            "/api/validations/validate",
+            json={"user_input": SPEC},
+            headers={"X-Request-Timeout": "0.3"}
+        )
+        elapsed = time.monotonic() - started
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200 and elapsed < 1.0
+    body = response.json()
+    assert body["partial"] is True
+    assert body["skipped"] == ["narrative", "validation"]
+    assert {item["status"] for item in body["validation"]} == {"WARN"}
+    assert all(item["comment"].startswith("Not validated") for item in body["validation"])
+    assert result_cache.get(result_cache_key(SPEC)) is None
+
+
+def test_short_budget_skips_narrative(monkeypatch):
+    """Below DEADLINE_NARRATIVE_MIN_SECONDS the validation prompt asks for verdicts only."""
+    model = SlowValidationModel(0.0)
+    monkeypatch.setattr(llm, "model", model)
+    result_cache.clear()
+    try:
+        result = ValidationService(None).run_validation(SPEC, deadline=Deadline(5))
+    finally:
+        result_cache.clear()
+
+    validation_prompt = next(p for p in model.prompts if "cable design validation engineer" in p)
+    assert "**TIME BUDGET:** short" in validation_prompt
+    assert result["skipped_steps"] == ["narrative"]
+    assert not result.get("partial")
+    assert {item["status"] for item in result["validation"]} == {"PASS"}
@@ -0,0 +1,84 @@
+"""
+Tests for streaming bulk import of designs.
+"""
+import io
+from sqlalchemy.exc import OperationalError
+from app.models import Design
+from app.services import design_import
+from app.services.design_import import detect_format, import_designs
+
+
+CSV_DATA = (
+    "id,standard,voltage,conductor_material,conductor_class,csa,insulation_material,insulation_thickness\n"
+    "IMP-1,IEC 60502-1,0.6/1 kV,Cu,Class 2,10,PVC,1.0\n"
+    "IMP-2,IEC 60502-1,0.6/1 kV,Al,Class 2,not-a-number,XLPE,0.7\n"
+    "IMP-3,IEC 60502-1,0.6/1 kV,Cu,,16,XLPE,\n"
+)
+
+
+def test_detect_format():
+    assert detect_format("designs.csv") == "csv"
+    assert detect_format("designs.jsonl") == "ndjson"
+    assert detect_format(None, "application/x-ndjson") == "ndjson"
+
+
+def test_csv_import_reports_row_errors(db):
+    """Valid rows are written across batches; invalid rows are reported by line."""
+    batches = []
+    report = import_designs(db, io.StringIO(CSV_DATA), "csv", batch_size=1, on_batch=batches.append)
+
+    assert (report.total_rows, report.imported, report.failed) == (3, 2, 1)
+    assert report.errors[0].line == 3 and "csa" in report.errors[0].error
+    assert batches == [["IMP-1"], ["IMP-3"]]
+    partial = db.query(Design).filter(Design.id == "IMP-3").first()
+    assert partial.conductor_class is None and partial.insulation_thickness is None
+
+
+def test_ndjson_import_upserts_existing(db):
+    """Re-importing an ID updates it in place; the last duplicate in a batch wins."""
+    db.add(Design(id="IMP-1", standard="IEC 60502-1", csa=10))
+    db.commit()
+    data = (
+        '{"id": "IMP-1", "csa": 25, "insulation_material": "XLPE"}\n'
+        '{"id": "IMP-4", "csa": 35}\n'
+        '{"id": "IMP-4", "csa": 50}\n'
+        '{broken\n'
+        '\n'
+        '[1, 2]\n'
+    )
+    report = import_designs(db, io.StringIO(data), "ndjson", max_errors=1)
+
+    assert report.imported == 2 and report.failed == 2
+    assert report.errors_truncated and report.errors[0].line == 4
+    db.expire_all()
+    assert db.query(Design).filter(Design.id == "IMP-1").first().csa == 25
+    assert db.query(Design).filter(Design.id == "IMP-4").first().csa == 50
+    assert db.query(Design).count() == 2
+
+
+def test_overlong_values_and_rejected_batches_are_reported(db, monkeypatch):
+    """Values longer than their column fail validation; a batch the database rejects is rolled back."""
+    real_upsert = design_import.upsert_designs
+
+    def upsert(db, batch, use_copy=False):
+        if any(row["id"] == "IMP-9" for row in batch):
+            raise OperationalError("INSERT", {}, Exception("value too long"))
+        return real_upsert(db, batch, use_copy=use_copy)
+
+    monkeypatch.setattr(design_import, "upsert_designs", upsert)
+    data = (
+        '{"id": "IMP-5", "csa": 10}\n'
+        '{"id": "IMP-6", "csa": 16}\n'
+        '{"id": "IMP-7", "supplier": "' + "x" * 101 + '"}\n'
+        '{"id": "IMP-8", "csa": 25}\n'
+        '{"id": "IMP-9", "csa": 35}\n'
+    )
+    batches = []
+    report = import_designs(db, io.StringIO(data), "ndjson", batch_size=2, on_batch=batches.append)
+
+    assert (report.imported, report.failed) == (2, 3)
+    assert report.errors[0].line == 3 and "supplier" in report.errors[0].error
+    assert [error.line for error in report.errors[1:]] == [4, 5]
+    assert "lines 4-5" in report.errors[1].error
+    assert batches == [["IMP-5", "IMP-6"]]
+    assert sorted(design.id for design in db.query(Design)) == ["IMP-5", "IMP-6"]
@@ -0,0 +1,83 @@
+"""
+Tests for nearest-neighbor suggestions of missing attributes.
+"""
+import pytest
+from app.config import settings
+from app.langgraph.nodes.check_missing import check_missing_attributes
+from app.langgraph.nodes.infer_missing import infer_missing_attributes
+from app.langgraph.nodes.hitl import ask_missing_attribute
+from app.services.design_index import DesignIndex, design_index
+
+XLPE_16 = {
+    "standard": "IEC 60502-1", "voltage": "0.6/1 kV", "conductor_material": "Cu",
+    "conductor_class": "Class 2", "csa": 16, "insulation_material": "XLPE", "insulation_thickness": 0.7,
+}
+PVC_16 = dict(XLPE_16, insulation_material="PVC", insulation_thickness=1.0)
+PVC_95 = dict(PVC_16, csa=95, insulation_thickness=1.6)
+
+
+def test_suggests_values_supported_by_nearest_designs():
+    index = DesignIndex(neighbors=5, min_support=3)
+    for _ in range(4):
+        index.add(PVC_16)
+    index.add(XLPE_16)
+    index.add(PVC_95)
+    assert len(index) == 3  # identical designs share a row
+
+    suggestions = index.suggest(
+        {"csa": 16, "conductor_material": "copper", "insulation_material": "pvc"},
+        ["insulation_thickness", "conductor_class", "standard"]
+    )
+    assert suggestions["insulation_thickness"]["value"] == 1.0
+    assert suggestions["insulation_thickness"]["support"] == 4
+    assert suggestions["conductor_class"] == {"value": "Class 2", "support": 6, "confidence": 1.0}
+
+
+def test_designs_differing_only_in_voltage_stay_apart():
+    """Voltage strings are compared as text, not collapsed by a failed float conversion."""
+    index = DesignIndex(neighbors=10, min_support=3)
+    index.add(PVC_16)
+    for _ in range(5):
+        index.add(dict(PVC_16, voltage="6/10 kV"))
+    assert len(index) == 2
+
+    base = {field: value for field, value in PVC_16.items() if field != "voltage"}
+    assert index.suggest(base, ["voltage"])["voltage"] == {"value": "6/10 kV", "support": 5, "confidence": 0.83}
+
+
+def test_no_suggestions_without_support_or_known_fields():
+    index = DesignIndex(neighbors=5, min_support=3)
+    index.add(PVC_16)
+    assert index.suggest({"csa": 16}, ["insulation_thickness"]) == {}
+    assert index.suggest({}, ["csa"]) == {}
+    assert not index.add(dict(PVC_16, insulation_thickness=None))
+
+
+@pytest.fixture
+def seeded_index():
+    design_index.clear()
+    for _ in range(3):
+        design_index.add(PVC_16)
+    yield design_index
+    design_index.clear()
+
+
+def test_accepted_suggestions_skip_the_parse_call(seeded_index, monkeypatch):
+    """One-click confirm fills the fields from the suggestions without the LLM."""
+    def fail(*args, **kwargs):
+        raise AssertionError("parse LLM call not expected")
+    monkeypatch.setattr("app.langgraph.nodes.hitl.parse_single_attribute_with_llm", fail)
+    monkeypatch.setattr(settings, "INFERENCE_ENABLED", False)
+
+    attributes = dict(PVC_16, insulation_thickness=None, conductor_class=None)
+    state = infer_missing_attributes(check_missing_attributes({
+        "attributes": attributes, "hitl_mode": True, "accept_suggestions": True,
+        "hitl_responses": {"conductor_class": "class 2"},
+    }))
+    assert set(state["attribute_suggestions"]) == {"insulation_thickness", "conductor_class"}
+    assert state["hitl_responses"] == {"conductor_class": "class 2", "insulation_thickness": "1.0"}
+
+    state = ask_missing_attribute(state)
+    assert state["attributes"]["insulation_thickness"] == 1.0
+    assert state["attributes"]["conductor_class"] == "Class 2"
+    assert state["missing_attributes"] == []
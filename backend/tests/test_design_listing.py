@@ -0,0 +1,56 @@
+"""
+Tests for keyset pagination and filters on the designs listing.
+"""
+import pytest
+from datetime import datetime, timedelta
+from app.models import Design
+from app.schemas import DesignFilters
+from app.services.design_listing import InvalidCursorError, list_designs_page
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    stamp = datetime(2025, 1, 1)
+    for i in range(25):
+        session.add(Design(
+            id=f"LST-{i:03d}", csa=float(i), conductor_material="Cu" if i % 2 else "Al",
+            insulation_material="PVC", standard="IEC 60502-1", voltage="0.6/1 kV",
+            # Pairs of designs share a timestamp so id must break the tie
+            created_at=stamp, updated_at=stamp + timedelta(seconds=(24 - i) // 2)
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def walk(db, **kwargs):
+    pages, cursor = [], None
+    while True:
+        designs, cursor = list_designs_page(db, cursor=cursor, **kwargs)
+        pages.append([design.id for design in designs])
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_cover_filtered_rows_once(db):
+    filters = DesignFilters(conductor_material="Cu", csa_min=4, csa_max=20)
+    pages = walk(db, filters=filters, limit=3)
+    ids = [design_id for page in pages for design_id in page]
+    assert ids == [f"LST-{i:03d}" for i in range(5, 21, 2)]
+    assert [len(page) for page in pages] == [3, 3, 2]
+
+
+def test_updated_at_order_breaks_ties_on_id(db):
+    """Every row appears exactly once even when updated_at values repeat."""
+    ids = [design_id for page in walk(db, sort="updated_at", limit=4) for design_id in page]
+    assert len(ids) == len(set(ids)) == 25
+    assert ids[:2] == ["LST-023", "LST-024"]
+
+
+def test_cursor_is_bound_to_sort_order(db):
+    _, cursor = list_designs_page(db, limit=5)
+    with pytest.raises(InvalidCursorError):
+        list_designs_page(db, sort="updated_at", cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        list_designs_page(db, cursor="not-a-cursor")
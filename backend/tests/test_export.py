@@ -0,0 +1,44 @@
+"""
+Tests for streaming export of designs and validation results.
+"""
+import csv
+import io
+import json
+import pytest
+from app.models import Validation, ValidationResult
+from app.services.design_import import upsert_designs
+from app.services.export import designs_query, stream_export, validation_results_query
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    """The shared factory, seeded with designs and one stored validation."""
+    factory = session_factory
+    db = factory()
+    upsert_designs(db, [{"id": f"EXP-{i:04d}", "csa": float(i), "standard": "IEC 60502-1"} for i in range(2500)])
+    record = Validation(user_input="Validate EXP-0001", route="FETCH", design_id="EXP-0001", confidence=0.9)
+    record.results.append(ValidationResult(field="csa", status="PASS", expected="1", comment="ok"))
+    record.results.append(ValidationResult(field="voltage", status="FAIL", expected="0.6/1 kV", comment="missing"))
+    db.add(record)
+    db.commit()
+    db.close()
+    return factory
+
+
+def test_ndjson_export_streams_in_chunks(session_factory):
+    """Rows arrive in chunk_size partitions, ordered by ID."""
+    chunks = list(stream_export(session_factory, designs_query(), "ndjson", chunk_size=1000))
+    assert len(chunks) == 3
+    rows = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+    assert len(rows) == 2500
+    assert rows[0]["id"] == "EXP-0000" and rows[-1]["csa"] == 2499.0
+    assert isinstance(rows[0]["updated_at"], str)
+
+
+def test_csv_export_of_filtered_results(session_factory):
+    """Validation results are flattened with their validation's metadata."""
+    body = b"".join(stream_export(session_factory, validation_results_query(status="fail"), "csv"))
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert len(rows) == 1
+    assert rows[0]["field"] == "voltage" and rows[0]["design_id"] == "EXP-0001"
+    assert rows[0]["validation_id"]
@@ -0,0 +1,121 @@
+"""
+Tests for the interactive HITL channel (WebSocket, graph paused by interrupts).
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+from app.api.deps import get_database, get_session_factory
+from app.main import app
+from app.services import llm
+from app.services.design_index import design_index
+from app.services.fake_llm import FakeChatModel
+from app.services.hitl_channel import HITLChannel, HITLChannelError
+from app.services.hitl_sessions import HITLSessionNotFound, hitl_sessions
+from app.services.deadline import Deadline
+from app.services.result_cache import result_cache
+
+SPEC = "IEC 60502-1 cable, Cu, 16 mm², 1.0mm"  # voltage and insulation material missing
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(llm, "model", FakeChatModel())
+    result_cache.clear()
+    app.dependency_overrides[get_database] = lambda: None
+    app.dependency_overrides[get_session_factory] = lambda: None
+    yield
+    app.dependency_overrides.clear()
+    result_cache.clear()
+    hitl_sessions.clear()
+    design_index.clear()  # completed validations were indexed
+
+
+def test_channel_pauses_between_answers_in_any_order(fake_llm):
+    """Each answer resumes the paused run; the last one goes on to revalidation."""
+    channel = HITLChannel(None)
+    with pytest.raises(HITLChannelError):
+        channel.handle({"type": "answer", "field": "voltage", "value": "0.6/1 kV"})
+
+    questions = channel.handle({"type": "start", "user_input": SPEC})
+    assert questions["type"] == "questions"
+    assert questions["missing_attributes"] == ["voltage", "insulation_material"]
+    assert channel.graph.get_state(channel.config).next == ("ask_missing",)
+
+    with pytest.raises(HITLChannelError):
+        channel.handle({"type": "answer", "field": "csa", "value": "25"})  # not missing
+    parsed = channel.handle({"type": "answer", "field": "insulation_material", "value": "PVC"})
+    assert parsed["accepted"] and parsed["value"] == "PVC"
+    assert parsed["missing_attributes"] == ["voltage"] and parsed["session_version"] == 2
+
+    result = channel.handle({"type": "answer", "field": "voltage", "value": "0.6/1 kV"})
+    state = result["state"]
+    assert result["type"] == "result" and state["missing_attributes"] == []
+    assert {item["status"] for item in state["validation"]} == {"PASS"}
+    assert [usage["node"] for usage in state["llm_usage"]] == ["parse_attribute", "parse_attribute", "validate"]
+    with pytest.raises(HITLSessionNotFound):
+        hitl_sessions.get(questions["session_id"])  # completed
+
+
+def test_each_message_uses_a_short_lived_session_and_deadline(fake_llm, engine):
+    """No database session outlives a message; every graph step gets its own time budget."""
+    opened, closed = [], []
+
+    class TrackedSession(Session):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    factory = sessionmaker(bind=engine, class_=TrackedSession)
+    channel = HITLChannel(lambda: opened.append(factory()) or opened[-1])
+    budgets = []
+    invoke = channel.graph.invoke
+    channel.graph.invoke = lambda value, config: budgets.append(config["configurable"]) or invoke(value, config)
+
+    channel.handle({"type": "start", "user_input": SPEC})
+    channel.handle({"type": "answer", "field": "voltage", "value": "0.6/1 kV"})
+    assert len(opened) == 2 and closed == opened and channel.service.db is None
+    result = channel.handle({"type": "answer", "field": "insulation_material", "value": "PVC"})
+    assert result["type"] == "result" and len(opened) == 3 and closed == opened
+
+    assert [config["db"] for config in budgets] == opened
+    assert all(isinstance(config["deadline"], Deadline) for config in budgets)
+    assert len({id(config["deadline"]) for config in budgets}) == 3
+
+
+def test_websocket_parses_answers_sent_back_to_back(fake_llm):
+    """Both answers are sent before any reply; events arrive in order, then the socket closes."""
+    client = TestClient(app)
+    with client.websocket_connect("/api/validations/ws") as websocket:
+        websocket.send_text("not json")
+        assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_json({"type": "start", "user_input": SPEC})
+        websocket.send_json({"type": "answer", "field": "voltage", "value": "0.6/1 kV"})
+        websocket.send_json({"type": "answer", "field": "insulation_material", "value": "PVC"})
+        assert websocket.receive_json()["type"] == "questions"
+        assert websocket.receive_json()["missing_attributes"] == ["insulation_material"]
+        result = websocket.receive_json()
+
+    assert result["type"] == "result"
+    assert result["result"]["hitl_required"] is False and result["result"]["session_id"] is None
+    assert result["result"]["attributes"]["voltage"] == "0.6/1 kV"
+    assert [item["field"] for item in result["result"]["hitl_interactions"]] == ["voltage", "insulation_material"]
+
+
+def test_dropped_connection_continues_over_rest(fake_llm):
+    """Answers parsed before a disconnect are saved to the session; REST finishes it."""
+    client = TestClient(app)
+    with client.websocket_connect("/api/validations/ws") as websocket:
+        websocket.send_json({"type": "start", "user_input": SPEC})
+        session_id = websocket.receive_json()["session_id"]
+        websocket.send_json({"type": "answer", "field": "voltage", "value": "0.6/1 kV"})
+        assert websocket.receive_json()["session_version"] == 2
+
+    with client.websocket_connect("/api/validations/ws") as websocket:
+        websocket.send_json({"type": "start", "session_id": session_id})
+        assert websocket.receive_json()["missing_attributes"] == ["insulation_material"]
+
+    answer = {"session_id": session_id, "session_version": 2, "responses": {"insulation_material": "PVC"}}
+    final = client.post("/api/validations/validate-with-responses", json=answer).json()
+    assert final["hitl_required"] is False
+    assert final["attributes"]["voltage"] == "0.6/1 kV" and final["attributes"]["insulation_material"] == "PVC"
@@ -2,25 +2,31 @@
 Test script to verify HITL workflow fixes.
 This tests that attributes are properly updated and re-validated after HITL collection.
 """
-import sys
-sys.path.insert(0, 'e:/redemption/Innovate-Technical-assessment/backend')
-
+from app.config import settings
+from app.services.cache import design_cache
+from app.services.design_import import upsert_designs
+from app.services.result_cache import result_cache
 from app.services.validation_service import ValidationService
-from app.database import SessionLocal
+from app.utils.constants import DESIGN_DATABASE
 
-def test_hitl_workflow():
+def test_hitl_workflow(db, monkeypatch):
     """Test HITL workflow with DESIGN-002"""
+    monkeypatch.setattr(settings, "INFERENCE_ENABLED", False)  # leave the gaps for HITL
+    upsert_designs(db, [{"id": "DESIGN-002", **DESIGN_DATABASE["DESIGN-002"]}])
+    result_cache.clear()
+    design_cache.clear()
     print("\n" + "="*80)
     print("TESTING HITL WORKFLOW WITH DESIGN-002")
     print("="*80)
     
-    db = SessionLocal()
     service = ValidationService(db)
     
     # Step 1: Initial validation (should show WARN for missing fields)
     print("\n STEP 1: Initial Validation")
     print("-"*80)
     initial_result = service.run_validation('Validate DESIGN-002', hitl_mode=True)
+    assert initial_result["attributes"] == DESIGN_DATABASE["DESIGN-002"]
+    assert sorted(initial_result["missing_attributes"]) == ["conductor_class", "insulation_thickness"]
     
     print(f"\nInitial Missing Attributes: {initial_result.get('missing_attributes', [])}")
     print(f"Initial Confidence: {initial_result.get('confidence', 0):.2f}")
@@ -87,10 +93,7 @@ def test_hitl_workflow():
     else:
         print(" SUCCESS: insulation_thickness no longer has WARN status")
     
-    db.close()
-    
-    return success
-
-if __name__ == "__main__":
-    success = test_hitl_workflow()
-    sys.exit(0 if success else 1)
+    assert success
+    assert final_result["attributes"] == dict(
+        DESIGN_DATABASE["DESIGN-002"], conductor_class="Class 2", insulation_thickness=1.2
+    )
@@ -0,0 +1,96 @@
+"""
+Tests for the shared HITL session store and resumed follow-ups.
+"""
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.api.deps import get_database
+from app.main import app
+from app.services import llm, ValidationService
+from app.services.cache import Cache, MemoryBackend, SQLiteBackend
+from app.services.fake_llm import FakeChatModel
+from app.services.hitl_sessions import HITLSessionConflict, HITLSessionNotFound, HITLSessionStore, hitl_sessions
+from app.services.result_cache import result_cache
+
+SPEC = "IEC 60502-1 cable, Cu, 16 mm², 1.0mm"  # voltage and insulation material missing
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(llm, "model", FakeChatModel())
+    result_cache.clear()
+    yield
+    result_cache.clear()
+    hitl_sessions.clear()
+
+
+def test_store_claims_each_version_once_and_expires():
+    """Two follow-ups based on one version: the first wins, the second conflicts."""
+    store = HITLSessionStore(Cache(MemoryBackend(), "sessions", ttl=0.2))
+    session = store.create(SPEC, {"attributes": {"csa": 16.0}, "missing_attributes": ["voltage"],
+                                  "llm_usage": [{"node": "extract"}], "validation": []})
+    assert session["version"] == 1 and session["state"] == {
+        "attributes": {"csa": 16.0}, "missing_attributes": ["voltage"]
+    }
+
+    assert store.save(session, {"attributes": {"csa": 16.0}})["version"] == 2
+    with pytest.raises(HITLSessionConflict) as conflict:
+        store.complete(session)
+    assert conflict.value.version == 2 and store.get(session["id"])["version"] == 2
+
+    time.sleep(0.25)
+    with pytest.raises(HITLSessionNotFound):
+        store.get(session["id"])
+
+
+def test_follow_ups_resume_on_another_worker(fake_llm, monkeypatch, tmp_path):
+    """Each worker has its own backend on one SQLite file; answers arrive one at a time."""
+    path = str(tmp_path / "cache.sqlite3")
+    workers = [HITLSessionStore(Cache(SQLiteBackend(path), "sessions", ttl=60)) for _ in range(2)]
+
+    monkeypatch.setattr("app.services.validation_service.hitl_sessions", workers[0])
+    first = ValidationService(None).run_validation(SPEC, hitl_mode=True)
+    assert first["missing_attributes"] == ["voltage", "insulation_material"]
+    assert first["session_version"] == 1
+
+    monkeypatch.setattr("app.services.validation_service.hitl_sessions", workers[1])
+    partial = ValidationService(None).run_validation_with_responses(
+        None, {"insulation_material": "PVC"}, session_id=first["session_id"], session_version=1
+    )
+    # Resumed from the saved state: no routing or extraction calls again
+    assert {usage["node"] for usage in partial["llm_usage"]} == {"parse_attribute", "validate"}
+    assert partial["missing_attributes"] == ["voltage"] and partial["session_version"] == 2
+
+    monkeypatch.setattr("app.services.validation_service.hitl_sessions", workers[0])
+    final = ValidationService(None).run_validation_with_responses(
+        None, {"voltage": "0.6/1 kV"}, session_id=first["session_id"], session_version=2
+    )
+    assert final.get("session_id") is None
+    assert final["attributes"]["voltage"] == "0.6/1 kV" and final["attributes"]["insulation_material"] == "PVC"
+    assert {item["status"] for item in final["validation"]} == {"PASS"}
+    with pytest.raises(HITLSessionNotFound):
+        workers[1].get(first["session_id"])
+
+
+def test_api_reports_stale_and_unknown_sessions(fake_llm):
+    """The session is readable by ID; outdated versions get 409, unknown sessions 404."""
+    app.dependency_overrides[get_database] = lambda: None
+    client = TestClient(app)
+    try:
+        started = client.post("/api/validations/validate", json={"user_input": SPEC, "hitl_mode": True}).json()
+        assert started["hitl_required"] and started["session_version"] == 1
+        session = client.get(f"/api/validations/sessions/{started['session_id']}").json()
+        assert session["missing_attributes"] == ["voltage", "insulation_material"]
+
+        answer = {"session_id": started["session_id"], "session_version": 1, "responses": {"voltage": "0.6/1 kV"}}
+        answered = client.post("/api/validations/validate-with-responses", json=answer).json()
+        assert answered["hitl_required"] and answered["session_version"] == 2
+
+        stale = client.post("/api/validations/validate-with-responses",
+                            json={**answer, "responses": {"insulation_material": "PVC"}})
+        assert stale.status_code == 409
+        unknown = client.post("/api/validations/validate-with-responses", json={**answer, "session_id": "nope"})
+        assert unknown.status_code == 404
+        assert client.post("/api/validations/validate-with-responses", json={"responses": {}}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,85 @@
+"""
+Tests for incremental field-level re-validation.
+"""
+import json
+from langchain_core.messages import AIMessage
+from app.langgraph.nodes import validation as validation_node
+from app.langgraph.nodes.validation import (
+    fields_to_revalidate,
+    merge_verdicts,
+    score_confidence,
+    validation_agent,
+)
+
+BASE = {
+    "standard": "IEC 60502-1",
+    "voltage": "0.6/1 kV",
+    "conductor_material": "Cu",
+    "conductor_class": "Class 2",
+    "csa": 16,
+    "insulation_material": "PVC",
+    "insulation_thickness": None,
+}
+
+
+class RecordingLLM:
+    """Answers PASS for every field and records the prompts it saw."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        fields = list(BASE)
+        return AIMessage(content=json.dumps({
+            "validation": [{"field": f, "status": "PASS", "expected": None, "comment": "ok"} for f in fields],
+            "reasoning": "fresh",
+            "confidence": 0.95,
+        }))
+
+
+def test_dependencies_drive_dirty_fields():
+    """Thickness depends on csa; conductor_class depends on nothing."""
+    assert fields_to_revalidate(BASE, {**BASE, "insulation_thickness": 1.0}) == ["insulation_thickness"]
+    assert fields_to_revalidate(BASE, {**BASE, "csa": 25}) == ["csa", "insulation_thickness"]
+    assert fields_to_revalidate(BASE, dict(BASE)) == []
+
+
+def test_merge_keeps_order_and_replaces_fresh_fields():
+    previous = [{"field": f, "status": "WARN"} for f in BASE]
+    merged = merge_verdicts(previous, [{"field": "csa", "status": "PASS"}])
+    assert [v["field"] for v in merged] == list(BASE)
+    assert [v["status"] for v in merged].count("PASS") == 1
+
+
+def test_score_confidence():
+    all_pass = [{"field": f, "status": "PASS"} for f in BASE]
+    assert score_confidence(all_pass, []) == 1.0
+    assert score_confidence(all_pass[:-1] + [{"field": "csa", "status": "WARN"}], []) == 0.9
+
+
+def test_revalidation_only_sends_changed_fields(monkeypatch):
+    """After a HITL answer only the affected field is re-evaluated."""
+    fake = RecordingLLM()
+    monkeypatch.setattr(validation_node, "llm", fake)
+    previous = [{"field": f, "status": "PASS", "expected": None, "comment": "old"} for f in BASE]
+    previous[-1] = {"field": "insulation_thickness", "status": "WARN", "expected": None, "comment": "missing"}
+    state = {
+        "attributes": {**BASE, "insulation_thickness": 1.0},
+        "missing_attributes": [],
+        "initial_validation_done": True,
+        "validation": previous,
+        "validated_attributes": dict(BASE),
+        "reasoning": "old",
+    }
+
+    result = validation_agent(state)
+
+    assert "FIELDS TO RE-VALIDATE:** ['insulation_thickness']" in fake.prompts[0]
+    assert [v["comment"] for v in result["validation"]] == ["old"] * 6 + ["ok"]
+    assert result["confidence"] == 1.0
+    assert result["validated_attributes"]["insulation_thickness"] == 1.0
+
+    # Nothing changed since: no LLM call at all
+    validation_agent(result)
+    assert len(fake.prompts) == 1
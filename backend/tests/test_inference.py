@@ -0,0 +1,63 @@
+"""
+Tests for deterministic inference of missing attributes from IEC tables.
+"""
+from app.langgraph.nodes.infer_missing import infer_missing_attributes
+from app.models import Design
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.result_cache import result_cache
+from app.services.validation_service import ValidationService
+from app.utils.iec_tables import infer_attributes
+
+PVC_16 = {
+    "standard": "IEC 60502-1", "voltage": "0.6/1 kV", "conductor_material": "Cu",
+    "conductor_class": "Class 2", "csa": 16, "insulation_material": "PVC", "insulation_thickness": 1.0,
+}
+
+
+def test_tables_fill_only_what_they_determine():
+    """Thickness needs a tabulated 0.6/1 kV CSA and material; small conductors keep the class open."""
+    attributes = dict(PVC_16, standard=None, conductor_class=None, insulation_thickness=None)
+    inferred = infer_attributes(attributes, ["standard", "conductor_class", "insulation_thickness"])
+    assert {field: item["value"] for field, item in inferred.items()} == {
+        "standard": "IEC 60502-1", "conductor_class": "Class 2", "insulation_thickness": 1.0,
+    }
+
+    assert infer_attributes(dict(attributes, insulation_material="XLPE", csa=95), ["insulation_thickness"]) == {
+        "insulation_thickness": {"value": 1.1, "source": "IEC 60502-1 nominal for XLPE at 0.6/1 kV"}
+    }
+    assert infer_attributes(dict(attributes, csa=6), ["conductor_class"]) == {}
+    assert infer_attributes(dict(attributes, csa=17), ["insulation_thickness"]) == {}
+    assert infer_attributes(dict(attributes, voltage="6/10 kV"), ["insulation_thickness"]) == {}
+    assert infer_attributes(dict(attributes, voltage=None), ["standard"]) == {}
+
+
+def test_user_answers_win_over_inference():
+    """Fields the user answered are left to HITL; inferred ones drop out of the suggestions."""
+    state = infer_missing_attributes({
+        "attributes": dict(PVC_16, conductor_class=None, insulation_thickness=None),
+        "missing_attributes": ["conductor_class", "insulation_thickness"],
+        "hitl_responses": {"insulation_thickness": "1.2 mm"},
+        "attribute_suggestions": {"conductor_class": {"value": "Class 2", "support": 3, "confidence": 1.0}},
+    })
+    assert state["attributes"]["conductor_class"] == "Class 2"
+    assert state["missing_attributes"] == ["insulation_thickness"]
+    assert set(state["inferred_attributes"]) == {"conductor_class"}
+    assert state["attribute_suggestions"] == {}
+
+
+def test_derivable_design_needs_no_hitl(db, monkeypatch):
+    """A design missing only derivable fields validates without a HITL round trip."""
+    monkeypatch.setattr(llm, "model", FakeChatModel())
+    result_cache.clear()
+    db.add(Design(id="DESIGN-002", **dict(PVC_16, conductor_class=None, insulation_thickness=None)))
+    db.commit()
+
+    result = ValidationService(db).run_validation("Validate DESIGN-002", hitl_mode=True)
+
+    assert result["missing_attributes"] == []
+    assert set(result["inferred_attributes"]) == {"conductor_class", "insulation_thickness"}
+    assert result["attributes"]["insulation_thickness"] == 1.0
+    assert not result.get("hitl_required")
+    assert len(result["validation"]) == 7
+    result_cache.clear()
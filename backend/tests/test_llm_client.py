@@ -0,0 +1,131 @@
+"""
+Tests for the resilient LLM client wrapper.
+"""
+import pytest
+from langchain_core.messages import AIMessage
+from app.services.llm_client import (
+    ResilientLLM,
+    CircuitBreaker,
+    TokenBucket,
+    LLMUnavailableError,
+    is_transient_error,
+)
+
+
+class ServiceUnavailable(Exception):
+    """Mimics the provider SDK's 503 exception."""
+    code = 503
+
+
+class ScriptedModel:
+    """Model that replays a script of responses/exceptions."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        item = self.script.pop(0) if self.script else "ok"
+        if isinstance(item, Exception):
+            raise item
+        return AIMessage(content=item)
+
+
+def make_client(model, **kwargs):
+    options = dict(max_retries=2, backoff_base=0.0, backoff_max=0.0, rate_per_second=0)
+    options.update(kwargs)
+    return ResilientLLM(model, provider="test", **options)
+
+
+def test_retries_transient_errors():
+    """Transient failures are retried until a response arrives."""
+    model = ScriptedModel(ServiceUnavailable(), ServiceUnavailable(), '{"route": "IGNORE"}')
+    client = make_client(model)
+
+    response = client.invoke("prompt", node="supervisor")
+
+    assert response.content == '{"route": "IGNORE"}'
+    assert model.calls == 3
+
+
+def test_non_transient_errors_are_raised():
+    """Bad requests are not retried."""
+    model = ScriptedModel(ValueError("bad prompt"))
+    client = make_client(model)
+
+    with pytest.raises(ValueError):
+        client.invoke("prompt")
+    assert model.calls == 1
+
+
+def test_fallback_then_cache_when_unhealthy():
+    """Exhausted retries use the fast path first, then the cached answer."""
+    model = ScriptedModel("cached answer", *[ServiceUnavailable()] * 10)
+    client = make_client(model, breaker=CircuitBreaker("test", failure_threshold=100))
+
+    assert client.invoke("prompt").content == "cached answer"
+    assert client.invoke("prompt", fallback=lambda: "fast path").content == "fast path"
+    assert client.invoke("prompt").content == "cached answer"
+
+    with pytest.raises(LLMUnavailableError):
+        client.invoke("never seen")
+
+
+def test_circuit_opens_and_recovers():
+    """The breaker short-circuits calls and admits a probe after recovery."""
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=0.05)
+    model = ScriptedModel(ServiceUnavailable(), ServiceUnavailable())
+    client = make_client(model, max_retries=5, breaker=breaker)
+
+    with pytest.raises(LLMUnavailableError) as exc_info:
+        client.invoke("prompt")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert model.calls == 2
+    assert exc_info.value.retry_after > 0
+
+    import time
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert client.invoke("prompt").content == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_token_bucket_times_out():
+    """An empty bucket refuses tokens within a short timeout."""
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.01)
+
+
+def test_is_transient_error():
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(ServiceUnavailable())
+    assert not is_transient_error(ValueError())
+
+
+def test_hedged_request_wins_over_slow_call():
+    """A call slower than the node's latency percentile is duplicated."""
+    import time
+
+    class SlowFirstModel:
+        def __init__(self):
+            self.calls = 0
+
+        def invoke(self, prompt):
+            self.calls += 1
+            if self.calls == 1:
+                time.sleep(0.5)
+                return AIMessage(content="slow")
+            return AIMessage(content="fast")
+
+    model = SlowFirstModel()
+    client = make_client(model, hedge_percentile=50, hedge_min_samples=1)
+    client.latencies.record("validate", 0.01)
+
+    started = time.monotonic()
+    response = client.invoke("prompt", node="validate")
+
+    assert response.content == "fast"
+    assert model.calls == 2
+    assert time.monotonic() - started < 0.4
@@ -0,0 +1,59 @@
+"""
+Tests for unit and synonym normalization of design attributes.
+"""
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.result_cache import result_cache
+from app.services.validation_service import ValidationService
+from app.utils.normalization import normalize_attributes, normalize_records
+
+
+def test_spellings_and_units_map_to_one_form():
+    variants = [
+        {"conductor_material": "copper", "csa": "10 mm²", "voltage": "0.6/1kV", "standard": "iec60502-1",
+         "conductor_class": "class2", "insulation_material": "pvc", "insulation_thickness": "1.0mm"},
+        {"conductor_material": "COPPER", "csa": "10sqmm", "voltage": "600/1000 V", "standard": "IEC 60502 - 1",
+         "conductor_class": "stranded", "insulation_material": "PVC", "insulation_thickness": 1},
+        {"conductor_material": "Cu", "csa": 10, "voltage": "0.6 / 1 kV", "standard": "IEC 60502-1",
+         "conductor_class": "Class 2", "insulation_material": "Polyvinyl Chloride", "insulation_thickness": "1 mm"},
+    ]
+    normalized = [normalize_attributes(variant) for variant in variants]
+    assert normalized[0] == {
+        "conductor_material": "Cu", "csa": 10.0, "voltage": "0.6/1 kV", "standard": "IEC 60502-1",
+        "conductor_class": "Class 2", "insulation_material": "PVC", "insulation_thickness": 1.0,
+    }
+    assert normalized[1] == normalized[0] == normalized[2]
+    # Unrecognised values are kept for validation to judge; blanks become missing
+    assert normalize_attributes({"csa": "ten", "voltage": "  "}) == {"csa": "ten", "voltage": None}
+
+
+def test_bulk_variant_matches_row_by_row():
+    rows = [
+        {"id": "D-1", "csa": 16, "insulation_thickness": None, "conductor_material": "aluminium"},
+        {"id": "D-2", "csa": "25 mm2", "insulation_thickness": "1.2", "conductor_material": "Al"},
+        {"id": "D-3", "conductor_material": "copper"},
+    ]
+    assert normalize_records(rows) == [normalize_attributes(row) for row in rows]
+    assert "csa" not in normalize_records(rows)[2]
+
+
+def test_rephrased_input_reuses_verdicts(monkeypatch):
+    """Two phrasings of one design cost a single validation LLM call."""
+    prompts = []
+
+    class CountingModel(FakeChatModel):
+        def invoke(self, prompt):
+            prompts.append(prompt)
+            return super().invoke(prompt)
+
+    monkeypatch.setattr(llm, "model", CountingModel())
+    result_cache.clear()
+    try:
+        first = ValidationService(None).run_validation("IEC 60502-1, 0.6/1 kV, Cu Class 2, 16 mm², PVC 1.0mm")
+        second = ValidationService(None).run_validation("iec60502-1 16sqmm copper class 2 pvc 1 mm 0.6/1kV")
+    finally:
+        result_cache.clear()
+
+    assert first["attributes"] == second["attributes"]
+    assert second["validation"] == first["validation"]
+    assert sum("cable design validation engineer" in prompt for prompt in prompts) == 1
@@ -0,0 +1,93 @@
+"""
+Tests for the on-demand sampling profiler.
+"""
+import time
+from fastapi.testclient import TestClient
+from app.api.deps import get_database
+from app.config import settings
+from app.main import app
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.profiling import Profiler, profiler
+from app.services.result_cache import result_cache
+
+SPEC = "IEC 60502-1, 0.6/1 kV, Cu Class 2, 35 mm², XLPE 0.9mm"
+
+
+def busy_wait(seconds: float) -> None:
+    ends = time.perf_counter() + seconds
+    while time.perf_counter() < ends:
+        pass
+
+
+def test_disabled_profiler_is_a_no_op():
+    """Disabled, requests run unwrapped even when they ask; enabled, a sample rate of 1 profiles all."""
+    work = lambda: busy_wait(0.1)
+    disabled = Profiler(enabled=False, sample_rate=1.0)
+    assert disabled.wrap(work, "test", requested=True) is work
+
+    enabled = Profiler(enabled=True, sample_rate=1.0, interval=0.002)
+    enabled.wrap(work, "test")()
+    [summary] = enabled.list()
+    assert summary["label"] == "test" and summary["samples"] >= 3
+    assert summary["top_frames"][0]["frame"] == "tests.test_profiling:busy_wait"
+
+
+def test_collapsed_stacks_are_flamegraph_input():
+    """One "root;...;leaf count" line per distinct stack; counts add up to the samples."""
+    sampling = Profiler(enabled=True, interval=0.002, max_concurrent=1)
+    with sampling.capture("outer") as profile_id:
+        with sampling.capture("nested") as skipped:  # over the concurrency limit
+            busy_wait(0.05)
+    assert skipped is None
+
+    lines = sampling.collapsed(profile_id).splitlines()
+    counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    assert sum(counts) == sampling.list()[0]["samples"]
+    assert all(";" in line.rsplit(" ", 1)[0] for line in lines)
+    assert any("tests.test_profiling:test_collapsed_stacks_are_flamegraph_input;" in line for line in lines)
+    assert sampling.collapsed("unknown") is None
+
+
+def test_admin_endpoints_are_disabled_without_a_token(monkeypatch):
+    """With no ADMIN_TOKEN configured every admin route is closed, whatever the caller sends."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    client = TestClient(app)
+    for headers in ({}, {"X-Admin-Token": ""}, {"X-Admin-Token": "anything"}):
+        assert client.get("/api/admin/profiling", headers=headers).status_code == 404
+        assert client.put("/api/admin/profiling", json={"enabled": True}, headers=headers).status_code == 404
+        assert client.get("/api/admin/cache", headers=headers).status_code == 404
+        assert client.post("/api/admin/analytics/refresh", params={"rebuild": True}, headers=headers).status_code == 404
+    assert not profiler.enabled
+
+
+def test_admin_endpoints_toggle_profiling_and_serve_profiles(monkeypatch):
+    """X-Profile is honoured once an admin enables profiling; the profile covers the graph run."""
+    monkeypatch.setattr(llm, "model", FakeChatModel(latency=lambda: 0.02))
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    result_cache.clear()
+    profiler.clear()
+    app.dependency_overrides[get_database] = lambda: None
+    client = TestClient(app)
+    admin = {"X-Admin-Token": "secret"}
+    try:
+        assert client.get("/api/admin/profiling").status_code == 403
+        assert client.get("/api/admin/profiling", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        client.post("/api/validations/validate", json={"user_input": SPEC}, headers={"X-Profile": "true"})
+        assert client.get("/api/admin/profiling", headers=admin).json()["profiles"] == []
+
+        status = client.put("/api/admin/profiling", json={"enabled": True, "interval_ms": 2}, headers=admin).json()
+        assert status["enabled"] and status["interval_ms"] == 2.0
+        result_cache.clear()
+        client.post("/api/validations/validate", json={"user_input": SPEC}, headers={"X-Profile": "true"})
+
+        [summary] = client.get("/api/admin/profiling", headers=admin).json()["profiles"]
+        assert summary["label"] == "run_validation" and summary["samples"] > 0
+        collapsed = client.get(f"/api/admin/profiling/profiles/{summary['id']}", headers=admin).text
+        assert "app.services.validation_service:ValidationService._validate_and_store" in collapsed
+        assert client.get("/api/admin/profiling/profiles/unknown", headers=admin).status_code == 404
+    finally:
+        profiler.configure(enabled=False, interval=settings.PROFILING_INTERVAL_MS / 1000)
+        profiler.clear()
+        app.dependency_overrides.clear()
+        result_cache.clear()
@@ -0,0 +1,78 @@
+"""
+Tests for cached results and background re-validation of changed designs.
+"""
+import pytest
+from app.config import settings
+from app.models import Design, Validation
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.result_cache import result_cache
+from app.services.revalidation import RevalidationWorker
+from app.services.validation_service import ValidationService, design_reference
+
+
+@pytest.fixture
+def session_factory(session_factory, monkeypatch):
+    """The shared database with one incomplete design, and the fake LLM."""
+    monkeypatch.setattr(llm, "model", FakeChatModel())
+    monkeypatch.setattr(settings, "INFERENCE_ENABLED", False)  # keep the thickness missing
+    result_cache.clear()
+    factory = session_factory
+    db = factory()
+    db.add(Design(id="DESIGN-900", standard="IEC 60502-1", voltage="0.6/1 kV", conductor_material="Cu",
+                  conductor_class="Class 2", csa=16, insulation_material="PVC", insulation_thickness=None))
+    db.commit()
+    db.close()
+    yield factory
+    result_cache.clear()
+
+
+def test_design_reference():
+    assert design_reference("Validate design-900") == "DESIGN-900"
+    assert design_reference("DESIGN-900") == "DESIGN-900"
+    assert design_reference("DESIGN-900 but with 25mm² conductors") is None
+
+
+def test_update_is_revalidated_in_background(session_factory):
+    """After an edit, the worker refreshes verdicts and /validate hits the cache."""
+    db = session_factory()
+    first = ValidationService(db).run_validation("Validate DESIGN-900")
+    assert "insulation_thickness" in first["missing_attributes"]
+
+    design = db.query(Design).filter(Design.id == "DESIGN-900").first()
+    design.insulation_thickness = 1.0
+    db.commit()
+    result_cache.invalidate_design("DESIGN-900")
+    assert result_cache.get(("design", "DESIGN-900")) is None
+
+    worker = RevalidationWorker(session_factory, debounce_seconds=0.05)
+    worker.start()
+    try:
+        worker.enqueue("DESIGN-900")
+        worker.enqueue("DESIGN-900")  # rapid second edit is coalesced
+        assert worker.wait_idle(timeout=10)
+    finally:
+        worker.stop()
+
+    cached = result_cache.get(("design", "DESIGN-900"))
+    assert cached is not None
+    assert cached["missing_attributes"] == []
+    assert db.query(Validation).filter(Validation.design_id == "DESIGN-900").count() == 2
+
+    served = ValidationService(db).run_validation("validate design-900", hitl_mode=True)
+    assert served["attributes"]["insulation_thickness"] == 1.0
+    assert served["hitl_mode"] is True
+    db.close()
+
+
+def test_stored_verdicts_are_served_after_cache_loss(session_factory):
+    """Another worker's persisted verdicts are reused while newer than the design."""
+    db = session_factory()
+    ValidationService(db).run_validation("Validate DESIGN-900")
+    result_cache.clear()
+
+    served = ValidationService(db).run_validation("Validate DESIGN-900")
+
+    assert served["validation"]
+    assert db.query(Validation).count() == 1
+    db.close()
@@ -0,0 +1,115 @@
+"""
+Tests for single-flight coalescing of identical validations.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.services import validation_service
+from app.services.admission import AdmissionController
+from app.services.singleflight import SingleFlight
+from app.services.validation_service import ValidationService, canonical_request_key
+
+
+def test_concurrent_sync_calls_share_one_execution():
+    """Threads with the same key run the function once."""
+    group = SingleFlight("test-sync")
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(1)
+        return {"confidence": 0.9}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(group.do, "key", work) for _ in range(5)]
+        time.sleep(0.05)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(result == {"confidence": 0.9} for result, _ in results)
+    assert sum(1 for _, shared in results if shared) == 4
+    assert group.inflight() == 0
+
+
+def test_async_callers_join_and_errors_propagate():
+    """Async callers coalesce, and a failing leader fails every follower."""
+    group = SingleFlight("test-async")
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.05)
+        raise RuntimeError("provider down")
+
+    async def main():
+        return await asyncio.gather(
+            *[group.ado("key", work) for _ in range(3)], return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_identical_queued_requests_take_one_slot(monkeypatch):
+    """With every slot busy, identical requests queue once; followers wait on the leader without a slot."""
+    controller = AdmissionController(max_inflight=1, max_queue=8, queue_timeout=5)
+    monkeypatch.setattr(validation_service, "admission", controller)
+    calls = []
+
+    def work():
+        calls.append(controller.status()["inflight"])
+        return {"confidence": 0.9}
+
+    key = canonical_request_key("queued spec", False)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        with controller.slot("interactive"):  # another request holds the only slot
+            futures = [pool.submit(ValidationService._flight, key, "interactive", work) for _ in range(4)]
+            time.sleep(0.1)
+            assert controller.status() == {"inflight": 1, "interactive": 1, "batch": 0, "background": 0}
+            assert validation_service._validation_flights.waiting(key) == 3
+        results = [future.result(5) for future in futures]
+
+    assert calls == [1]
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert controller.status()["inflight"] == 0 and validation_service._validation_flights.inflight() == 0
+
+
+def test_cancelled_async_leader_leaves_newer_leader_alone():
+    """The orphaned thread of a cancelled leader neither raises on its future nor drops the next leader's key."""
+    group = SingleFlight("test-cancel")
+    release = threading.Event()
+    finished = threading.Event()
+
+    def slow():
+        release.wait(1)
+        finished.set()
+        return "old"
+
+    async def main():
+        first = asyncio.create_task(group.ado("key", slow))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        assert group.inflight() == 0
+
+        second = asyncio.create_task(group.ado("key", lambda: time.sleep(0.2) or "new"))
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.to_thread(finished.wait, 1)
+        await asyncio.sleep(0.05)
+        assert group.inflight() == 1  # the newer leader still owns the key
+        return await second
+
+    assert asyncio.run(main()) == ("new", False)
+    assert group.inflight() == 0
+
+
+def test_canonical_key_normalizes_input():
+    assert canonical_request_key("Validate  DESIGN-001 ", False) == canonical_request_key("validate design-001", False)
+    assert canonical_request_key("Validate DESIGN-001", False) != canonical_request_key("Validate DESIGN-001", True)
+    assert canonical_request_key("x", True, {"csa": "10"}) != canonical_request_key("x", True, {"csa": "16"})
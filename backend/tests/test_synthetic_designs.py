@@ -0,0 +1,52 @@
+"""
+Tests for the synthetic design generator.
+"""
+import random
+from collections import Counter
+from app.models import Design
+from app.services.synthetic_designs import RENDER_STYLES, load_designs, render_text, synthetic_designs
+from app.utils.constants import REQUIRED_ATTRIBUTES
+from app.utils.iec_rules import evaluate_attributes
+from app.utils.normalization import parse_specification
+
+
+def test_designs_cover_boundaries_and_missing_rate():
+    """Seeded output spans materials, voltages, invalid sizes and every thickness band."""
+    designs = list(synthetic_designs(3000, seed=3, missing_rate=0.1, invalid_rate=0.1))
+    assert designs == list(synthetic_designs(3000, seed=3, missing_rate=0.1, invalid_rate=0.1))
+    assert len({design["id"] for design in designs}) == 3000
+
+    missing = sum(design[field] is None for design in designs for field in REQUIRED_ATTRIBUTES)
+    assert 0.08 < missing / (3000 * len(REQUIRED_ATTRIBUTES)) < 0.12
+    assert {design["conductor_material"] for design in designs} >= {"Cu", "Al"}
+    assert len({design["voltage"] for design in designs} - {None}) >= 7
+
+    verdicts = [{v["field"]: v for v in evaluate_attributes(design)} for design in designs]
+    assert any(v["csa"]["status"] == "FAIL" for v in verdicts)
+    assert any(v["voltage"]["status"] == "FAIL" for v in verdicts)
+    bands = Counter(v["insulation_thickness"]["comment"].rsplit("(", 1)[-1] for v in verdicts
+                    if v["insulation_thickness"]["expected"])
+    assert {"below 85%)", "borderline)", "over-designed)"} <= set(bands)
+    assert any(comment.startswith("Meets the nominal") for comment in bands)
+
+
+def test_every_render_style_parses_back_to_the_design():
+    """Free-text renderings carry exactly the design's attributes, missing ones left out."""
+    rng = random.Random(5)
+    for design in synthetic_designs(300, seed=5, missing_rate=0.15):
+        expected = {field: design[field] for field in REQUIRED_ATTRIBUTES}
+        for style in RENDER_STYLES:
+            text = render_text(design, rng, style)
+            parsed = parse_specification(text)
+            if sum(value is not None for value in expected.values()) >= 2:
+                assert parsed == expected, (style, text)
+
+
+def test_load_designs_upserts_in_batches(db):
+    """Designs go into the designs table batch by batch; reloading the same seed updates in place."""
+    assert load_designs(db, 250, batch_size=60, seed=9, missing_rate=0.2) == 250
+    assert load_designs(db, 250, batch_size=60, seed=9, missing_rate=0.2) == 250
+    assert db.query(Design).count() == 250
+    first = next(synthetic_designs(1, seed=9, missing_rate=0.2))
+    stored = db.get(Design, first["id"])
+    assert {field: getattr(stored, field) for field in first} == first
@@ -0,0 +1,123 @@
+"""
+Tests for two-phase responses: deterministic verdicts now, LLM narrative later.
+"""
+import asyncio
+import threading
+from fastapi.testclient import TestClient
+from app.api.deps import get_database
+from app.main import app
+from app.models import Validation
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.narrative import narratives
+from app.services.result_cache import result_cache
+from app.services.validation_service import ValidationService, result_cache_key
+from app.utils.iec_rules import evaluate_attributes
+
+SPEC = "IEC 60502-1, 0.6/1 kV, Al Class 2, 35 mm², XLPE 0.9mm"
+
+
+class GatedModel(FakeChatModel):
+    """Holds every LLM call until `release` is set and records the prompts."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        self.release.wait(10)
+        return super().invoke(prompt)
+
+
+def test_rules_follow_the_prompt_classification():
+    attributes = {"standard": "IEC 60502-1", "voltage": "0.6/1 kV", "conductor_material": "Cu",
+                  "conductor_class": "Class 2", "csa": 10.0, "insulation_material": "PVC",
+                  "insulation_thickness": 0.9}
+    statuses = lambda attrs: {v["field"]: v["status"] for v in evaluate_attributes(attrs)}
+
+    assert statuses(attributes)["insulation_thickness"] == "WARN"  # 90% of nominal 1.0 mm
+    assert statuses(dict(attributes, insulation_thickness=0.8))["insulation_thickness"] == "FAIL"
+    assert statuses(dict(attributes, insulation_thickness=1.0)) == {field: "PASS" for field in attributes}
+    assert statuses(dict(attributes, csa=11.0))["csa"] == "FAIL"  # not a nominal size
+    assert statuses(dict(attributes, voltage="2/3 kV"))["voltage"] == "FAIL"
+    assert statuses(dict(attributes, conductor_class=None))["conductor_class"] == "WARN"
+
+
+def test_verdicts_return_before_the_llm_answers(monkeypatch):
+    """The first phase makes no LLM round trip; the narrative lands in the cache afterwards."""
+    model = GatedModel()
+    monkeypatch.setattr(llm, "model", model)
+    result_cache.clear()
+    try:
+        result = ValidationService(None).run_validation(SPEC, deferred_narrative=True)
+        assert result["narrative_pending"] and result["reasoning"] is None
+        assert [v["status"] for v in result["validation"]] == ["PASS"] * 7
+        assert result_cache.get(result_cache_key(SPEC)) is None  # cached only with the narrative
+
+        model.release.set()
+        narrative = asyncio.run(narratives.wait(result["validation_id"], timeout=10))
+        assert narrative["status"] == "ready" and narrative["reasoning"] == "Fake provider assessment"
+        cached = result_cache.get(result_cache_key(SPEC))
+        assert not cached["narrative_pending"] and cached["reasoning"] == "Fake provider assessment"
+        assert sum("cable design validation engineer" in p for p in model.prompts) == 1
+    finally:
+        model.release.set()
+        result_cache.clear()
+
+
+def test_narrative_explains_the_settled_verdicts(monkeypatch):
+    """The narrative prompt carries the deterministic statuses; comments explain them and never change them."""
+    model = GatedModel()
+    model.release.set()
+    monkeypatch.setattr(llm, "model", model)
+    result_cache.clear()
+    spec = SPEC.replace("0.9mm", "0.8mm")  # 89% of the nominal 0.9 mm: borderline WARN
+    try:
+        result = ValidationService(None).run_validation(spec, deferred_narrative=True)
+        narrative = asyncio.run(narratives.wait(result["validation_id"], timeout=10))
+        assert narrative["status"] == "ready"
+        prompt = next(p for p in model.prompts if "**EXPLAIN THESE VERDICTS:**" in p)
+        assert "Do NOT change any status" in prompt and '"status": "WARN"' in prompt
+
+        cached = result_cache.get(result_cache_key(spec))
+        thickness = next(v for v in cached["validation"] if v["field"] == "insulation_thickness")
+        assert thickness["status"] == "WARN" and thickness["comment"].startswith("WARN: ")
+        assert [v["status"] for v in cached["validation"]] == [v["status"] for v in result["validation"]]
+    finally:
+        result_cache.clear()
+
+
+def test_narrative_endpoints_and_persistence(session_factory, monkeypatch):
+    """Poll returns 202 then the narrative; the stream delivers it; the stored row is completed."""
+    model = GatedModel()
+    monkeypatch.setattr(llm, "model", model)
+    result_cache.clear()
+    factory = session_factory
+    app.dependency_overrides[get_database] = lambda: factory()
+    client = TestClient(app)
+    try:
+        body = client.post("/api/validations/validate", json={"user_input": SPEC, "deferred_narrative": True}).json()
+        assert body["narrative_status"] == "pending"
+        validation_id = body["validation_id"]
+        assert client.get(f"/api/validations/{validation_id}/narrative").status_code == 202
+
+        model.release.set()
+        with client.stream("GET", f"/api/validations/{validation_id}/narrative/stream") as stream:
+            events = [line for line in stream.iter_lines() if line.startswith("event:")]
+        assert events[-1] == "event: narrative"
+
+        ready = client.get(f"/api/validations/{validation_id}/narrative")
+        assert ready.status_code == 200 and ready.json()["comments"]["csa"].startswith("PASS: 35 mm²")
+        narratives.clear()  # as seen from another worker: read back from the database
+        assert client.get(f"/api/validations/{validation_id}/narrative").json()["status"] == "ready"
+        db = factory()
+        record = db.query(Validation).one()
+        assert str(record.id) == validation_id and record.reasoning == "Fake provider assessment"
+        db.close()
+        assert client.get("/api/validations/00000000-0000-0000-0000-000000000000/narrative").status_code == 404
+    finally:
+        model.release.set()
+        app.dependency_overrides.clear()
+        result_cache.clear()
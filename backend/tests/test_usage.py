@@ -0,0 +1,80 @@
+"""
+Tests for LLM token and cost accounting.
+"""
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from app.api.deps import get_database
+from app.config import settings
+from app.main import app
+from app.models import LLMUsage
+from app.services import llm
+from app.services.fake_llm import FakeChatModel
+from app.services.result_cache import result_cache
+from app.services.usage import LLM_TOKENS, record_usage, summarize_usage
+from app.services.validation_service import ValidationService
+
+SPEC = "IEC 60502-1, 0.6/1 kV, Cu Class 2, 25 mm², PVC 1.2mm"
+
+
+def test_only_provider_answers_are_counted_and_priced(monkeypatch):
+    """Fallback answers made no call; known models are priced per million tokens."""
+    monkeypatch.setitem(settings.LLM_PRICING, "priced-llm", [1.0, 4.0])
+    usage = {"input_tokens": 1000, "output_tokens": 500, "total_tokens": 1500}
+    state = {}
+    record_usage(state, "validate", AIMessage(
+        content="{}", usage_metadata=usage, response_metadata={"model_name": "priced-llm", "latency_seconds": 0.2}
+    ))
+    record_usage(state, "supervisor", AIMessage(
+        content="{}", usage_metadata=usage, response_metadata={"model_name": "free-llm", "latency_seconds": 0.1}
+    ))
+    record_usage(state, "supervisor", AIMessage(content='{"route": "IGNORE"}'))  # fast path
+
+    summary = summarize_usage(state["llm_usage"])
+    assert summary["calls"] == 2 and summary["total_tokens"] == 3000
+    assert summary["cost_usd"] == 0.003  # 1000 * 1.0 + 500 * 4.0 per million
+    assert summary["by_model"]["free-llm"]["cost_usd"] == 0.0
+    assert summary["by_node"]["validate"]["input_tokens"] == 1000
+
+
+def test_usage_in_response_header_body_and_storage(session_factory, monkeypatch):
+    """A fresh run reports and stores its calls; the cached answer reports none."""
+    monkeypatch.setattr(llm, "model", FakeChatModel())
+    result_cache.clear()
+    factory = session_factory
+    app.dependency_overrides[get_database] = lambda: factory()
+    client = TestClient(app)
+    try:
+        first = client.post("/api/validations/validate", json={"user_input": SPEC}, headers={"X-Include-Usage": "true"})
+        usage = first.json()["usage"]
+        assert set(usage["by_node"]) == {"supervisor", "extract_from_text", "validate"}
+        assert usage["by_model"]["fake-llm"]["calls"] == usage["calls"] == 3
+        assert first.headers["X-LLM-Usage"].startswith("calls=3; input=")
+
+        second = client.post("/api/validations/validate", json={"user_input": SPEC})
+        assert second.headers["X-LLM-Usage"].startswith("calls=0;")
+        assert second.json()["usage"] is None
+
+        db = factory()
+        assert db.query(LLMUsage).count() == 3
+        db.close()
+        report = client.get("/api/validations/usage").json()
+        assert report["totals"]["calls"] == 3 and report["totals"]["total_tokens"] == usage["total_tokens"]
+        assert report["by_route"]["EXTRACT_FROM_TEXT"]["calls"] == 3
+        assert report["by_node"]["validate"]["output_tokens"] == usage["by_node"]["validate"]["output_tokens"]
+    finally:
+        app.dependency_overrides.clear()
+        result_cache.clear()
+
+
+def test_usage_metrics_by_route_node_and_model(monkeypatch):
+    """Token counters are labelled with the request's route, the node and the model."""
+    monkeypatch.setattr(llm, "model", FakeChatModel(model_name="metrics-llm"))
+    result_cache.clear()
+    labels = {"route": "EXTRACT_FROM_TEXT", "node": "validate", "model": "metrics-llm", "kind": "output"}
+    before = LLM_TOKENS.value(**labels)
+    try:
+        result = ValidationService(None).run_validation(SPEC)
+    finally:
+        result_cache.clear()
+    validate = next(entry for entry in result["llm_usage"] if entry["node"] == "validate")
+    assert LLM_TOKENS.value(**labels) - before == validate["output_tokens"] > 0
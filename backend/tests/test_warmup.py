@@ -0,0 +1,45 @@
+"""
+Tests for startup warmup and readiness.
+"""
+import asyncio
+from app.services.warmup import Warmup, WARMUP_FAILURES
+
+
+def make_step(outcomes):
+    """Coroutine factory raising/returning according to `outcomes` in order."""
+    calls = iter(outcomes)
+
+    async def step():
+        outcome = next(calls)
+        if isinstance(outcome, Exception):
+            raise outcome
+    return lambda: step()
+
+
+def test_required_steps_are_retried_until_ready(monkeypatch):
+    warmup = Warmup(retry_seconds=0)
+    failures_before = WARMUP_FAILURES.value(step="database")
+    monkeypatch.setattr(warmup, "steps", lambda app: [
+        ("database", make_step([ConnectionError("db starting"), None]), True),
+        ("graph", make_step([None]), True),
+    ])
+    assert warmup.status()["status"] == "warming_up"
+
+    asyncio.run(warmup.run(app=None))
+
+    assert warmup.ready and warmup.status()["status"] == "ready"
+    assert warmup.checks["database"]["ok"]
+    assert WARMUP_FAILURES.value(step="database") == failures_before + 1
+
+
+def test_failed_llm_probe_does_not_block_readiness(monkeypatch):
+    """The workflow degrades without the LLM, so its probe is advisory."""
+    warmup = Warmup(retry_seconds=0)
+    monkeypatch.setattr(warmup, "steps", lambda app: [
+        ("llm", make_step([TimeoutError("provider slow")]), False),
+    ])
+    asyncio.run(warmup.run(app=None))
+
+    assert warmup.ready
+    assert warmup.checks["llm"] == {"ok": False, "error": "TimeoutError: provider slow"}
+    assert warmup.duration is not None